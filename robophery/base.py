@@ -1,36 +1,91 @@
+import heapq
 import time
 
 try:
     import platform
+    import json
     import logging
-    logging_format = "%(created)f [%(name)s] %(message)s"
-    logging.basicConfig(format=logging_format, level=logging.DEBUG)
+    import threading
     from importlib import import_module
 except Exception:
     pass
 
 
-def list_avg(list):
-    sum = 0
-    for elm in list:
-        sum += elm
-    return sum / (len(list) * 1.0)
-
-
-def list_min(list):
-    min = list[0]
-    for elm in list[1:]:
-        if elm < min:
-            min = elm
-    return min
-
+class MetricAggregator(object):
+    """
+    Streaming aggregation of module readings. Only running minimum,
+    maximum, sum and counts are kept for every metric, so memory does not
+    grow with the length of the publish interval.
+    """
+
+    MIN_VALUE = 0
+    MAX_VALUE = 1
+    VALUE_SUM = 2
+    VALUE_COUNT = 3
+    ERROR_COUNT = 4
+    READ_TIME_SUM = 5
+    READ_TIME_COUNT = 6
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def add(self, datum):
+        """
+        Add single (module, metric, value[, read_time]) reading.
+        """
+        key = (datum[0], datum[1])
+        stats = self._metrics.get(key)
+        if stats is None:
+            stats = [None, None, 0, 0, 0, 0, 0]
+            self._metrics[key] = stats
+        value = datum[2]
+        if value is None:
+            stats[self.ERROR_COUNT] += 1
+            return
+        if stats[self.VALUE_COUNT] == 0:
+            stats[self.MIN_VALUE] = value
+            stats[self.MAX_VALUE] = value
+        elif value < stats[self.MIN_VALUE]:
+            stats[self.MIN_VALUE] = value
+        elif value > stats[self.MAX_VALUE]:
+            stats[self.MAX_VALUE] = value
+        stats[self.VALUE_SUM] += value
+        stats[self.VALUE_COUNT] += 1
+        if len(datum) > 3:
+            stats[self.READ_TIME_SUM] += datum[3]
+            stats[self.READ_TIME_COUNT] += 1
+
+    def add_data(self, data):
+        """
+        Add list of readings.
+        """
+        with self._lock:
+            for datum in data:
+                self.add(datum)
 
-def list_max(list):
-    max = list[0]
-    for elm in list[1:]:
-        if elm > max:
-            max = elm
-    return max
+    def flush(self):
+        """
+        Return aggregated values of all metrics and start new aggregation.
+        """
+        with self._lock:
+            metrics, self._metrics = self._metrics, {}
+        output_data = {}
+        for (module_name, metric_name), stats in metrics.items():
+            output = {}
+            value_count = stats[self.VALUE_COUNT]
+            if value_count > 0:
+                output["min_value"] = stats[self.MIN_VALUE]
+                output["max_value"] = stats[self.MAX_VALUE]
+                output["avg_value"] = stats[self.VALUE_SUM] / \
+                    (value_count * 1.0)
+            if stats[self.READ_TIME_COUNT] > 0:
+                output["read_time"] = stats[self.READ_TIME_SUM] / \
+                    (stats[self.READ_TIME_COUNT] * 1.0)
+            output["error_rate"] = stats[self.ERROR_COUNT] / \
+                ((value_count + stats[self.ERROR_COUNT]) * 1.0)
+            output_data["{0}.{1}".format(module_name, metric_name)] = output
+        return output_data
 
 
 class SimpleLogger(object):
@@ -51,6 +106,7 @@ class SimpleLogger(object):
 class ModuleManager(object):
 
     SERVICE_NAME = 'robophery'
+    LOG_FORMAT = "%(created)f [%(name)s] %(message)s"
     READ_INTERVAL = 2000
     PUBLISH_INTERVAL = 10000
 
@@ -61,6 +117,14 @@ class ModuleManager(object):
     NODEMCU_PLATFORM = 'nodemcu'
     FT232H_PLATFORM = 'ft232h'
 
+    SINGLE_RUN_MODE = 'single'
+    ASYNC_RUN_MODE = 'async'
+    PARALLEL_RUN_MODE = 'parallel'
+
+    SKIP_OVERRUN_POLICY = 'skip'
+    CATCH_UP_OVERRUN_POLICY = 'catch_up'
+    COALESCE_OVERRUN_POLICY = 'coalesce'
+
     _instance = None
 
     _comm = {}
@@ -68,22 +132,25 @@ class ModuleManager(object):
     _module = {}
 
     _read_cycle = 1
-    _read_iter = 1
-    _read_cache = []
 
     def __init__(self, *args, **kwargs):
         self._name = kwargs.get('name', self.SERVICE_NAME)
-        self._run_mode = 'single'  # multi
+        self._missed_ticks = {}
+        self._run_mode = kwargs.get('run_mode', self.SINGLE_RUN_MODE)
+        if self._run_mode not in self._run_modes():
+            raise ValueError("Unknown run mode {0}, use one of {1}.".format(
+                self._run_mode, ', '.join(self._run_modes())))
         self._config = kwargs.get('config')
 
         # setting up logging
         self._log_level = kwargs.get('log_level', 'info')
         self._log_handlers = kwargs.get('log_handlers', ['console'])
+        self._setup_logging()
         self._log = self._get_logger(self._name)
         self._log.info("Service {0} is starting in {1} mode.".format(
             self._name, self._run_mode))
         self._log.debug("Log level set to {0} with {1} handler(s).".format(
-            logging.DEBUG, ', '.join(self._log_handlers)))
+            self._log_level, ', '.join(self._log_handlers)))
 
         # setting up platform
         self._platform = kwargs.get('platform', None)
@@ -97,9 +164,23 @@ class ModuleManager(object):
         if self._publish_interval % self._read_interval != 0:
             raise ValueError(
                 "Publish_interval must be divisible by read_interval.")
-        self._read_cycle = self._publish_interval / self._read_interval
+        self._read_cycle = self._publish_interval // self._read_interval
         self._log.info("Read interval is {0}ms, publish interval is {1}ms, data bucket contains {2} items.".format(
             self._read_interval, self._publish_interval, self._read_cycle))
+        self._overrun_policy = kwargs.get(
+            'overrun_policy', self.SKIP_OVERRUN_POLICY)
+        if self._overrun_policy not in self._overrun_policies():
+            raise ValueError("Unknown overrun policy {0}, use one of {1}.".format(
+                self._overrun_policy, ', '.join(self._overrun_policies())))
+
+        self._aggregator = MetricAggregator()
+
+        # setting up calibration cache
+        self._calibration_cache = None
+        calibration_cache = kwargs.get('calibration_cache', None)
+        if calibration_cache is not None:
+            from robophery.utils.calibration import CalibrationCache
+            self._calibration_cache = CalibrationCache(calibration_cache)
 
         # setting up base classes
         self._setup_communication(self._config['comm'])
@@ -109,6 +190,19 @@ class ModuleManager(object):
         self._log.info("Service {0} successfuly started in {1} mode as {2} platform.".format(
             self._name, self._run_mode, self._platform))
 
+    def _setup_logging(self):
+        """
+        Configure root logger with the log level of the service.
+        """
+        try:
+            level = getattr(logging, str(self._log_level).upper(), None)
+            if not isinstance(level, int):
+                raise ValueError("Unknown log level {0}.".format(
+                    self._log_level))
+            logging.basicConfig(format=self.LOG_FORMAT, level=level)
+        except NameError:
+            pass
+
     def _get_logger(self, name):
         try:
             log = logging.getLogger(name)
@@ -116,6 +210,20 @@ class ModuleManager(object):
             log = SimpleLogger(name)
         return log
 
+    def _run_modes(self):
+        return (
+            self.SINGLE_RUN_MODE,
+            self.ASYNC_RUN_MODE,
+            self.PARALLEL_RUN_MODE
+        )
+
+    def _overrun_policies(self):
+        return (
+            self.SKIP_OVERRUN_POLICY,
+            self.CATCH_UP_OVERRUN_POLICY,
+            self.COALESCE_OVERRUN_POLICY
+        )
+
     def _linux_platforms(self):
         return (
             self.RASPBERRYPI_PLATFORM,
@@ -201,6 +309,7 @@ class ModuleManager(object):
                 module['name'] = module_name
             module['manager'] = self
             module['interface'] = self._interface[module['interface']]
+            module.setdefault('read_interval', self._read_interval)
             self._module[module_name] = ModuleClass(**module)
 
     def _load_class(self, name):
@@ -213,75 +322,100 @@ class ModuleManager(object):
                 return getattr(module, name.split(".")[-1], None)
             raise Exception("Cannot load class {0}".format(name))
 
-    def _read_data(self):
+    def _read_module(self, module_name):
+        """
+        Read data from single module, holding the lock of its bus
+        """
+        module = self._module[module_name]
+        with module._interface._bus_interface()._lock:
+            return module.read_data()
+
+    def _start_module(self, module_name):
+        """
+        Start measurement of single module, holding the lock of its bus
+        """
+        module = self._module[module_name]
+        with module._interface._bus_interface()._lock:
+            return module.start_measurement()
+
+    def _collect_module(self, module_name):
+        """
+        Collect measurement of single module, holding the lock of its bus
+        """
+        module = self._module[module_name]
+        with module._interface._bus_interface()._lock:
+            return module.collect_measurement()
+
+    def _read_modules(self, module_names):
         """
-        Read data from all registered modules
+        Read data from given modules. Measurements of split-phase modules
+        are started first, then the other modules are read and finally the
+        split-phase results are collected in the order they become ready.
         """
         data = []
-        time_start = self._get_time()
-        self._log.debug("Started data reading cycle, iteration {0} of {1}.".format(
-            self._read_iter, self._read_cycle))
-        for module_name, module in self._module.items():
-            module_data = module.read_data()
-            data = data + module_data
-        self._read_cache.append(data)
-        time_stop = self._get_time()
+        pending = []
+        blocking = []
+        for module_name in module_names:
+            ready_delta = self._start_module(module_name)
+            if ready_delta is None:
+                blocking.append(module_name)
+            else:
+                ready_time = self._get_monotonic_time() + ready_delta
+                heapq.heappush(pending, (ready_time, module_name))
+        for module_name in blocking:
+            data = data + self._read_module(module_name)
+        while pending:
+            ready_time, module_name = heapq.heappop(pending)
+            sleep_delta = ready_time - self._get_monotonic_time()
+            if sleep_delta > 0:
+                self._sleep(sleep_delta)
+            data = data + self._collect_module(module_name)
+        return data
+
+    def _group_modules(self, module_names):
+        """
+        Group modules by the physical bus they are connected to
+        """
+        groups = {}
+        for module_name in module_names:
+            bus = self._module[module_name]._interface._bus_interface()
+            groups.setdefault(bus, []).append(module_name)
+        return list(groups.values())
+
+    def _read_data(self, module_names=None):
+        """
+        Read data from given or all registered modules, in parallel run
+        mode the modules on different buses are read concurrently.
+        """
+        data = []
+        time_start = self._get_monotonic_time()
+        if module_names is None:
+            module_names = list(self._module)
+        self._log.debug("Started data reading of modules {0}.".format(
+            ', '.join(module_names)))
+        if self._run_mode == self.PARALLEL_RUN_MODE:
+            futures = [self._executor.submit(self._read_modules, group)
+                       for group in self._group_modules(module_names)]
+            for future in futures:
+                data = data + future.result()
+        else:
+            data = self._read_modules(module_names)
+        self._aggregator.add_data(data)
+        time_stop = self._get_monotonic_time()
         time_delta = time_stop - time_start
-        self._log.debug("Finished data reading cycle, iteration {0} of {1}, operation took {2} ms.".format(
-            self._read_iter, self._read_cycle, time_delta * 1000))
+        self._log.debug("Finished data reading of modules {0}, operation took {1} ms.".format(
+            ', '.join(module_names), time_delta * 1000))
         return time_delta
 
     def _publish_data(self):
         self._log.info("Started publishing data.")
-        cache = self._read_cache
-        data = {}
-        output_data = {}
-        for i in range(self._read_cycle):
-            cycle_data = cache[i]
-            for metric in cycle_data:
-                name = "{0}.{1}".format(metric[0], metric[1])
-                if metric[2] is not None:
-                    if "{0}.value".format(name) in data:
-                        data["{0}.value".format(name)].append(metric[2])
-                    else:
-                        data["{0}.value".format(name)] = [metric[2]]
-                    if len(metric) > 3:
-                        if "{0}.read_time".format(name) in data:
-                            data["{0}.read_time".format(
-                                name)].append(metric[3])
-                        else:
-                            data["{0}.read_time".format(name)] = [metric[3]]
-                    if "{0}.error".format(name) in data:
-                        data["{0}.error".format(name)].append(0)
-                    else:
-                        data["{0}.error".format(name)] = [0]
-                else:
-                    if "{0}.error".format(name) in data:
-                        data["{0}.error".format(name)].append(1)
-                    else:
-                        data["{0}.error".format(name)] = [1]
-        for datum_name, datum in data.items():
-            metric_name = '.'.join(datum_name.split('.')[:-1])
-            if not metric_name in output_data:
-                output_data[metric_name] = {}
-            metric_type = datum_name.split('.')[-1]
-            if metric_type == 'value':
-                value_min = list_min(datum)
-                value_max = list_max(datum)
-                value_avg = list_avg(datum)
-                output_data[metric_name]["min_value"] = value_min
-                output_data[metric_name]["max_value"] = value_max
-                output_data[metric_name]["avg_value"] = value_avg
-            if metric_type == 'read_time':
-                read_avg = list_avg(datum)
-                output_data[metric_name]["read_time"] = read_avg
-            if metric_type == 'error':
-                error_avg = list_avg(datum)
-                output_data[metric_name]["error_rate"] = error_avg
+        missed_ticks, self._missed_ticks = self._missed_ticks, {}
+        self._aggregator.add_data(
+            [(module_name, 'missed_ticks', missed_ticks.get(module_name, 0))
+             for module_name in self._module])
+        output_data = self._aggregator.flush()
         for comm_name, comm in self._comm.items():
             comm.send_data(output_data)
-        self._read_cache = []
-        self._read_iter = 1
 
     def _sleep(self, seconds):
         """
@@ -296,43 +430,281 @@ class ModuleManager(object):
         """
         return time.time()
 
+    def _get_monotonic_time(self):
+        """
+        Get monotonic time, not affected by wall-clock changes.
+        """
+        return getattr(time, 'monotonic', time.time)()
+
+    def _next_deadline(self, deadline, interval, time_now, policy=None):
+        """
+        Get the absolute deadline following the given one and the number
+        of ticks that missed their deadline. Skip policy continues with the
+        next future tick, catch-up policy runs every late tick back to back
+        and coalesce policy merges all late ticks into single immediate one.
+        """
+        if policy is None:
+            policy = self._overrun_policy
+        next_deadline = deadline + interval
+        if next_deadline >= time_now:
+            return next_deadline, 0
+        if policy == self.CATCH_UP_OVERRUN_POLICY:
+            return next_deadline, 1
+        missed = int((time_now - next_deadline) // interval) + 1
+        if policy == self.SKIP_OVERRUN_POLICY:
+            next_deadline += missed * interval
+        elif policy == self.COALESCE_OVERRUN_POLICY:
+            next_deadline += (missed - 1) * interval
+        return next_deadline, missed
+
+    def _miss_ticks(self, module_name, missed):
+        if missed > 0:
+            self._missed_ticks[module_name] = self._missed_ticks.get(
+                module_name, 0) + missed
+            self._log.debug("Module {0} missed {1} read tick(s).".format(
+                module_name, missed))
+
     def _single_loop(self):
         """
-        Run single global service loop
+        Run single global service loop, modules are kept in priority queue
+        ordered by the deadline of their next read, so every module is read
+        at its own read interval.
         """
+        time_now = self._get_monotonic_time()
+        schedule = [(time_now, module_name) for module_name in self._module]
+        heapq.heapify(schedule)
+        publish_interval = self._publish_interval / 1000.0
+        publish_deadline = time_now + publish_interval
         while True:
-            time_delta = self._read_data()
-            sleep_delta = (self._read_interval / 1000) - time_delta
-            if self._read_iter < self._read_cycle:
-                self._read_iter += 1
-            else:
+            time_now = self._get_monotonic_time()
+            due_modules = []
+            while schedule and schedule[0][0] <= time_now:
+                due_modules.append(heapq.heappop(schedule))
+            if due_modules:
+                self._read_data([module_name for deadline, module_name
+                                 in due_modules])
+                time_now = self._get_monotonic_time()
+                for deadline, module_name in due_modules:
+                    read_interval = self._module[module_name]._read_interval
+                    deadline, missed = self._next_deadline(
+                        deadline, read_interval / 1000.0, time_now)
+                    self._miss_ticks(module_name, missed)
+                    heapq.heappush(schedule, (deadline, module_name))
+            if publish_deadline <= self._get_monotonic_time():
                 self._publish_data()
+                publish_deadline, missed = self._next_deadline(
+                    publish_deadline, publish_interval,
+                    self._get_monotonic_time(), self.SKIP_OVERRUN_POLICY)
+            if schedule:
+                next_deadline = min(schedule[0][0], publish_deadline)
+            else:
+                next_deadline = publish_deadline
+            sleep_delta = next_deadline - self._get_monotonic_time()
             if sleep_delta > 0:
                 self._sleep(sleep_delta)
 
+    async def _handle_module(self, module_name):
+        """
+        Read single module in its own task, blocking reads are run in the
+        executor so they do not stall the other modules.
+        """
+        import asyncio
+        read_interval = self._module[module_name]._read_interval / 1000.0
+        deadline = self._get_monotonic_time()
+        while True:
+            try:
+                ready_delta = await self._loop.run_in_executor(
+                    self._executor, self._start_module, module_name)
+                if ready_delta is None:
+                    module_data = await self._loop.run_in_executor(
+                        self._executor, self._read_module, module_name)
+                else:
+                    await asyncio.sleep(ready_delta)
+                    module_data = await self._loop.run_in_executor(
+                        self._executor, self._collect_module, module_name)
+            except Exception as exception:
+                self._log.error("Failure reading module {0}: {1}".format(
+                    module_name, exception))
+            else:
+                self._aggregator.add_data(module_data)
+            deadline, missed = self._next_deadline(
+                deadline, read_interval, self._get_monotonic_time())
+            self._miss_ticks(module_name, missed)
+            sleep_delta = deadline - self._get_monotonic_time()
+            if sleep_delta > 0:
+                await asyncio.sleep(sleep_delta)
+
+    async def _handle_publish(self):
+        """
+        Publish data collected by the module tasks in regular intervals.
+        """
+        import asyncio
+        publish_interval = self._publish_interval / 1000.0
+        deadline = self._get_monotonic_time() + publish_interval
+        while True:
+            sleep_delta = deadline - self._get_monotonic_time()
+            if sleep_delta > 0:
+                await asyncio.sleep(sleep_delta)
+            await self._loop.run_in_executor(
+                self._executor, self._publish_data)
+            deadline, missed = self._next_deadline(
+                deadline, publish_interval, self._get_monotonic_time(),
+                self.SKIP_OVERRUN_POLICY)
+
+    def _async_loop(self, modules=None):
+        """
+        Run asynchronous service loop with one task per module
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        module_names = list(modules or self._module)
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(module_names) + 1)
+        tasks = [self._loop.create_task(self._handle_module(module_name))
+                 for module_name in module_names]
+        tasks.append(self._loop.create_task(self._handle_publish()))
+        try:
+            self._loop.run_forever()
+        except KeyboardInterrupt:
+            self._log.info("Service {0} is stopping.".format(self._name))
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True))
+            self._executor.shutdown(wait=True)
+            self._loop.close()
+
     def run(self, modules=None):
         """
         Run robophery manager service
         """
-        if self._run_mode == 'single':
+        if self._run_mode == self.SINGLE_RUN_MODE:
             self._single_loop()
-        else:
-
-            for module in modules or self._module:
-                if not module.own_loop:
-                    self.loop.create_task(self.handle_module(module))
-                else:
-                    module.start_loop()
+        elif self._run_mode == self.PARALLEL_RUN_MODE:
+            from concurrent.futures import ThreadPoolExecutor
+            buses = self._group_modules(list(self._module))
+            self._executor = ThreadPoolExecutor(max_workers=max(len(buses), 1))
             try:
-                self.loop.run_forever()
-            except KeyboardInterrupt:
-                for module in modules or self._module:
-                    if module.own_loop:
-                        module.stop_loop()
-                self.loop.create_task(self.async_stop())
-                self.loop.run_forever()
+                self._single_loop()
             finally:
-                self.loop.close()
+                self._executor.shutdown(wait=True)
+        elif self._run_mode == self.ASYNC_RUN_MODE:
+            self._async_loop(modules)
+
+
+class Comm(object):
+    """
+    Base class for implementing communication channels. Data that cannot
+    be sent are stored to optional disk spool and sent after the channel
+    recovers.
+    """
+
+    SPOOL_SIZE = 1048576
+    SPOOL_DRAIN_LIMIT = 100
+    RETRY_DELAY = 5
+    MAX_RETRY_DELAY = 300
+
+    def __init__(self, *args, **kwargs):
+        self._name = kwargs.get('name')
+        self._class = kwargs.get('class', None)
+        self._manager = kwargs.get('manager', None)
+        self._log = self._manager._get_logger(self._name)
+        self._spool = None
+        spool_path = kwargs.get('spool_path', None)
+        if spool_path is not None:
+            from robophery.utils.spool import FileSpool
+            self._spool = FileSpool(spool_path,
+                                    kwargs.get('spool_size', self.SPOOL_SIZE),
+                                    kwargs.get('spool_policy',
+                                               FileSpool.DROP_OLDEST_POLICY))
+        self._spool_drain_limit = kwargs.get(
+            'spool_drain_limit', self.SPOOL_DRAIN_LIMIT)
+        self._retry_delay = 0
+        self._retry_time = 0
+        self._log.info("Started communication channel {0}.".format(self))
+
+    def __str__(self):
+        return self._base_name()
+
+    def _base_name(self):
+        return '{0} {1}'.format(self._class.split('.')[-1], self._name)
+
+    def _get_monotonic_time(self):
+        """
+        Get monotonic time, not affected by wall-clock changes.
+        """
+        return getattr(time, 'monotonic', time.time)()
+
+    def _spool_data(self, data, timestamp):
+        """
+        Store data to the spool.
+        """
+        payload = json.dumps({'time': timestamp, 'data': data})
+        if not self._spool.push(payload.encode('utf8')):
+            self._log.error("Spool is full, data from {0} dropped.".format(
+                timestamp))
+
+    def _send_failed(self, exception):
+        """
+        Postpone the next sending attempt with exponential backoff.
+        """
+        self._retry_delay = min(max(self._retry_delay * 2, self.RETRY_DELAY),
+                                self.MAX_RETRY_DELAY)
+        self._retry_time = self._get_monotonic_time() + self._retry_delay
+        self._log.error("Error sending data, next attempt in {0} s: {1}".format(
+            self._retry_delay, exception))
+
+    def _drain_spool(self):
+        """
+        Send spooled data, oldest first. Return True if the spool is empty.
+        """
+        for i in range(self._spool_drain_limit):
+            payload = self._spool.peek()
+            if payload is None:
+                return True
+            record = json.loads(payload.decode('utf8'))
+            try:
+                self._send_data(record['data'], record['time'])
+            except Exception as exception:
+                self._send_failed(exception)
+                return False
+            self._spool.pop()
+        return len(self._spool) == 0
+
+    def send_data(self, data):
+        """
+        Send data to the channel, or to the spool when the channel is down
+        or older data are still waiting in the spool.
+        """
+        timestamp = time.time()
+        if self._spool is not None:
+            if self._retry_time > self._get_monotonic_time():
+                self._spool_data(data, timestamp)
+                return
+            if not self._drain_spool():
+                self._spool_data(data, timestamp)
+                return
+        try:
+            self._send_data(data, timestamp)
+        except Exception as exception:
+            self._send_failed(exception)
+            if self._spool is not None:
+                self._spool_data(data, timestamp)
+        else:
+            self._retry_delay = 0
+
+    def _send_data(self, data, timestamp):
+        """
+        Send data measured at timestamp, raise exception on failure.
+        """
+        for name, datum in data.items():
+            self.send_datum({name: datum})
+
+    def send_datum(self, datum):
+        raise NotImplementedError
 
 
 class Interface(object):
@@ -343,12 +715,23 @@ class Interface(object):
         self._name = kwargs.get('name', self.DEVICE_NAME)
         self._class = kwargs.get('class', None)
         self._manager = kwargs.get('manager', None)
+        self._lock = threading.RLock()
         self._log = self._manager._get_logger(self._name)
         self._log.info("Started bus interface {0}.".format(self))
 
     def __str__(self):
         return self._base_name()
 
+    def _bus_interface(self):
+        """
+        Get the interface of the physical bus, interfaces connected through
+        parent interface share the bus of their parent.
+        """
+        interface = self
+        while getattr(interface, '_parent_interface', None) is not None:
+            interface = interface._parent_interface
+        return interface
+
     def _msleep(self, milliseconds):
         """
         Sleep for the specified amount of milliseconds.
@@ -425,3 +808,26 @@ class Module(object):
         Get specific time.
         """
         return time.time()
+
+    def _get_monotonic_time(self):
+        """
+        Get monotonic time, not affected by wall-clock changes.
+        """
+        return getattr(time, 'monotonic', time.time)()
+
+    def start_measurement(self):
+        """
+        Trigger the measurement without waiting for the conversion to
+        complete. Return the number of seconds until the result can be
+        collected by collect_measurement(), or None if the module does not
+        support split-phase reading and read_data() has to be used.
+        """
+        return None
+
+    def collect_measurement(self):
+        """
+        Collect the result of the measurement triggered by
+        start_measurement(). Return the readings in the same format as
+        read_data().
+        """
+        raise NotImplementedError
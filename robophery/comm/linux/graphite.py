@@ -1,32 +1,119 @@
+import select
 import socket
+import struct
 import time
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 from robophery.comm.graphite import GraphiteCarbonComm
 
 
 class LinuxGraphiteCarbonComm(GraphiteCarbonComm):
 
+    PLAINTEXT_PROTOCOL = 'plaintext'
+    PICKLE_PROTOCOL = 'pickle'
+
+    DEFAULT_PORTS = {
+        PLAINTEXT_PROTOCOL: 2003,
+        PICKLE_PROTOCOL: 2004,
+    }
+
+    CONNECT_TIMEOUT = 10
+
     def __init__(self, *args, **kwargs):
+        self._protocol = kwargs.get('protocol', self.PLAINTEXT_PROTOCOL)
+        if self._protocol not in self.DEFAULT_PORTS:
+            raise ValueError("Unknown Carbon protocol {0}.".format(
+                self._protocol))
         self._host = kwargs.get('host', 'localhost')
-        self._port = kwargs.get('port', 8125)
+        self._port = kwargs.get('port', self.DEFAULT_PORTS[self._protocol])
+        self._timeout = kwargs.get('timeout', self.CONNECT_TIMEOUT)
         self._manager = kwargs.get('manager', None)
         self._prefix = kwargs.get('prefix', self._manager._name)
+        self._socket = None
         super(LinuxGraphiteCarbonComm, self).__init__(*args, **kwargs)
 
-    def send_datum(self, datum):
-        message = []
-        log_message = {}
-        current_time = int(time.time())
-        for name, value in datum.items():
+    def __str__(self):
+        return "{0} (connected to tcp://{1}:{2} using {3} protocol, prefix {4})".format(self._base_name(), self._host, self._port, self._protocol, self._prefix)
+
+    def _connection_closed(self):
+        """
+        Check whether Carbon closed the connection. Carbon never sends
+        anything, so readable socket means EOF or error.
+        """
+        try:
+            readable = select.select([self._socket], [], [], 0)[0]
+            return bool(readable) and not self._socket.recv(1)
+        except (socket.error, select.error, ValueError):
+            return True
+
+    def _connect(self):
+        """
+        Get connection to Carbon, open new one if there is none or the
+        existing one was closed by the server.
+        """
+        if self._socket is not None and self._connection_closed():
+            self._log.info("Connection to tcp://{0}:{1} closed.".format(
+                self._host, self._port))
+            self._disconnect()
+        if self._socket is None:
+            sock = socket.create_connection((self._host, self._port),
+                                            self._timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._socket = sock
+            self._log.info("Connected to tcp://{0}:{1}.".format(
+                self._host, self._port))
+        return self._socket
+
+    def _disconnect(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except socket.error:
+                pass
+            self._socket = None
+
+    def _get_metrics(self, data, timestamp):
+        """
+        Get list of (path, (timestamp, value)) tuples from the data.
+        """
+        metrics = []
+        current_time = int(timestamp)
+        for name, value in data.items():
             for value_name, value_value in value.items():
-                bucket = "{0}.{1}.{2}".format(self._prefix, name, value_name)
-                message.append("{0} {1} {2}".format(bucket, value_value, current_time))
-                log_message[bucket] = value_value
-        message_string = '\n'.join(message) + '\n'
+                path = "{0}.{1}.{2}".format(self._prefix, name, value_name)
+                metrics.append((path, (current_time, value_value)))
+        return metrics
+
+    def _encode_metrics(self, metrics):
+        if self._protocol == self.PICKLE_PROTOCOL:
+            payload = pickle.dumps(metrics, protocol=2)
+            return struct.pack('!L', len(payload)) + payload
+        lines = ["{0} {1} {2}\n".format(path, value, current_time)
+                 for path, (current_time, value) in metrics]
+        return ''.join(lines).encode('utf8')
+
+    def _send_data(self, data, timestamp):
+        metrics = self._get_metrics(data, timestamp)
+        if not metrics:
+            return
+        message = self._encode_metrics(metrics)
         try:
-            sock = socket.socket()
-            sock.connect((self._host, self._port))
-            sock.sendall(message_string)
-            sock.close()
-            self._log.debug("Published buckets {0} to {1}.".format(log_message, self._host))
-        except:
-            self._log.error("Error publishing buckets {0} to {1}.".format(log_message, self._host))
+            self._connect().sendall(message)
+        except (socket.error, IOError):
+            # Connection may be closed by Carbon while idle, reconnect once
+            # before reporting failure.
+            self._disconnect()
+            try:
+                self._connect().sendall(message)
+            except (socket.error, IOError):
+                self._disconnect()
+                raise
+        self._log.debug("Published {0} buckets to {1}.".format(
+            len(metrics), self._host))
+
+    def send_datum(self, datum, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        self._send_data(datum, timestamp)
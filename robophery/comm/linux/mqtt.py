@@ -1,13 +1,16 @@
+import json
 import paho.mqtt.client as mqtt
-import paho.mqtt.publish as publish
 from robophery.comm.mqtt import MqttComm
+from robophery.utils.senml import SenMLDocument, SenMLMeasurement
 
 
 class PahoMqttComm(MqttComm):
 
     def __init__(self, *args, **kwargs):
+        self._publish_batch = kwargs.get('publish_batch', False)
+        self._publish_qos = kwargs.get('publish_qos', 0)
         super(PahoMqttComm, self).__init__(*args, **kwargs)
-        self._client = mqtt.Client()
+        self._client = mqtt.Client(client_id=self._manager._name)
         self._client.on_connect = self._on_connect
         self._client.on_message = self._on_message
         self._client.connect(self._host, self._port, 60)
@@ -32,7 +35,34 @@ class PahoMqttComm(MqttComm):
             msg.payload, msg.topic))
         self.receive_data(msg.topic, msg.payload)
 
-    def send_data(self, data):
+    def _to_senml(self, data, timestamp):
+        """
+        Convert values of all devices to single SenML document.
+        """
+        measurements = []
+        for device_name, datum in data.items():
+            for metric_name, value in datum.items():
+                measurements.append(SenMLMeasurement(
+                    name="{0}.{1}".format(device_name, metric_name),
+                    value=value))
+        base = SenMLMeasurement(name="{0}.".format(self._manager._name),
+                                time=timestamp)
+        return json.dumps(SenMLDocument(measurements=measurements,
+                                        base=base).to_json())
+
+    def _publish(self, topic, payload):
+        """
+        Publish the payload using the persistent client connection.
+        """
+        info = self._client.publish(topic, payload=payload,
+                                    qos=self._publish_qos)
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            raise IOError("Error publishing message to {0}/{1}, result code {2}.".format(
+                self._host, topic, info.rc))
+        self._log.debug(
+            "Published message {0} to {1}/{2}.".format(payload, self._host, topic))
+
+    def _send_data(self, data, timestamp):
         final_data = {}
         for name, datum in data.items():
             names = name.split('.')
@@ -41,15 +71,10 @@ class PahoMqttComm(MqttComm):
                     final_data[names[0]][names[1]] = datum['avg_value']
                 else:
                     final_data[names[0]] = {names[1]: datum['avg_value']}
-        for name, datum in final_data.items():
-            topic = "{0}/{1}".format(self._publish_topic, name)
-            publish.single(topic,
-                           payload=self._to_string(datum),
-                           hostname=self._host,
-                           client_id=self._manager._name,
-                           # auth=auth,
-                           # tls=tls,
-                           port=self._port,
-                           protocol=mqtt.MQTTv311)
-            self._log.debug(
-                "Published message {0} to {1}/{2}.".format(datum, self._host, topic))
+        if self._publish_batch:
+            self._publish(self._publish_topic,
+                          self._to_senml(final_data, timestamp))
+        else:
+            for name, datum in final_data.items():
+                topic = "{0}/{1}".format(self._publish_topic, name)
+                self._publish(topic, self._to_string(datum))
@@ -7,12 +7,19 @@ class LinuxStatsdComm(StatsdComm):
         self._host = kwargs.get('host', 'localhost')
         self._port = kwargs.get('port', 8125)
         self._sample_rate = kwargs.get('sample_rate', 1)
+        self._mtu = kwargs.get('mtu', 512)
         self._manager = kwargs.get('manager', None)
         self._prefix = kwargs.get('prefix', self._manager._name)
         self._client = StatsdClient(host=self._host, port=self._port,
-            sample_rate=self._sample_rate, prefix=self._prefix)
+            sample_rate=self._sample_rate, prefix=self._prefix, mtu=self._mtu)
         super(LinuxStatsdComm, self).__init__(*args, **kwargs)
 
+    def _send_data(self, data, timestamp):
+        self._client.begin()
+        try:
+            super(LinuxStatsdComm, self)._send_data(data, timestamp)
+        finally:
+            self._client.flush()
 
     def send_datum(self, datum):
         for name, value in datum.items():
@@ -1,3 +1,5 @@
+import collections
+import time
 from robophery.base import Interface, Module
 
 
@@ -24,12 +26,17 @@ class GpioModule(Module):
         self.is_low = self._interface.is_low
         self.input_pins = self._interface.input_pins
         self.output_pins = self._interface.output_pins
+        self.output_pins_sequence = self._interface.output_pins_sequence
         self.setup_pins = self._interface.setup_pins
         self.add_event_detect = self._interface.add_event_detect
         self.remove_event_detect = self._interface.remove_event_detect
         self.add_event_callback = self._interface.add_event_callback
         self.event_detected = self._interface.event_detected
         self.wait_for_edge = self._interface.wait_for_edge
+        self.add_event_queue = self._interface.add_event_queue
+        self.remove_event_queue = self._interface.remove_event_queue
+        self.read_events = self._interface.read_events
+        self.events_dropped = self._interface.events_dropped
         self.cleanup = self._interface.cleanup
 
 
@@ -59,8 +66,16 @@ class GpioInterface(Interface):
     GPIO_DRIVE_MEDIUM = 1
     GPIO_DRIVE_HIGH = 2
 
+    # Minimal time in microseconds between two steps of output sequence.
+    OUTPUT_STEP_TIME = 0
+
+    EVENT_QUEUE_SIZE = 1024
+
     def __init__(self, *args, **kwargs):
         self._pins = {}
+        self._event_queues = {}
+        self._events_dropped = {}
+        self._event_clock = getattr(time, 'monotonic', time.time)
         super(GpioInterface, self).__init__(*args, **kwargs)
 
     def setup_pin(self, pin, mode, pull_up_down=None):
@@ -126,6 +141,18 @@ class GpioInterface(Interface):
         for pin, value in iter(pins.items()):
             self.output(pin, value)
 
+    def output_pins_sequence(self, steps):
+        """
+        Set multiple pins in several steps. Steps should be a list of dicts
+        of pin name to pin value, applied one after another.
+
+        General implementation just sets pins of every step by output_pins.
+        Subclasses on buses with block writes can send whole sequence in
+        single transaction.
+        """
+        for pins in steps:
+            self.output_pins(pins)
+
     def setup_pins(self, pins):
         """
         Setup multiple pins as inputs or outputs at once. Pins should be a
@@ -141,7 +168,7 @@ class GpioInterface(Interface):
         """
         return [self.input(pin) for pin in pins]
 
-    def add_event_detect(self, pin, edge):
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=-1):
         """
         Enable edge detection events for a particular GPIO channel. Pin 
         should be type IN. Edge must be RISING, FALLING or BOTH.
@@ -177,6 +204,90 @@ class GpioInterface(Interface):
         """
         raise NotImplementedError
 
+    def add_event_queue(self, pin, edge, size=None, bouncetime=-1):
+        """
+        Enable edge detection with events stored in bounded queue, to be
+        read in batches by read_events(). Oldest events are dropped when
+        the queue is full. Pin should be type IN. Edge must be RISING,
+        FALLING or BOTH.
+
+        General implementation records the events from the edge detection
+        callback and is approximate. Events are timestamped when the callback
+        runs, not when the edge occurred, and the edge of BOTH events is taken
+        from the pin value read in the callback, which may have changed again
+        since. Backends whose callbacks report the edge override
+        _get_callback_edge(), subclasses with kernel edge events push them
+        with their timestamps.
+        """
+        self._create_event_queue(pin, size)
+
+        def callback(*args):
+            timestamp = self._event_clock()
+            self._push_event(pin, self._get_callback_edge(pin, edge, args),
+                             timestamp)
+
+        self.add_event_detect(pin, edge, callback=callback,
+                              bouncetime=bouncetime)
+
+    def _get_callback_edge(self, pin, edge, args):
+        """
+        Return edge of the event from arguments of edge detection callback.
+        General implementation takes the edge of BOTH events from the pin
+        value.
+        """
+        if edge != self.GPIO_EVENT_BOTH:
+            return edge
+        if self.input(pin):
+            return self.GPIO_EVENT_RISING
+        return self.GPIO_EVENT_FALLING
+
+    def _create_event_queue(self, pin, size=None):
+        self._event_queues[pin] = collections.deque(
+            maxlen=size or self.EVENT_QUEUE_SIZE)
+        self._events_dropped[pin] = 0
+
+    def remove_event_queue(self, pin):
+        """
+        Disable edge detection enabled by add_event_queue().
+        """
+        self.remove_event_detect(pin)
+        self._event_queues.pop(pin, None)
+        self._events_dropped.pop(pin, None)
+
+    def read_events(self, pin):
+        """
+        Remove and return queued events of the pin as list of (pin, edge,
+        timestamp) tuples, oldest first. Timestamps are monotonic seconds.
+        """
+        queue = self._event_queues.get(pin)
+        events = []
+        if queue is None:
+            return events
+        # Single consumer pops from the left while producer appends to the
+        # right, both are atomic on deque.
+        while queue:
+            events.append(queue.popleft())
+        return events
+
+    def events_dropped(self, pin):
+        """
+        Return number of events dropped because the queue was full.
+        """
+        return self._events_dropped.get(pin, 0)
+
+    def _push_event(self, pin, edge, timestamp=None):
+        """
+        Store edge event, called from the thread detecting edges.
+        """
+        queue = self._event_queues.get(pin)
+        if queue is None:
+            return
+        if timestamp is None:
+            timestamp = self._event_clock()
+        if len(queue) == queue.maxlen:
+            self._events_dropped[pin] += 1
+        queue.append((pin, edge, timestamp))
+
     def cleanup(self, pin=None):
         """
         Clean up GPIO event detection for specific pin, or all pins if none 
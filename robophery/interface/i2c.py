@@ -1,4 +1,6 @@
+import threading
 from robophery.base import Interface, Module
+from robophery.utils.trace import BusTrace
 
 
 class I2cModule(Module):
@@ -10,6 +12,24 @@ class I2cModule(Module):
     def __str__(self):
         return "{0} (connected to {1}, address {2:#x})".format(self._base_name(), self._interface._name, self._addr)
 
+    def _get_calibration_cache(self):
+        return getattr(self._manager, '_calibration_cache', None)
+
+    def _get_cached_calibration(self, chip_id):
+        """
+        Get calibration coefficients stored by the manager calibration
+        cache, or None if there are none.
+        """
+        cache = self._get_calibration_cache()
+        if cache is None:
+            return None
+        return cache.get(self._interface._name, self._addr, chip_id)
+
+    def _set_cached_calibration(self, chip_id, values):
+        cache = self._get_calibration_cache()
+        if cache is not None:
+            cache.set(self._interface._name, self._addr, chip_id, values)
+
     def writeRaw8(self, value):
         self._interface.writeRaw8(self._addr, value)
 
@@ -22,9 +42,15 @@ class I2cModule(Module):
     def writeList(self, register, data):
         self._interface.writeList(self._addr, register, data)
 
+    def writeRawList(self, data):
+        self._interface.writeRawList(self._addr, data)
+
     def readRaw8(self):
         return self._interface.readRaw8(self._addr)
 
+    def readRawList(self, length):
+        return self._interface.readRawList(self._addr, length)
+
     def readU8(self, register):
         return self._interface.readU8(self._addr, register)
 
@@ -40,19 +66,94 @@ class I2cModule(Module):
     def readList(self, register, length):
         return self._interface.readList(self._addr, register, length)
 
+    def writeReadList(self, data, length):
+        return self._interface.writeReadList(self._addr, data, length)
+
+    def readLists(self, requests):
+        return self._interface.readLists(self._addr, requests)
+
 
 class I2cInterface(Interface):
     """
     Base class for implementing I2C bus.
     """
 
+    # Longest block transfer supported by the bus, SMBus limits blocks to
+    # 32 bytes.
+    MAX_BLOCK_LENGTH = 32
+
+    TRACE_SIZE = 1024
+
+    # method name, has register argument, returns data
+    TRACED_METHODS = (
+        ('writeRaw8', False, False),
+        ('write8', True, False),
+        ('write16', True, False),
+        ('writeList', True, False),
+        ('writeRawList', False, False),
+        ('readRaw8', False, True),
+        ('readRawList', False, True),
+        ('readU8', True, True),
+        ('readS8', True, True),
+        ('readU16', True, True),
+        ('readS16', True, True),
+        ('readList', True, True),
+        ('writeReadList', False, True),
+        ('readLists', False, True),
+    )
+
     def __init__(self, *args, **kwargs):
         self._addrs_used = []
+        self._trace = None
+        if kwargs.get('trace', False):
+            self._setup_trace(kwargs.get('trace_size', self.TRACE_SIZE))
         super(I2cInterface, self).__init__(*args, **kwargs)
 
     def __str__(self):
         return "%s (bus number: %s)" % (self._base_name(), self._busnum)
 
+    def _setup_trace(self, size):
+        """
+        Record all bus transactions to ring buffer. Bus methods are wrapped
+        only when tracing is enabled, so disabled tracing costs nothing.
+        """
+        self._trace = BusTrace(size, [method[0]
+                                      for method in self.TRACED_METHODS])
+        self._traced_calls = threading.local()
+        for code, (name, has_register, is_read) in enumerate(
+                self.TRACED_METHODS):
+            setattr(self, name, self._traced_method(
+                code, getattr(self, name), has_register, is_read))
+
+    def _traced_method(self, code, method, has_register, is_read):
+        trace = self._trace
+        calls = self._traced_calls
+
+        def traced(addr, *args, **kwargs):
+            # Only the outermost call is recorded, methods implemented by
+            # other bus methods would be traced twice otherwise.
+            if getattr(calls, 'active', False):
+                return method(addr, *args, **kwargs)
+            calls.active = True
+            try:
+                result = method(addr, *args, **kwargs)
+            finally:
+                calls.active = False
+            trace.record(code, addr,
+                         args[0] if has_register else None,
+                         result if is_read else args[-1])
+            return result
+        return traced
+
+    def get_trace(self):
+        """
+        Get list of traced transactions as (time, operation, address,
+        register, length, value) tuples, oldest first.
+        """
+        if self._trace is None:
+            return []
+        return self._trace.records()
+
     def setup_addr(self, addr):
         """
         Set the specified address.
@@ -83,12 +184,32 @@ class I2cInterface(Interface):
         """
         raise NotImplementedError
 
+    def writeRawList(self, addr, data):
+        """
+        Write bytes on the bus (without register). Bytes are sent as register
+        block writes, the first byte of every block goes as the register.
+        """
+        block_length = self.MAX_BLOCK_LENGTH + 1
+        for start in range(0, len(data), block_length):
+            block = list(data[start:start + block_length])
+            if len(block) == 1:
+                self.writeRaw8(addr, block[0])
+            else:
+                self.writeList(addr, block[0], block[1:])
+
     def readRaw8(self):
         """
         Read an 8-bit value on the bus (without register).
         """
         raise NotImplementedError
 
+    def readRawList(self, addr, length):
+        """
+        Read a length number of bytes on the bus (without register). Buses
+        without plain block reads read the bytes one by one.
+        """
+        return [self.readRaw8(addr) for i in range(length)]
+
     def readU8(self, addr, register):
         """
         Read an unsigned byte from the specified register.
@@ -123,3 +244,21 @@ class I2cInterface(Interface):
         will be returned as a bytearray.
         """
         raise NotImplementedError
+
+    def writeReadList(self, addr, data, length):
+        """
+        Write bytes and then read a length number of bytes, with repeated
+        start if supported by the bus. Buses without combined transactions
+        support only single byte writes, used as register to read from.
+        """
+        if len(data) != 1:
+            raise NotImplementedError
+        return self.readList(addr, data[0], length)
+
+    def readLists(self, addr, requests):
+        """
+        Read list of (register, length) requests. Buses with combined
+        transactions read all of them in single transaction.
+        """
+        return [self.readList(addr, register, length)
+                for register, length in requests]
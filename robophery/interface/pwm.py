@@ -1,4 +1,5 @@
 from robophery.base import Interface, Module
+from robophery.utils.motion import MotionEngine
 
 
 class PwmModule(Module):
@@ -7,6 +8,7 @@ class PwmModule(Module):
         super(PwmModule, self).__init__(*args, **kwargs)
         self.setup_pin = self._interface.setup_pin
         self.set_duty_cycle = self._interface.set_duty_cycle
+        self.set_duty_cycles = self._interface.set_duty_cycles
         self.set_frequency = self._interface.set_frequency
         self.stop = self._interface.stop
 
@@ -25,11 +27,22 @@ class PwmInterface(Interface):
 
     def __init__(self, *args, **kwargs):
         self._pins_used = []
+        self._motion_engine = None
         super(PwmInterface, self).__init__(*args, **kwargs)
 
     def _use_pin(self, pin):
         self._pins_used.append(pin)
 
+    def get_motion_engine(self, rate=50):
+        """
+        Get engine interpolating moves of the outputs, started on first use
+        with update rate in Hz.
+        """
+        with self._lock:
+            if self._motion_engine is None:
+                self._motion_engine = MotionEngine(self, rate)
+            return self._motion_engine
+
     def setup_pin(self, pin, dutycycle, frequency=2000):
         """
         Enable PWM output on specified pin. Set to initial percent duty cycle
@@ -44,6 +57,14 @@ class PwmInterface(Interface):
         """
         raise NotImplementedError
 
+    def set_duty_cycles(self, dutycycles):
+        """
+        Set duty cycles of several pins given as dict of pin to duty cycle.
+        General implementation sets the pins one by one.
+        """
+        for pin, dutycycle in dutycycles.items():
+            self.set_duty_cycle(pin, dutycycle)
+
     def set_frequency(self, pin, frequency):
         """
         Set frequency (in Hz) of PWM output on specified pin.
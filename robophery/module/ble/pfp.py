@@ -1,3 +1,9 @@
+try:
+    import numpy
+except ImportError:
+    HAVE_NUMPY = False
+else:
+    HAVE_NUMPY = True
 from robophery.interface.ble import BleModule
 
 
@@ -45,8 +51,7 @@ class ParrotFlowerPowerModule(BleModule):
         battery_level = int(raw_value, 16)
         return battery_level
 
-    def get_luminosity(self):
-        raw_value = self._read_uuid(self.LIGHT_UUID)
+    def _convert_luminosity(self, raw_value):
         if raw_value > 0:
             luminosity = 0.08640000000000001 * \
                 (192773.17000000001 * pow(raw_value, -1.0606619))
@@ -54,21 +59,7 @@ class ParrotFlowerPowerModule(BleModule):
             luminosity = 0
         return luminosity
 
-    def get_air_temperature(self):
-        raw_value = self._read_uuid(self.AIR_TEMPERATURE_UUID)
-        if raw_value != 0:
-            temperature = 0.00000003044 * pow(raw_value, 3) - 0.00008038 * pow(
-                raw_value, 2) + raw_value * 0.1149 - 30.449999999999999
-        else:
-            temperature = 0
-        if temperature < -10.0:
-            temperature = -10.0
-        elif temperature > 55.0:
-            temperature = 55.0
-        return temperature
-
-    def get_soil_temperature(self):
-        raw_value = self._read_uuid(self.SOIL_TEMPERATURE_UUID)
+    def _convert_temperature(self, raw_value):
         if raw_value != 0:
             temperature = 0.00000003044 * pow(raw_value, 3) - 0.00008038 * pow(
                 raw_value, 2) + raw_value * 0.1149 - 30.449999999999999
@@ -80,8 +71,7 @@ class ParrotFlowerPowerModule(BleModule):
             temperature = 55.0
         return temperature
 
-    def get_soil_moisture(self):
-        raw_value = self._read_uuid(self.SOIL_MOISTURE_UUID)
+    def _convert_soil_moisture(self, raw_value):
         soil_moisture = 11.4293 + (0.0000000010698 * pow(raw_value, 4) - 0.00000152538 * pow(
             raw_value, 3) + 0.000866976 * pow(raw_value, 2) - 0.169422 * raw_value)
         soil_moisture = 100.0 * (0.0000045 * pow(soil_moisture, 3) -
@@ -92,6 +82,63 @@ class ParrotFlowerPowerModule(BleModule):
             soil_moisture = 60.0
         return soil_moisture
 
+    def convert_luminosities(self, raw_values):
+        """
+        Convert sequence of raw light values to luminosity. Returns numpy
+        array if numpy is available, list otherwise.
+        """
+        if not HAVE_NUMPY:
+            return [self._convert_luminosity(value) for value in raw_values]
+        raw = numpy.asarray(raw_values, dtype=numpy.float64)
+        positive = raw > 0
+        luminosity = numpy.zeros_like(raw)
+        luminosity[positive] = 0.08640000000000001 * \
+            (192773.17000000001 * numpy.power(raw[positive], -1.0606619))
+        return luminosity
+
+    def convert_temperatures(self, raw_values):
+        """
+        Convert sequence of raw air or soil temperature values to degrees
+        celsius. Returns numpy array if numpy is available, list otherwise.
+        """
+        if not HAVE_NUMPY:
+            return [self._convert_temperature(value) for value in raw_values]
+        raw = numpy.asarray(raw_values, dtype=numpy.float64)
+        temperature = numpy.polyval(
+            [0.00000003044, -0.00008038, 0.1149, -30.449999999999999], raw)
+        temperature[raw == 0] = 0
+        return numpy.clip(temperature, -10.0, 55.0)
+
+    def convert_soil_moistures(self, raw_values):
+        """
+        Convert sequence of raw soil moisture values to percents. Returns
+        numpy array if numpy is available, list otherwise.
+        """
+        if not HAVE_NUMPY:
+            return [self._convert_soil_moisture(value) for value in raw_values]
+        raw = numpy.asarray(raw_values, dtype=numpy.float64)
+        soil_moisture = numpy.polyval(
+            [0.0000000010698, -0.00000152538, 0.000866976, -0.169422,
+             11.4293], raw)
+        soil_moisture = 100.0 * numpy.polyval(
+            [0.0000045, -0.00055, 0.0292, -0.053], soil_moisture)
+        return numpy.clip(soil_moisture, 0.0, 60.0)
+
+    def get_luminosity(self):
+        return self._convert_luminosity(self._read_uuid(self.LIGHT_UUID))
+
+    def get_air_temperature(self):
+        return self._convert_temperature(
+            self._read_uuid(self.AIR_TEMPERATURE_UUID))
+
+    def get_soil_temperature(self):
+        return self._convert_temperature(
+            self._read_uuid(self.SOIL_TEMPERATURE_UUID))
+
+    def get_soil_moisture(self):
+        return self._convert_soil_moisture(
+            self._read_uuid(self.SOIL_MOISTURE_UUID))
+
     def get_soil_conductivity(self):
         raw_value = self._read_uuid(self.SOIL_EC_UUID)
         # TODO: convert raw (0 - 1771) to 0 to 10 (mS/cm)
@@ -112,7 +159,7 @@ class ParrotFlowerPowerModule(BleModule):
         self._disconnect()
         return values
 
-    def get_meta_data():
+    def meta_data(self):
         """
         Get the readings meta-data.
         """
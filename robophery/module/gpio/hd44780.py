@@ -117,6 +117,13 @@ class Hd44780Module(GpioModule):
     PIN_READ_WRITE = 0x2
     PIN_REGISTER_SELECT = 0x1
 
+    # Commands and data need > 37us to settle
+    SETTLE_TIME = 37
+
+    # Unchanged characters between two changed runs that are rather
+    # rewritten than skipped by setting the cursor.
+    FRAME_MERGE_GAP = 1
+
     def __init__(self, *args, **kwargs):
         self._bus_mode = self.LCD_4BITMODE
         self._dot_size = 8
@@ -134,6 +141,7 @@ class Hd44780Module(GpioModule):
         self._d5_pin = self._normalize_pin(kwargs.get('d5_pin'))
         self._d6_pin = self._normalize_pin(kwargs.get('d6_pin'))
         self._d7_pin = self._normalize_pin(kwargs.get('d7_pin'))
+        self._nibble_steps_cache = {}
         super(Hd44780Module, self).__init__(*args, **kwargs)
 
         # Setup initial display configuration
@@ -211,12 +219,16 @@ class Hd44780Module(GpioModule):
         if value[0] not in range(self._rows) or value[1] not in range(self._cols):
             msg = 'Cursor position {pos!r} invalid on a {lcd._rows}x{lcd._cols} LCD.'
             raise ValueError(msg.format(pos=value, lcd=self))
-        row_offsets = [0x00, 0x40, self._cols, 0x40 + self._cols]
         self._cursor_pos = value
-        self.command(self.LCD_SETDDRAMADDR | row_offsets[value[0]] + value[1])
+        self.command(self._ddram_address(value[0], value[1]))
         self._usleep(50)
 
 
+    def _ddram_address(self, row, col):
+        row_offsets = [0x00, 0x40, self._cols, 0x40 + self._cols]
+        return self.LCD_SETDDRAMADDR | row_offsets[row] + col
+
+
     cursor_pos = property(_get_cursor_pos, _set_cursor_pos,
         doc='The cursor position as a 2-tuple (row, col).')
 
@@ -361,6 +373,62 @@ class Hd44780Module(GpioModule):
         self._msleep(2)
 
 
+    def write_frame(self, lines):
+        """
+        Write the whole screen. Lines are strings or lists of character
+        codes, missing lines and characters are blank. The frame is compared
+        with the content cache and only runs of changed characters are sent,
+        each run together with its cursor position in single sequence.
+        Characters are written from left to right.
+        """
+        frame = self._get_frame(lines)
+        if self._text_align_mode != self.LCD_ENTRYLEFT:
+            self.text_align_mode = self.LCD_ENTRYLEFT
+        position = None
+        for row in range(self._rows):
+            for start, end in self._get_dirty_runs(self._content[row],
+                                                   frame[row]):
+                self._send_run(self._ddram_address(row, start),
+                               frame[row][start:end])
+                self._content[row][start:end] = frame[row][start:end]
+                position = (row, end)
+        if position is None:
+            return
+        row, col = position
+        self._recent_auto_linebreak = False
+        if col < self._cols:
+            self._cursor_pos = (row, col)
+        else:
+            # Address after the last column continues on other row.
+            self.cursor_pos = ((row + 1) % self._rows, 0)
+
+
+    def _get_frame(self, lines):
+        if not isinstance(lines, (list, tuple)):
+            lines = lines.split('\n')
+        frame = []
+        for row in range(self._rows):
+            line = lines[row] if row < len(lines) else []
+            codes = [ord(char) if not isinstance(char, int) else char
+                     for char in line[:self._cols]]
+            frame.append(codes + [0x20] * (self._cols - len(codes)))
+        return frame
+
+
+    def _get_dirty_runs(self, old, new):
+        """
+        Return list of [start, end) column ranges where the rows differ.
+        """
+        runs = []
+        for col in range(self._cols):
+            if old[col] != new[col]:
+                if runs and col - runs[-1][1] <= self.FRAME_MERGE_GAP:
+                    runs[-1][1] = col + 1
+                else:
+                    runs.append([col, col + 1])
+        return runs
+
+
     def home(self):
         """
         Set cursor to initial position and reset any shifting.
@@ -490,6 +558,11 @@ class Hd44780Module(GpioModule):
         """Send the specified value to the display with automatic 4bit / 8bit
         selection. The rs_mode is either ``RS_DATA`` or ``RS_INSTRUCTION``."""
 
+        if self._can_batch():
+            self.output_pins_sequence(self._get_byte_steps(value, mode))
+            self._usleep(100)
+            return
+
         # Choose instruction or data mode
         self.output(self._rs_pin, mode)
 
@@ -505,6 +578,55 @@ class Hd44780Module(GpioModule):
             self._write4bits(value)
 
 
+    def _can_batch(self):
+        """
+        Check if output steps can be sent as single sequence, the interface
+        has to be slow enough for the display to settle between the bytes.
+        """
+        return (self._bus_mode == self.LCD_4BITMODE and
+                self._interface.OUTPUT_STEP_TIME * 2 >= self.SETTLE_TIME)
+
+
+    def _send_run(self, command, values):
+        """
+        Send the command followed by data values, as single output sequence
+        if the interface allows it.
+        """
+        if not self._can_batch():
+            self._send(command, self.RS_INSTRUCTION)
+            for value in values:
+                self._send(value, self.RS_DATA)
+            return
+        steps = list(self._get_byte_steps(command, self.RS_INSTRUCTION))
+        for value in values:
+            steps.extend(self._get_byte_steps(value, self.RS_DATA))
+        self.output_pins_sequence(steps)
+        self._usleep(100)
+
+
+    def _get_byte_steps(self, value, mode):
+        return (self._get_nibble_steps(value >> 4, mode) +
+                self._get_nibble_steps(value, mode))
+
+
+    def _get_nibble_steps(self, value, mode):
+        """
+        Get output steps writing 4 bits of data followed by the enable
+        pulse. Steps are computed once for every nibble and mode.
+        """
+        key = (value & 0x0F, mode)
+        steps = self._nibble_steps_cache.get(key)
+        if steps is None:
+            pins = {self._rs_pin: mode, self._en_pin: 0}
+            if self._rw_pin is not None:
+                pins[self._rw_pin] = 0
+            for i, pin in enumerate(self._data_pins()):
+                pins[pin] = (value >> i) & 0x01
+            steps = [pins, {self._en_pin: 1}, {self._en_pin: 0}]
+            self._nibble_steps_cache[key] = steps
+        return steps
+
+
     def _data_pins(self):
         if self._bus_mode == self.LCD_8BITMODE:
             return [
@@ -1,3 +1,4 @@
+from array import array
 from robophery.interface.gpio import GpioModule
 
 
@@ -7,29 +8,144 @@ class RevCounterModule(GpioModule):
     """
     DEVICE_NAME = 'rev_counter'
 
+    EDGE_BUFFER_SIZE = 256
+    FREQUENCY_WINDOW = 10
+
     def __init__(self, *args, **kwargs):
         super(RevCounterModule, self).__init__(*args, **kwargs)
         self._pin = self._normalize_pin(kwargs.get('data_pin'))
-        self._revolutions = 0
+        self._pulses_per_revolution = kwargs.get('pulses_per_revolution', 1)
+        self._frequency_window = kwargs.get('frequency_window',
+                                            self.FREQUENCY_WINDOW)
+        self._edge_buffer_size = kwargs.get('edge_buffer_size',
+                                            self.EDGE_BUFFER_SIZE)
+        self._pulses = 0
+        self._events_dropped = 0
+        # Ring of edge timestamps, the newest _window_count of them are in
+        # the frequency window.
+        self._edge_times = array('d', [0.0]) * self._edge_buffer_size
+        self._reset_edges()
+        self._reset_period_stats()
         self.setup_pin(self._pin, self.GPIO_MODE_IN)
         rise_edge = self._interface.GPIO_EVENT_RISING
-        self.add_event_detect(self._pin, rise_edge,
-                              callback=self._process_rise)
+        self.add_event_queue(self._pin, rise_edge)
+
+    def _reset_edges(self):
+        self._edge_index = 0
+        self._edge_count = 0
+        self._window_count = 0
+        self._last_period = None
+
+    def _reset_period_stats(self):
+        self._period_min = None
+        self._period_max = None
+        self._period_sum = 0.0
+        self._period_count = 0
+
+    def _edge_time(self, age):
+        """
+        Get timestamp of the edge age edges before the newest one.
+        """
+        return self._edge_times[(self._edge_index - 1 - age) %
+                                self._edge_buffer_size]
+
+    def _process_edge(self, timestamp):
+        if self._edge_count:
+            period = timestamp - self._edge_time(0)
+            self._last_period = period
+            if self._period_min is None or period < self._period_min:
+                self._period_min = period
+            if self._period_max is None or period > self._period_max:
+                self._period_max = period
+            self._period_sum += period
+            self._period_count += 1
+        self._edge_times[self._edge_index] = timestamp
+        self._edge_index = (self._edge_index + 1) % self._edge_buffer_size
+        if self._edge_count < self._edge_buffer_size:
+            self._edge_count += 1
+        self._window_count = min(self._window_count + 1, self._edge_count)
+        self._trim_window(timestamp)
+
+    def _trim_window(self, time_now):
+        """
+        Drop edges older than the frequency window, amortized constant time
+        per edge.
+        """
+        window_start = time_now - self._frequency_window
+        while (self._window_count and
+               self._edge_time(self._window_count - 1) < window_start):
+            self._window_count -= 1
+
+    def _get_frequency(self):
+        """
+        Get mean frequency of edges in the window, from the time between
+        the oldest and the newest one.
+        """
+        if self._window_count < 2:
+            return 0.0
+        span = self._edge_time(0) - self._edge_time(self._window_count - 1)
+        if span <= 0:
+            return 0.0
+        return (self._window_count - 1) / span
 
-    def _process_rise(self, pin):
-        self._revolutions += 1
+    def _get_instant_frequency(self, time_now):
+        """
+        Get frequency from the last period, decaying when the next edge is
+        overdue.
+        """
+        if self._last_period is None or self._window_count == 0:
+            return 0.0
+        period = max(self._last_period, time_now - self._edge_time(0))
+        if period <= 0:
+            return 0.0
+        return 1.0 / period
 
     def read_data(self):
         """
         Revolutions status readings.
         """
         read_start = self._get_time()
-        revolutions = self._revolutions
+        events = self.read_events(self._pin)
+        # Dropped events are still counted, only their timestamps are lost.
+        dropped = self.events_dropped(self._pin)
+        self._pulses += len(events) + dropped - self._events_dropped
+        if dropped > self._events_dropped:
+            # Edges are missing between the ring and the new events, the
+            # periods across the gap would be wrong.
+            self._reset_edges()
+        self._events_dropped = dropped
+        for pin, edge, timestamp in events:
+            self._process_edge(timestamp)
+        time_now = self._get_monotonic_time()
+        self._trim_window(time_now)
+        revolutions = self._pulses // self._pulses_per_revolution
+        frequency = self._get_frequency()
+        instant_frequency = self._get_instant_frequency(time_now)
+        rpm = frequency * 60.0 / self._pulses_per_revolution
+        instant_rpm = instant_frequency * 60.0 / self._pulses_per_revolution
+        period_count = self._period_count
+        if period_count:
+            period_min = self._period_min
+            period_max = self._period_max
+            period_avg = self._period_sum / period_count
+        self._reset_period_stats()
         read_stop = self._get_time()
-        read_time = read_stop - read_start
+        read_time = (read_stop - read_start) / (8 if period_count else 5)
         data = [
             (self._name, 'revolutions', revolutions, read_time),
+            (self._name, 'frequency', frequency, read_time),
+            (self._name, 'instant_frequency', instant_frequency, read_time),
+            (self._name, 'rpm', rpm, read_time),
+            (self._name, 'instant_rpm', instant_rpm, read_time),
         ]
+        # Period statistics are known only if there were edges since the
+        # last reading.
+        if period_count:
+            data += [
+                (self._name, 'period_min', period_min, read_time),
+                (self._name, 'period_max', period_max, read_time),
+                (self._name, 'period_avg', period_avg, read_time),
+            ]
         self._log_data(data)
         return data
 
@@ -45,4 +161,57 @@ class RevCounterModule(GpioModule):
                 'range_high': None,
                 'sensor': self.DEVICE_NAME
             },
+            'frequency': {
+                'type': 'gauge',
+                'unit': 'Hz',
+                'precision': 0.01,
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+            'instant_frequency': {
+                'type': 'gauge',
+                'unit': 'Hz',
+                'precision': 0.01,
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+            'rpm': {
+                'type': 'gauge',
+                'unit': 'rpm',
+                'precision': 0.1,
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+            'instant_rpm': {
+                'type': 'gauge',
+                'unit': 'rpm',
+                'precision': 0.1,
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+            'period_min': {
+                'type': 'gauge',
+                'unit': 's',
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+            'period_max': {
+                'type': 'gauge',
+                'unit': 's',
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+            'period_avg': {
+                'type': 'gauge',
+                'unit': 's',
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
         }
@@ -15,29 +15,31 @@ class SwitchModule(GpioModule):
         self._turn_off_count = 0
         self._runtime = 0
         both_edge = self._interface.GPIO_EVENT_BOTH
-        self.add_event_detect(self._pin, both_edge,
-                              callback=self._process_event)
+        self.add_event_queue(self._pin, both_edge)
         if self.is_high(self._pin):
-            self._runtime_start = self._get_time()
+            self._runtime_start = self._get_monotonic_time()
             self._state = 1
         else:
             self._runtime_start = None
             self._state = 0
 
-    def _process_event(self, pin):
-        if self.is_high(pin):
-            self._state = 1
-            self._turn_on_count += 1
-            self._runtime_start = self._get_time()
-        else:
-            self._update_runtime()
-            self._state = 0
-            self._turn_off_count += 1
-            self._runtime_start = None
+    def _process_events(self):
+        for pin, edge, timestamp in self.read_events(self._pin):
+            if edge == self._interface.GPIO_EVENT_RISING:
+                if self._state == 0:
+                    self._state = 1
+                    self._turn_on_count += 1
+                    self._runtime_start = timestamp
+            elif self._state == 1:
+                self._update_runtime(timestamp)
+                self._state = 0
+                self._turn_off_count += 1
+                self._runtime_start = None
 
-    def _update_runtime(self):
+    def _update_runtime(self, now=None):
         if self._runtime_start is not None:
-            now = self._get_time()
+            if now is None:
+                now = self._get_monotonic_time()
             self._runtime = self._runtime + (now - self._runtime_start)
             self._runtime_start = now
 
@@ -50,6 +52,7 @@ class SwitchModule(GpioModule):
         Switch status readings.
         """
         read_start = self._get_time()
+        self._process_events()
         self._update_runtime()
         read_stop = self._get_time()
         read_time = (read_stop - read_start) / 4
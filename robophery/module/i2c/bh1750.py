@@ -33,6 +33,9 @@ class Bh1750Module(I2cModule):
         super(Bh1750Module, self).__init__(*args, **kwargs)
         self.resolution_mode = kwargs.get('resolution_mode', 2)
         self.additional_delay = kwargs.get('additional_delay', 0)
+        # Continuous mode keeps measuring, reads only fetch the result.
+        self._continuous = kwargs.get('continuous', False)
+        self._continuous_running = False
         self.set_sensitivity()
 
     def _set_mode(self, mode):
@@ -96,9 +99,13 @@ class Bh1750Module(I2cModule):
         ratio = 1 / (1.2 * (self.mtreg / 69.0) * mode2coeff)
         return ratio * count
 
-    def wait_for_result(self):
+    def _result_delay(self):
+        """ Return time in seconds the measurement in current mode takes. """
         basetime = 0.018 if (self.mode & 0x03) == 0x03 else 0.128
-        self._sleep(basetime * (self.mtreg / 69.0) + self.additional_delay)
+        return basetime * (self.mtreg / 69.0) + self.additional_delay
+
+    def wait_for_result(self):
+        self._sleep(self._result_delay())
 
     def do_measurement(self, mode):
         """
@@ -112,30 +119,96 @@ class Bh1750Module(I2cModule):
         self.wait_for_result()
         return self.get_result()
 
-    def read_data(self):
+    def _measurement_mode(self):
+        """ Return one-shot mode command for current resolution mode. """
+        if self.resolution_mode == 0:
+            return self.ONE_TIME_LOW_RES_MODE
+        elif self.resolution_mode == 1:
+            return self.ONE_TIME_HIGH_RES_MODE_1
+        elif self.resolution_mode == 2:
+            return self.ONE_TIME_HIGH_RES_MODE_2
+        return None
+
+    def _continuous_mode(self):
+        """ Return continuous mode command for current resolution mode. """
+        if self.resolution_mode == 0:
+            return self.CONTINUOUS_LOW_RES_MODE
+        elif self.resolution_mode == 1:
+            return self.CONTINUOUS_HIGH_RES_MODE_1
+        elif self.resolution_mode == 2:
+            return self.CONTINUOUS_HIGH_RES_MODE_2
+        return None
+
+    def _start_continuous(self):
         """
-        Get the luminosity readings.
+        Start continuous measurement, return seconds until the first result
+        is ready.
+        """
+        mode = self._continuous_mode()
+        if mode is None:
+            return 0
+        try:
+            self.power_on()
+            self._set_mode(mode)
+        except IOError:
+            return 0
+        self._continuous_running = True
+        self._measurement_ok = True
+        return self._result_delay()
+
+    def start_measurement(self):
+        """
+        Start one-shot measurement, return seconds until the result is
+        ready. In continuous mode the sensor is configured only once and
+        the latest result is ready immediately.
         """
-        read_time_start = self._get_time()
+        self._read_time_start = self._get_time()
+        if self._continuous:
+            if self._continuous_running:
+                self._measurement_ok = True
+                return 0
+            self._measurement_ok = False
+            return self._start_continuous()
+        self._measurement_ok = False
+        mode = self._measurement_mode()
+        if mode is None:
+            return 0
         try:
-            if self.resolution_mode is 0:
-                luminosity = self.do_measurement(self.ONE_TIME_LOW_RES_MODE)
-            elif self.resolution_mode is 1:
-                luminosity = self.do_measurement(self.ONE_TIME_HIGH_RES_MODE_1)
-            elif self.resolution_mode is 2:
-                luminosity = self.do_measurement(self.ONE_TIME_HIGH_RES_MODE_2)
+            self.reset()
+            self._set_mode(mode)
+        except IOError:
+            return 0
+        self._measurement_ok = True
+        return self._result_delay()
+
+    def collect_measurement(self):
+        """
+        Get the luminosity readings of started measurement.
+        """
+        try:
+            if self._measurement_ok:
+                luminosity = self.get_result()
             else:
                 luminosity = None
         except IOError:
             luminosity = None
+            # Sensor may have been reset, configure it again.
+            self._continuous_running = False
         read_time_stop = self._get_time()
-        read_time_delta = read_time_stop - read_time_start
+        read_time_delta = read_time_stop - self._read_time_start
         data = [
             (self._name, 'luminosity', luminosity, read_time_delta),
         ]
         self._log_data(data)
         return data
 
+    def read_data(self):
+        """
+        Get the luminosity readings.
+        """
+        self._sleep(self.start_measurement())
+        return self.collect_measurement()
+
     def meta_data(self):
         """
         Get the readings meta-data.
@@ -19,6 +19,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 from __future__ import division
+import struct
+try:
+    import numpy
+except ImportError:
+    HAVE_NUMPY = False
+else:
+    HAVE_NUMPY = True
 from robophery.interface.i2c import I2cModule
 
 
@@ -47,6 +54,7 @@ class Bmp085Module(I2cModule):
     BMP085_CAL_MB = 0xBA  # R   Calibration data (16 bits)
     BMP085_CAL_MC = 0xBC  # R   Calibration data (16 bits)
     BMP085_CAL_MD = 0xBE  # R   Calibration data (16 bits)
+    BMP085_CHIP_ID = 0xD0
     BMP085_CONTROL = 0xF4
     BMP085_TEMPDATA = 0xF6
     BMP085_PRESSUREDATA = 0xF6
@@ -55,6 +63,12 @@ class Bmp085Module(I2cModule):
     BMP085_READTEMPCMD = 0x2E
     BMP085_READPRESSURECMD = 0x34
 
+    # All calibration coefficients from AC1 to MD, big endian.
+    CALIBRATION_FORMAT = struct.Struct('>hhhHHHhhhhh')
+    CALIBRATION_NAMES = ('cal_AC1', 'cal_AC2', 'cal_AC3', 'cal_AC4',
+                         'cal_AC5', 'cal_AC6', 'cal_B1', 'cal_B2', 'cal_MB',
+                         'cal_MC', 'cal_MD')
+
     def __init__(self, *args, **kwargs):
         self._addr = kwargs.get('addr', self.DEVICE_ADDR)
         super(Bmp085Module, self).__init__(*args, **kwargs)
@@ -65,17 +79,22 @@ class Bmp085Module(I2cModule):
         self._load_calibration()
 
     def _load_calibration(self):
-        self.cal_AC1 = self.readS16(self.BMP085_CAL_AC1, False)   # INT16
-        self.cal_AC2 = self.readS16(self.BMP085_CAL_AC2, False)   # INT16
-        self.cal_AC3 = self.readS16(self.BMP085_CAL_AC3, False)   # INT16
-        self.cal_AC4 = self.readU16(self.BMP085_CAL_AC4, False)   # UINT16
-        self.cal_AC5 = self.readU16(self.BMP085_CAL_AC5, False)   # UINT16
-        self.cal_AC6 = self.readU16(self.BMP085_CAL_AC6, False)   # UINT16
-        self.cal_B1 = self.readS16(self.BMP085_CAL_B1, False)     # INT16
-        self.cal_B2 = self.readS16(self.BMP085_CAL_B2, False)     # INT16
-        self.cal_MB = self.readS16(self.BMP085_CAL_MB, False)     # INT16
-        self.cal_MC = self.readS16(self.BMP085_CAL_MC, False)     # INT16
-        self.cal_MD = self.readS16(self.BMP085_CAL_MD, False)     # INT16
+        """
+        Load calibration coefficients from the calibration cache of the
+        manager, checked by single chip ID read, or read them from the
+        sensor EEPROM. Entry of replaced sensor of the same type on the
+        same address has to be removed from the cache.
+        """
+        if self._get_calibration_cache() is None:
+            values = self._read_calibration()
+        else:
+            chip_id = self.readU8(self.BMP085_CHIP_ID)
+            values = self._get_cached_calibration(chip_id)
+            if values is None or len(values) != len(self.CALIBRATION_NAMES):
+                values = self._read_calibration()
+                self._set_cached_calibration(chip_id, values)
+        for name, value in zip(self.CALIBRATION_NAMES, values):
+            setattr(self, name, value)
 #        self._log.debug('AC1 = {0:6d}'.format(self.cal_AC1))
 #        self._log.debug('AC2 = {0:6d}'.format(self.cal_AC2))
 #        self._log.debug('AC3 = {0:6d}'.format(self.cal_AC3))
@@ -88,6 +107,13 @@ class Bmp085Module(I2cModule):
 #        self._log.debug('MC = {0:6d}'.format(self.cal_MC))
 #        self._log.debug('MD = {0:6d}'.format(self.cal_MD))
 
+    def _read_calibration(self):
+        """
+        Read all calibration coefficients in single block read.
+        """
+        data = self.readList(self.BMP085_CAL_AC1, self.CALIBRATION_FORMAT.size)
+        return list(self.CALIBRATION_FORMAT.unpack(bytearray(data)))
+
     def _load_datasheet_calibration(self):
         """
         Set calibration from values in the datasheet example. Useful for
@@ -115,20 +141,31 @@ class Bmp085Module(I2cModule):
 #        self._log.debug('Raw temp 0x{0:X} ({1})'.format(raw & 0xFFFF, raw))
         return raw
 
-    def read_raw_pressure(self):
+    def _pressure_delay(self):
         """
-        Read the raw (uncompensated) pressure level from the sensor.
+        Get the pressure conversion time in milliseconds for current mode.
         """
-        self.write8(self.BMP085_CONTROL,
-                    self.BMP085_READPRESSURECMD + (self._mode << 6))
         if self._mode == self.BMP085_ULTRALOWPOWER:
-            self._msleep(5)
+            return 5
         elif self._mode == self.BMP085_HIGHRES:
-            self._msleep(14)
+            return 14
         elif self._mode == self.BMP085_ULTRAHIGHRES:
-            self._msleep(26)
+            return 26
         else:
-            self._msleep(8)
+            return 8
+
+    def _start_raw_pressure(self):
+        """
+        Start the pressure conversion, return milliseconds until it is done.
+        """
+        self.write8(self.BMP085_CONTROL,
+                    self.BMP085_READPRESSURECMD + (self._mode << 6))
+        return self._pressure_delay()
+
+    def _collect_raw_pressure(self):
+        """
+        Read the raw pressure level of finished conversion.
+        """
         msb = self.readU8(self.BMP085_PRESSUREDATA)
         lsb = self.readU8(self.BMP085_PRESSUREDATA + 1)
         xlsb = self.readU8(self.BMP085_PRESSUREDATA + 2)
@@ -136,13 +173,17 @@ class Bmp085Module(I2cModule):
         # self._log.debug('Raw pressure 0x{0:04X} ({1})'.format(raw & 0xFFFF, raw))
         return raw
 
-    def read_temperature(self):
+    def read_raw_pressure(self):
         """
-        Get the compensated temperature in degrees celsius.
+        Read the raw (uncompensated) pressure level from the sensor.
+        """
+        self._msleep(self._start_raw_pressure())
+        return self._collect_raw_pressure()
+
+    def _compensate_temperature(self, UT):
+        """
+        Get the compensated temperature in degrees celsius from raw value.
         """
-        UT = self.read_raw_temp()
-        # Datasheet value for debugging:
-        # UT = 27898
         # Calculations below are taken straight from section 3.5 of the
         # datasheet.
         X1 = ((UT - self.cal_AC6) * self.cal_AC5) >> 15
@@ -152,15 +193,10 @@ class Bmp085Module(I2cModule):
 #        self._log.debug('Calibrated temperature {0} C'.format(temp))
         return temp
 
-    def read_pressure(self):
+    def _compensate_pressure(self, UT, UP):
         """
-        Get the compensated pressure in Pascals.
+        Get the compensated pressure in Pascals from raw values.
         """
-        UT = self.read_raw_temp()
-        UP = self.read_raw_pressure()
-        # Datasheet values for debugging:
-        # UT = 27898
-        # UP = 23843
         # Calculations below are taken straight from section 3.5 of the datasheet.
         # Calculate true temperature coefficient B5.
         X1 = ((UT - self.cal_AC6) * self.cal_AC5) >> 15
@@ -193,6 +229,69 @@ class Bmp085Module(I2cModule):
 #        self._log.debug('Pressure {0} Pa'.format(p))
         return p
 
+    def compensate_temperatures(self, UT):
+        """
+        Get the compensated temperatures in degrees celsius from sequence of
+        raw values. Returns numpy array if numpy is available, list
+        otherwise.
+        """
+        if not HAVE_NUMPY:
+            return [self._compensate_temperature(ut) for ut in UT]
+        UT = numpy.asarray(UT, dtype=numpy.int64)
+        X1 = ((UT - self.cal_AC6) * self.cal_AC5) >> 15
+        X2 = (self.cal_MC << 11) // (X1 + self.cal_MD)
+        B5 = X1 + X2
+        return ((B5 + 8) >> 4) / 10.0
+
+    def compensate_pressures(self, UT, UP):
+        """
+        Get the compensated pressures in Pascals from sequences of raw
+        values, with the same integer arithmetic as _compensate_pressure.
+        Returns numpy array if numpy is available, list otherwise.
+        """
+        if not HAVE_NUMPY:
+            return [self._compensate_pressure(ut, up) for ut, up in zip(UT, UP)]
+        UT = numpy.asarray(UT, dtype=numpy.int64)
+        UP = numpy.asarray(UP, dtype=numpy.int64)
+        X1 = ((UT - self.cal_AC6) * self.cal_AC5) >> 15
+        X2 = (self.cal_MC << 11) // (X1 + self.cal_MD)
+        B5 = X1 + X2
+        B6 = B5 - 4000
+        X1 = (self.cal_B2 * (B6 * B6) >> 12) >> 11
+        X2 = (self.cal_AC2 * B6) >> 11
+        X3 = X1 + X2
+        B3 = (((self.cal_AC1 * 4 + X3) << self._mode) + 2) // 4
+        X1 = (self.cal_AC3 * B6) >> 13
+        X2 = (self.cal_B1 * ((B6 * B6) >> 12)) >> 16
+        X3 = ((X1 + X2) + 2) >> 2
+        B4 = (self.cal_AC4 * (X3 + 32768)) >> 15
+        B7 = (UP - B3) * (50000 >> self._mode)
+        p = numpy.where(B7 < 0x80000000, (B7 * 2) // B4, (B7 // B4) * 2)
+        X1 = (p >> 8) * (p >> 8)
+        X1 = (X1 * 3038) >> 16
+        X2 = (-7357 * p) >> 16
+        return p + ((X1 + X2 + 3791) >> 4)
+
+    def read_temperature(self):
+        """
+        Get the compensated temperature in degrees celsius.
+        """
+        UT = self.read_raw_temp()
+        # Datasheet value for debugging:
+        # UT = 27898
+        return self._compensate_temperature(UT)
+
+    def read_pressure(self):
+        """
+        Get the compensated pressure in Pascals.
+        """
+        UT = self.read_raw_temp()
+        UP = self.read_raw_pressure()
+        # Datasheet values for debugging:
+        # UT = 27898
+        # UP = 23843
+        return self._compensate_pressure(UT, UP)
+
     def read_altitude(self, sealevel_pa=101325.0):
         """
         Calculate the altitude in meters.
@@ -211,31 +310,58 @@ class Bmp085Module(I2cModule):
         p0 = pressure / pow(1.0 - altitude_m / 44330.0, 5.255)
         return int(p0)
 
-    def read_data(self):
+    def start_measurement(self):
         """
-        Get all sensor readings.
+        Read the temperature and start the pressure conversion, return
+        seconds until the pressure can be collected.
         """
         read_start = self._get_time()
         try:
-            temp = self.read_temperature()
+            self._raw_temp = self.read_raw_temp()
+            temp = self._compensate_temperature(self._raw_temp)
         except IOError:
+            self._raw_temp = None
             temp = None
         read_stop = self._get_time()
-        temp_read_time = read_stop - read_start
-        read_start = self._get_time()
+        self._temp_datum = (self._name, 'temperature', temp,
+                            read_stop - read_start)
+        self._press_read_start = self._get_time()
+        if self._raw_temp is None:
+            return 0
+        try:
+            return self._start_raw_pressure() / 1000.0
+        except IOError:
+            self._raw_temp = None
+            return 0
+
+    def collect_measurement(self):
+        """
+        Get all sensor readings of started measurement.
+        """
         try:
-            press = self.read_pressure()
+            if self._raw_temp is not None:
+                press = self._compensate_pressure(
+                    self._raw_temp, self._collect_raw_pressure())
+            else:
+                press = None
         except IOError:
             press = None
         read_stop = self._get_time()
-        press_read_time = read_stop - read_start
+        press_read_time = read_stop - self._press_read_start
         data = [
-            (self._name, 'temperature', temp, temp_read_time),
+            self._temp_datum,
             (self._name, 'pressure', press, press_read_time),
         ]
         self._log_data(data)
         return data
 
+    def read_data(self):
+        """
+        Get all sensor readings.
+        """
+        self._sleep(self.start_measurement())
+        return self.collect_measurement()
+
     def meta_data(self):
         """
         Get the readings meta-data.
@@ -1,4 +1,10 @@
 import math
+try:
+    import numpy
+except ImportError:
+    HAVE_NUMPY = False
+else:
+    HAVE_NUMPY = True
 from robophery.interface.i2c import I2cModule
 
 
@@ -30,6 +36,9 @@ class Htu21dModule(I2cModule):
         self._mode = kwargs.get('mode', self.HOLD_MASTER)
         if self._mode not in [self.HOLD_MASTER, self.NOHOLD_MASTER]:
             raise ValueError('Unexpected mode value {0}.'.format(self._mode))
+        # Derived metrics computed from the measured sample.
+        self._dew_point = kwargs.get('dew_point', False)
+        self._partial_pressure = kwargs.get('partial_pressure', False)
 
     def crc_check(self, msb, lsb, crc):
         remainder = ((msb << 8) | lsb) << 8
@@ -70,39 +79,70 @@ class Htu21dModule(I2cModule):
         """
         Gets the temperature in degrees celsius.
         """
-        raw = self.get_raw_temp()
-        temp = float(raw) / 65536 * 175.72
-        temp -= 46.85
-        return temp
+        return self._convert_temperature(self.get_raw_temp())
 
     def get_humidity(self):
         """
         Gets the relative humidity.
         """
-        raw = self.get_raw_humidity()
-        rh = float(raw) / 65536 * 125
-        rh -= 6
-        return rh
+        return self._convert_humidity(self.get_raw_humidity())
 
-    def get_dew_point(self):
+    def _convert_temperature(self, raw):
+        return float(raw) / 65536 * 175.72 - 46.85
+
+    def _convert_humidity(self, raw):
+        return float(raw) / 65536 * 125 - 6
+
+    def convert_temperatures(self, raw):
+        """
+        Convert sequence of raw temperature values to degrees celsius.
+        Returns numpy array if numpy is available, list otherwise.
+        """
+        if not HAVE_NUMPY:
+            return [self._convert_temperature(value & 0xFFFC) for value in raw]
+        raw = numpy.asarray(raw, dtype=numpy.int64) & 0xFFFC
+        return raw / 65536.0 * 175.72 - 46.85
+
+    def convert_humidities(self, raw):
         """
-        Calculates the dew point temperature.
+        Convert sequence of raw humidity values to relative humidity.
+        Returns numpy array if numpy is available, list otherwise.
         """
-        den = math.log10(self.get_humidity() *
-                         self.get_partial_pressure() / 100) - self.HTU21D_A
+        if not HAVE_NUMPY:
+            return [self._convert_humidity(value & 0xFFFC) for value in raw]
+        raw = numpy.asarray(raw, dtype=numpy.int64) & 0xFFFC
+        return raw / 65536.0 * 125 - 6
+
+    def get_dew_point(self, temperature=None, humidity=None):
+        """
+        Calculates the dew point temperature, from the given values or from
+        new measurement.
+        """
+        if temperature is None or humidity is None:
+            temperature, humidity = self.get_sample()
+        den = math.log10(humidity *
+                         self.get_partial_pressure(temperature) / 100) - self.HTU21D_A
         dew = -(self.HTU21D_B / den + self.HTU21D_C)
         return dew
 
-    def get_partial_pressure(self):
+    def get_partial_pressure(self, temperature=None):
         """
         Calculate the partial pressure in mmHg at ambient temperature.
         """
-        Tamb = self.get_temperature()
-        exp = self.HTU21D_B / (Tamb + self.HTU21D_C)
+        if temperature is None:
+            temperature = self.get_temperature()
+        exp = self.HTU21D_B / (temperature + self.HTU21D_C)
         exp = self.HTU21D_A - exp
         pp = 10 ** exp
         return pp
 
+    def get_sample(self):
+        """
+        Measure temperature and humidity once, derived values are computed
+        from this pair.
+        """
+        return self.get_temperature(), self.get_humidity()
+
     def read_data(self):
         """
         Get all sensor readings.
@@ -125,6 +165,17 @@ class Htu21dModule(I2cModule):
             (self._name, 'temperature', temp, temp_time_delta),
             (self._name, 'humidity', humid, humid_time_delta),
         ]
+        # Derived values need no bus traffic.
+        if self._partial_pressure:
+            partial_pressure = None
+            if temp is not None:
+                partial_pressure = self.get_partial_pressure(temp)
+            data.append((self._name, 'partial_pressure', partial_pressure, 0))
+        if self._dew_point:
+            dew_point = None
+            if temp is not None and humid is not None and humid > 0:
+                dew_point = self.get_dew_point(temp, humid)
+            data.append((self._name, 'dew_point', dew_point, 0))
         self._log_data(data)
         return data
 
@@ -132,7 +183,7 @@ class Htu21dModule(I2cModule):
         """
         Get the readings meta-data.
         """
-        return {
+        meta_data = {
             'temperature': {
                 'type': 'gauge',
                 'unit': 'C',
@@ -150,3 +201,22 @@ class Htu21dModule(I2cModule):
                 'sensor': self.DEVICE_NAME
             },
         }
+        if self._partial_pressure:
+            meta_data['partial_pressure'] = {
+                'type': 'gauge',
+                'unit': 'mmHg',
+                'precision': 0.5,
+                'range_low': 0,
+                'range_high': 1800,
+                'sensor': self.DEVICE_NAME
+            }
+        if self._dew_point:
+            meta_data['dew_point'] = {
+                'type': 'gauge',
+                'unit': 'C',
+                'precision': 0.5,
+                'range_low': -40,
+                'range_high': 125,
+                'sensor': self.DEVICE_NAME
+            }
+        return meta_data
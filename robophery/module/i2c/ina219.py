@@ -84,10 +84,14 @@ class Ina219Module(I2cModule):
     INA219_REG_CURRENT = 0x04  # CURRENT REGISTER (R)
     INA219_REG_CALIBRATION = 0x05  # CALIBRATION REGISTER (R/W)
 
+    # Number of reads between checks of the calibration register.
+    CALIBRATION_CHECK_INTERVAL = 10
+
     def __init__(self, *args, **kwargs):
         self._addr = kwargs.get('addr', self.DEVICE_ADDR)
         super(Ina219Module, self).__init__(*args, **kwargs)
         self._set_calibration_32v_2a()
+        self._calibration_reads = 0
 
     def _twos_to_int(self, val, len):
         # Convert twos compliment to integer
@@ -101,19 +105,27 @@ class Ina219Module(I2cModule):
         self._current_divider_ma = 10
         self._power_divider_mw = 2  # Power LSB = 1mW per bit (2/1)
 
-        # Set Calibration register to 'Cal' calculated above
-        bytes = [(self._cal_value >> 8) & 0xFF, self._cal_value & 0xFF]
-        self.writeList(self.INA219_REG_CALIBRATION, bytes)
-
         # Set Config register to take into account the settings above
-        config = self.INA219_CONFIG_BVOLTAGERANGE_32V | \
+        self._config_value = self.INA219_CONFIG_BVOLTAGERANGE_32V | \
             self.INA219_CONFIG_GAIN_8_320MV | \
             self.INA219_CONFIG_BADCRES_12BIT | \
             self.INA219_CONFIG_SADCRES_12BIT_1S_532US | \
             self.INA219_CONFIG_MODE_SANDBVOLT_CONTINUOUS
 
-        bytes = [(config >> 8) & 0xFF, config & 0xFF]
-        self.writeList(self.INA219_REG_CONFIG, bytes)
+        # Registers keep their values while the sensor is powered, write
+        # them only if they differ.
+        if self._read_register(self.INA219_REG_CALIBRATION) != self._cal_value:
+            self._write_register(self.INA219_REG_CALIBRATION, self._cal_value)
+        if self._read_register(self.INA219_REG_CONFIG) != self._config_value:
+            self._write_register(self.INA219_REG_CONFIG, self._config_value)
+
+    def _read_register(self, register):
+        result = self.readList(register, 2)
+        return (result[0] << 8) | result[1]
+
+    def _write_register(self, register, value):
+        bytes = [(value >> 8) & 0xFF, value & 0xFF]
+        self.writeList(register, bytes)
 
     def _get_raw_bus_voltage(self):
         result = self.readU16(self.INA219_REG_BUSVOLTAGE)
@@ -130,21 +142,26 @@ class Ina219Module(I2cModule):
         else:
             return (result[0] << 8) | (result[1])
 
+    def _decode_signed(self, result):
+        return self._twos_to_int((result[0] << 8) | result[1], 16)
+
     def _get_raw_current(self):
-        # Sometimes a sharp load will reset the INA219, which will
-        # reset the cal register, meaning CURRENT and POWER will
-        # not be available ... avoid this by always setting a cal
-        # value even if it's an unfortunate extra step
-        bytes = [(self._cal_value >> 8) & 0xFF, self._cal_value & 0xFF]
-        self.writeList(self.INA219_REG_CALIBRATION, bytes)
-        # Now we can safely read the CURRENT register!
+        if self._read_register(self.INA219_REG_CALIBRATION) != self._cal_value:
+            return self._recalibrate_current()
         result = self.readList(self.INA219_REG_CURRENT, 2)
-        if (result[0] >> 7 == 1):
-            testint = (result[0] * 256 + result[1])
-            othernew = self._twos_to_int(testint, 16)
-            return othernew
-        else:
-            return (result[0] << 8) | (result[1])
+        return self._decode_signed(result)
+
+    def _recalibrate_current(self):
+        """
+        Sometimes a sharp load will reset the INA219, which will reset
+        the cal register, meaning CURRENT and POWER will not be available.
+        Write the registers again and read the current once more.
+        """
+        self._log.info("Calibration register lost, calibrating again.")
+        self._write_register(self.INA219_REG_CALIBRATION, self._cal_value)
+        self._write_register(self.INA219_REG_CONFIG, self._config_value)
+        result = self.readList(self.INA219_REG_CURRENT, 2)
+        return self._decode_signed(result)
 
     def _get_raw_power(self):
         result = self.readList(self.INA219_REG_POWER, 2)
@@ -187,11 +204,32 @@ class Ina219Module(I2cModule):
 
     def read_data(self):
         """
-        Get all sensor readings.
+        Get all sensor readings. The sensor measures continuously, shunt
+        voltage and current registers are fetched in single transaction.
+        The calibration register is fetched with them every
+        CALIBRATION_CHECK_INTERVAL reads and after failed read.
         """
+        requests = [
+            (self.INA219_REG_SHUNTVOLTAGE, 2),
+            (self.INA219_REG_CURRENT, 2),
+        ]
+        reads = self._calibration_reads
+        check_calibration = reads >= self.CALIBRATION_CHECK_INTERVAL
+        if check_calibration:
+            requests.append((self.INA219_REG_CALIBRATION, 2))
+        # Calibration is checked by the next read if this one fails.
+        self._calibration_reads = self.CALIBRATION_CHECK_INTERVAL
+        results = self.readLists(requests)
+        shunt = self._decode_signed(results[0])
+        if check_calibration and (
+                (results[2][0] << 8) | results[2][1]) != self._cal_value:
+            current = self._recalibrate_current()
+        else:
+            current = self._decode_signed(results[1])
+        self._calibration_reads = 0 if check_calibration else reads + 1
         data = [
-            (self._name, 'voltage', self.get_shunt_voltage()),
-            (self._name, 'current', self.get_current()),
+            (self._name, 'voltage', shunt * 0.01),
+            (self._name, 'current', current / self._current_divider_ma),
             # (self._name, 'power', self.get_power()),
         ]
         self._log_data(data)
@@ -3,6 +3,14 @@
 # Made by: MrTijn/Tijndagamer
 # Released under the MIT License
 # Copyright (c) 2015, 2016, 2017 MrTijn/Tijndagamer
+import struct
+from array import array
+try:
+    import numpy
+except ImportError:
+    HAVE_NUMPY = False
+else:
+    HAVE_NUMPY = True
 from robophery.interface.i2c import I2cModule
 
 
@@ -38,6 +46,20 @@ class Mpu6050Module(I2cModule):
     GYRO_RANGE_1000DEG = 0x10
     GYRO_RANGE_2000DEG = 0x18
 
+    ACCEL_SCALE_MODIFIERS = {
+        ACCEL_RANGE_2G: ACCEL_SCALE_MODIFIER_2G,
+        ACCEL_RANGE_4G: ACCEL_SCALE_MODIFIER_4G,
+        ACCEL_RANGE_8G: ACCEL_SCALE_MODIFIER_8G,
+        ACCEL_RANGE_16G: ACCEL_SCALE_MODIFIER_16G,
+    }
+
+    GYRO_SCALE_MODIFIERS = {
+        GYRO_RANGE_250DEG: GYRO_SCALE_MODIFIER_250DEG,
+        GYRO_RANGE_500DEG: GYRO_SCALE_MODIFIER_500DEG,
+        GYRO_RANGE_1000DEG: GYRO_SCALE_MODIFIER_1000DEG,
+        GYRO_RANGE_2000DEG: GYRO_SCALE_MODIFIER_2000DEG,
+    }
+
     # MPU-6050 Registers
     PWR_MGMT_1 = 0x6B
     PWR_MGMT_2 = 0x6C
@@ -55,11 +77,55 @@ class Mpu6050Module(I2cModule):
     ACCEL_CONFIG = 0x1C
     GYRO_CONFIG = 0x1B
 
+    SMPLRT_DIV = 0x19
+    CONFIG = 0x1A
+    FIFO_EN = 0x23
+    INT_STATUS = 0x3A
+    USER_CTRL = 0x6A
+    FIFO_COUNTH = 0x72
+    FIFO_R_W = 0x74
+
+    FIFO_EN_ACCEL = 0x08
+    FIFO_EN_GYRO = 0x70
+    USER_CTRL_FIFO_EN = 0x40
+    USER_CTRL_FIFO_RESET = 0x04
+    INT_STATUS_FIFO_OFLOW = 0x10
+
+    # Digital low pass filter 188Hz, gyroscope output rate is 1kHz.
+    DLPF_CFG = 0x01
+    GYRO_OUTPUT_RATE = 1000
+
+    FIFO_SIZE = 1024
+    FIFO_SAMPLE_RATE = 1000
+    FIFO_BUFFER_SIZE = 4096
+    # Accelerometer and gyroscope words of one sample in the FIFO.
+    FIFO_FRAME_WORDS = 6
+    FIFO_FRAME_SIZE = 12
+
+    # Accelerometer, temperature and gyroscope words from ACCEL_XOUT_H to
+    # GYRO_ZOUT_L, big endian.
+    SENSOR_DATA_FORMAT = struct.Struct('>7h')
+
     def __init__(self, *args, **kwargs):
         self._addr = kwargs.get('addr', self.DEVICE_ADDR)
+        # Range registers are read on first use and cached afterwards.
+        self._accel_range = None
+        self._gyro_range = None
+        # FIFO is disabled until setup_fifo is called.
+        self._fifo = False
+        self._fifo_samples = None
+        self._fifo_times = None
+        self._fifo_index = 0
+        self._fifo_count = 0
+        self._fifo_sample_rate = kwargs.get(
+            'sample_rate', self.FIFO_SAMPLE_RATE)
+        self._fifo_buffer_size = kwargs.get(
+            'fifo_buffer_size', self.FIFO_BUFFER_SIZE)
         super(Mpu6050Module, self).__init__(*args, **kwargs)
         # Wake up the MPU-6050 since it starts in sleep mode
         self.write8(self.PWR_MGMT_1, 0x00)
+        if kwargs.get('fifo', False):
+            self.setup_fifo(self._fifo_sample_rate)
 
     def read_word(self, register):
         """
@@ -67,16 +133,64 @@ class Mpu6050Module(I2cModule):
         Returns the combined read results.
         register - the first register to read from.
         """
-        # Read the data from the registers
-        high = self.readU8(register)
-        low = self.readU8(register + 1)
+        return self.read_words(register, 1)[0]
 
-        value = (high << 8) + low
+    def read_words(self, register, count):
+        """
+        Read count of signed big endian words starting at register in
+        single block read.
+        """
+        data = self.readList(register, count * 2)
+        return struct.unpack('>{0}h'.format(count), bytearray(data))
 
-        if (value >= 0x8000):
-            return -((65535 - value) + 1)
-        else:
-            return value
+    def read_raw_data(self):
+        """
+        Read raw accelerometer, temperature and gyroscope values in single
+        block read. Returns tuple of 7 signed integers.
+        """
+        data = self.readList(self.ACCEL_XOUT0, self.SENSOR_DATA_FORMAT.size)
+        return self.SENSOR_DATA_FORMAT.unpack(bytearray(data))
+
+    def _get_accel_scale_modifier(self):
+        if self._accel_range is None:
+            self.read_accel_range(True)
+        modifier = self.ACCEL_SCALE_MODIFIERS.get(self._accel_range)
+        if modifier is None:
+            self._log.error("Unkown range for accel_scale_modifier.")
+            modifier = self.ACCEL_SCALE_MODIFIER_2G
+        return modifier
+
+    def _get_gyro_scale_modifier(self):
+        if self._gyro_range is None:
+            self.read_gyro_range(True)
+        modifier = self.GYRO_SCALE_MODIFIERS.get(self._gyro_range)
+        if modifier is None:
+            self._log.error("Unkown range for gyro_scale_modifier.")
+            modifier = self.GYRO_SCALE_MODIFIER_250DEG
+        return modifier
+
+    def _convert_temp(self, raw_temp):
+        # Get the actual temperature using the formule given in the
+        # MPU-6050 Register Map and Descriptions revision 4.2, page 30
+        return (raw_temp / 340.0) + 36.53
+
+    def _convert_accel(self, x, y, z, g=False):
+        accel_scale_modifier = self._get_accel_scale_modifier()
+        if g is False:
+            accel_scale_modifier = accel_scale_modifier / self.GRAVITIY_MS2
+        return {
+            'x': x / accel_scale_modifier,
+            'y': y / accel_scale_modifier,
+            'z': z / accel_scale_modifier,
+        }
+
+    def _convert_gyro(self, x, y, z):
+        gyro_scale_modifier = self._get_gyro_scale_modifier()
+        return {
+            'x': x / gyro_scale_modifier,
+            'y': y / gyro_scale_modifier,
+            'z': z / gyro_scale_modifier,
+        }
 
     # MPU-6050 Methods
 
@@ -85,13 +199,7 @@ class Mpu6050Module(I2cModule):
         Reads the temperature from the onboard temperature sensor
         of the MPU-6050. Returns the temperature in degrees Celcius.
         """
-        raw_temp = self.read_word(self.TEMP_OUT0)
-
-        # Get the actual temperature using the formule given in the
-        # MPU-6050 Register Map and Descriptions revision 4.2, page 30
-        actual_temp = (raw_temp / 340.0) + 36.53
-
-        return actual_temp
+        return self._convert_temp(self.read_word(self.TEMP_OUT0))
 
     def set_accel_range(self, accel_range):
         """
@@ -103,6 +211,7 @@ class Mpu6050Module(I2cModule):
         self.write8(self.ACCEL_CONFIG, 0x00)
         # Write the new range to the ACCEL_CONFIG register
         self.write8(self.ACCEL_CONFIG, accel_range)
+        self._accel_range = accel_range
 
     def read_accel_range(self, raw=False):
         """Reads the range the accelerometer is set to.
@@ -112,6 +221,7 @@ class Mpu6050Module(I2cModule):
         returns -1 something went wrong.
         """
         raw_data = self.readU8(self.ACCEL_CONFIG)
+        self._accel_range = raw_data
 
         if raw is True:
             return raw_data
@@ -133,36 +243,8 @@ class Mpu6050Module(I2cModule):
         If g is False, it will return the data in m/s^2
         Returns a dictionary with the measurement results.
         """
-        x = self.read_word(self.ACCEL_XOUT0)
-        y = self.read_word(self.ACCEL_YOUT0)
-        z = self.read_word(self.ACCEL_ZOUT0)
-
-        accel_scale_modifier = None
-        accel_range = self.read_accel_range(True)
-
-        if accel_range == self.ACCEL_RANGE_2G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_2G
-        elif accel_range == self.ACCEL_RANGE_4G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_4G
-        elif accel_range == self.ACCEL_RANGE_8G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_8G
-        elif accel_range == self.ACCEL_RANGE_16G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_16G
-        else:
-            self._log.error("Unkown range for accel_scale_modifier.")
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_2G
-
-        x = x / accel_scale_modifier
-        y = y / accel_scale_modifier
-        z = z / accel_scale_modifier
-
-        if g is True:
-            return {'x': x, 'y': y, 'z': z}
-        elif g is False:
-            x = x * self.GRAVITIY_MS2
-            y = y * self.GRAVITIY_MS2
-            z = z * self.GRAVITIY_MS2
-            return {'x': x, 'y': y, 'z': z}
+        x, y, z = self.read_words(self.ACCEL_XOUT0, 3)
+        return self._convert_accel(x, y, z, g)
 
     def set_gyro_range(self, gyro_range):
         """
@@ -175,6 +257,7 @@ class Mpu6050Module(I2cModule):
 
         # Write the new range to the ACCEL_CONFIG register
         self.write8(self.GYRO_CONFIG, gyro_range)
+        self._gyro_range = gyro_range
 
     def read_gyro_range(self, raw=False):
         """
@@ -185,6 +268,7 @@ class Mpu6050Module(I2cModule):
         returned value is equal to -1 something went wrong.
         """
         raw_data = self.readU8(self.GYRO_CONFIG)
+        self._gyro_range = raw_data
 
         if raw is True:
             return raw_data
@@ -205,55 +289,205 @@ class Mpu6050Module(I2cModule):
         Gets and returns the X, Y and Z values from the gyroscope.
         Returns the read values in a dictionary.
         """
-        x = self.read_word(self.GYRO_XOUT0)
-        y = self.read_word(self.GYRO_YOUT0)
-        z = self.read_word(self.GYRO_ZOUT0)
-
-        gyro_scale_modifier = None
-        gyro_range = self.read_gyro_range(True)
-
-        if gyro_range == self.GYRO_RANGE_250DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_250DEG
-        elif gyro_range == self.GYRO_RANGE_500DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_500DEG
-        elif gyro_range == self.GYRO_RANGE_1000DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_1000DEG
-        elif gyro_range == self.GYRO_RANGE_2000DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_2000DEG
-        else:
-            self._log.error("Unkown range for gyro_scale_modifier.")
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_250DEG
+        x, y, z = self.read_words(self.GYRO_XOUT0, 3)
+        return self._convert_gyro(x, y, z)
 
-        x = x / gyro_scale_modifier
-        y = y / gyro_scale_modifier
-        z = z / gyro_scale_modifier
+    def setup_fifo(self, sample_rate=FIFO_SAMPLE_RATE):
+        """
+        Stream accelerometer and gyroscope samples at sample_rate Hz to the
+        on-chip FIFO. Samples are collected by drain_fifo.
+        """
+        divider = int(round(float(self.GYRO_OUTPUT_RATE) / sample_rate)) - 1
+        divider = min(max(divider, 0), 0xFF)
+        self._fifo_sample_rate = float(self.GYRO_OUTPUT_RATE) / (divider + 1)
+        fifo_samples = self.FIFO_SIZE // self.FIFO_FRAME_SIZE
+        drain_samples = self._read_interval * self._fifo_sample_rate / 1000.0
+        if drain_samples >= fifo_samples:
+            self._log.error("FIFO holds {0} samples, but {1} samples are measured between reads, lower read_interval.".format(
+                fifo_samples, int(drain_samples)))
+        # Preallocated ring of raw samples and their timestamps.
+        self._fifo_samples = array(
+            'h', [0]) * (self._fifo_buffer_size * self.FIFO_FRAME_WORDS)
+        self._fifo_times = array('d', [0.0]) * self._fifo_buffer_size
+        self._fifo_index = 0
+        self._fifo_count = 0
+        self.write8(self.CONFIG, self.DLPF_CFG)
+        self.write8(self.SMPLRT_DIV, divider)
+        self.write8(self.FIFO_EN, self.FIFO_EN_ACCEL | self.FIFO_EN_GYRO)
+        self.reset_fifo()
+        self._fifo = True
+
+    def _check_fifo(self):
+        if not self._fifo:
+            raise RuntimeError("FIFO is disabled, call setup_fifo() first.")
+
+    def reset_fifo(self):
+        """
+        Discard the content of the FIFO and start filling it again.
+        """
+        self.write8(self.USER_CTRL, self.USER_CTRL_FIFO_RESET)
+        self.write8(self.USER_CTRL, self.USER_CTRL_FIFO_EN)
+        # Reading the status register clears the overflow flag.
+        self.readU8(self.INT_STATUS)
 
-        return {'x': x, 'y': y, 'z': z}
+    def drain_fifo(self):
+        """
+        Read all complete samples from the FIFO in block reads and store
+        them to the sample buffer. Returns flat tuple of the new raw words.
+        """
+        self._check_fifo()
+        if self.readU8(self.INT_STATUS) & self.INT_STATUS_FIFO_OFLOW:
+            self._log.error("FIFO overflow, samples were lost.")
+            self.reset_fifo()
+            return ()
+        drain_time = self._get_time()
+        count = self.readU16(self.FIFO_COUNTH, little_endian=False)
+        frames = count // self.FIFO_FRAME_SIZE
+        if frames == 0:
+            return ()
+        chunk_frames = max(self._interface.MAX_BLOCK_LENGTH //
+                           self.FIFO_FRAME_SIZE, 1)
+        requests = []
+        remaining = frames
+        while remaining > 0:
+            chunk = min(remaining, chunk_frames)
+            requests.append((self.FIFO_R_W, chunk * self.FIFO_FRAME_SIZE))
+            remaining -= chunk
+        data = bytearray()
+        for chunk_data in self.readLists(requests):
+            data.extend(bytearray(chunk_data))
+        raw = struct.unpack('>{0}h'.format(frames * self.FIFO_FRAME_WORDS),
+                            bytes(data))
+        self._store_fifo_samples(raw, frames, drain_time)
+        return raw
+
+    def _store_fifo_samples(self, raw, frames, drain_time):
+        """
+        Copy raw samples to the ring buffer. The last sample was measured
+        about the drain time, earlier ones are one sample period apart.
+        """
+        period = 1.0 / self._fifo_sample_rate
+        size = self._fifo_buffer_size
+        words = self.FIFO_FRAME_WORDS
+        first = max(frames - size, 0)
+        kept = frames - first
+        samples = array('h', raw[first * words:])
+        times = array('d', [drain_time - (frames - 1 - frame) * period
+                            for frame in range(first, frames)])
+        index = self._fifo_index
+        head = min(kept, size - index)
+        self._fifo_samples[index * words:(index + head) * words] = \
+            samples[:head * words]
+        self._fifo_times[index:index + head] = times[:head]
+        if kept > head:
+            self._fifo_samples[:(kept - head) * words] = samples[head * words:]
+            self._fifo_times[:kept - head] = times[head:]
+        self._fifo_index = (index + kept) % size
+        self._fifo_count = min(self._fifo_count + frames, size)
+
+    def convert_samples(self, raw, words=FIFO_FRAME_WORDS):
+        """
+        Convert flat sequence of raw accelerometer and gyroscope words, as
+        stored by the FIFO, to m/s^2 and deg/s. Returns pair of accel and
+        gyro values, numpy arrays of shape (n, 3) if numpy is available,
+        lists of (x, y, z) tuples otherwise.
+        """
+        accel_modifier = self._get_accel_scale_modifier() / self.GRAVITIY_MS2
+        gyro_modifier = self._get_gyro_scale_modifier()
+        if HAVE_NUMPY:
+            raw = numpy.asarray(raw, dtype=numpy.float64).reshape(-1, words)
+            return (raw[:, 0:3] / accel_modifier,
+                    raw[:, 3:6] / gyro_modifier)
+        accel = []
+        gyro = []
+        for start in range(0, len(raw), words):
+            ax, ay, az, gx, gy, gz = raw[start:start + words]
+            accel.append((ax / accel_modifier, ay / accel_modifier,
+                          az / accel_modifier))
+            gyro.append((gx / gyro_modifier, gy / gyro_modifier,
+                         gz / gyro_modifier))
+        return accel, gyro
+
+    def get_fifo_samples(self, clear=True):
+        """
+        Get buffered FIFO samples, oldest first, as list of (timestamp,
+        accel, gyro) tuples with the values converted like get_accel_data
+        and get_gyro_data.
+        """
+        self._check_fifo()
+        size = self._fifo_buffer_size
+        words = self.FIFO_FRAME_WORDS
+        start = (self._fifo_index - self._fifo_count) % size
+        stop = start + self._fifo_count
+        raw = self._fifo_samples[start * words:min(stop, size) * words]
+        times = self._fifo_times[start:min(stop, size)]
+        if stop > size:
+            raw += self._fifo_samples[:(stop - size) * words]
+            times += self._fifo_times[:stop - size]
+        accel, gyro = self.convert_samples(raw)
+        samples = []
+        for i in range(self._fifo_count):
+            samples.append((
+                times[i],
+                {'x': accel[i][0], 'y': accel[i][1], 'z': accel[i][2]},
+                {'x': gyro[i][0], 'y': gyro[i][1], 'z': gyro[i][2]},
+            ))
+        if clear:
+            self._fifo_count = 0
+        return samples
+
+    def read_fifo_data(self):
+        """
+        Get mean of the samples collected in the FIFO since the last read.
+        """
+        read_time_start = self._get_time()
+        raw = self.drain_fifo()
+        temp = self.get_temp()
+        read_time_stop = self._get_time()
+        frames = len(raw) // self.FIFO_FRAME_WORDS
+        read_time_delta = (read_time_stop - read_time_start) / 7
+        if frames == 0:
+            accel = {'x': None, 'y': None, 'z': None}
+            gyro = {'x': None, 'y': None, 'z': None}
+        else:
+            means = [float(sum(raw[word::self.FIFO_FRAME_WORDS])) / frames
+                     for word in range(self.FIFO_FRAME_WORDS)]
+            accel = self._convert_accel(*means[0:3])
+            gyro = self._convert_gyro(*means[3:6])
+        data = [
+            (self._name, 'temperature', temp, read_time_delta),
+            (self._name, 'rotation_x', gyro['x'], read_time_delta),
+            (self._name, 'rotation_y', gyro['y'], read_time_delta),
+            (self._name, 'rotation_z', gyro['z'], read_time_delta),
+            (self._name, 'acceleration_x', accel['x'], read_time_delta),
+            (self._name, 'acceleration_y', accel['y'], read_time_delta),
+            (self._name, 'acceleration_z', accel['z'], read_time_delta),
+        ]
+        self._log_data(data)
+        return data
 
     def read_data(self):
         """
         Get all sensor readings.
         """
-        temp_time_start = self._get_time()
-        temp = self.get_temp()
-        temp_time_stop = self._get_time()
-        temp_time_delta = temp_time_stop - temp_time_start
-        accel_time_start = self._get_time()
-        accel = self.get_accel_data()
-        accel_time_stop = self._get_time()
-        accel_time_delta = (accel_time_stop - accel_time_start) / 3
-        gyro_time_start = self._get_time()
-        gyro = self.get_gyro_data()
-        gyro_time_stop = self._get_time()
-        gyro_time_delta = (gyro_time_stop - gyro_time_start) / 3
+        if self._fifo:
+            return self.read_fifo_data()
+        read_time_start = self._get_time()
+        raw_data = self.read_raw_data()
+        read_time_stop = self._get_time()
+        # All values are read in single transfer.
+        read_time_delta = (read_time_stop - read_time_start) / len(raw_data)
+        accel = self._convert_accel(*raw_data[0:3])
+        temp = self._convert_temp(raw_data[3])
+        gyro = self._convert_gyro(*raw_data[4:7])
         data = [
-            (self._name, 'temperature', temp, temp_time_delta),
-            (self._name, 'rotation_x', gyro['x'], gyro_time_delta),
-            (self._name, 'rotation_y', gyro['y'], gyro_time_delta),
-            (self._name, 'rotation_z', gyro['z'], gyro_time_delta),
-            (self._name, 'acceleration_x', accel['x'], accel_time_delta),
-            (self._name, 'acceleration_y', accel['y'], accel_time_delta),
-            (self._name, 'acceleration_z', accel['z'], accel_time_delta),
+            (self._name, 'temperature', temp, read_time_delta),
+            (self._name, 'rotation_x', gyro['x'], read_time_delta),
+            (self._name, 'rotation_y', gyro['y'], read_time_delta),
+            (self._name, 'rotation_z', gyro['z'], read_time_delta),
+            (self._name, 'acceleration_x', accel['x'], read_time_delta),
+            (self._name, 'acceleration_y', accel['y'], read_time_delta),
+            (self._name, 'acceleration_z', accel['z'], read_time_delta),
         ]
         self._log_data(data)
         return data
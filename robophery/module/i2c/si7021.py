@@ -11,45 +11,135 @@ class Si7021Module(I2cModule):
     # Operating modes
     READ_TEMP_CMD = 0xf3
     READ_HUMIDITY_CMD = 0xf5
+    # Temperature measured during the last humidity measurement
+    READ_TEMP_FROM_RH_CMD = 0xe0
+    WRITE_USER_REG_CMD = 0xe6
+    READ_USER_REG_CMD = 0xe7
+    # Resolution bits D7 and D0 of the user register
+    RESOLUTION_MASK = 0x81
+    RESOLUTION_RH12_T14 = 0x00
+    RESOLUTION_RH8_T12 = 0x01
+    RESOLUTION_RH10_T13 = 0x80
+    RESOLUTION_RH11_T11 = 0x81
+    # Maximum humidity and temperature conversion times in ms
+    CONVERSION_TIMES = {
+        RESOLUTION_RH12_T14: (12, 10.8),
+        RESOLUTION_RH8_T12: (3.1, 3.8),
+        RESOLUTION_RH10_T13: (4.5, 6.2),
+        RESOLUTION_RH11_T11: (7, 2.4),
+    }
+    # Sensor does not acknowledge reads until the conversion is done
+    POLL_INTERVAL = 1
+    POLL_RETRIES = 10
 
     def __init__(self, *args, **kwargs):
         self._addr = kwargs.get('addr', self.DEVICE_ADDR)
         super(Si7021Module, self).__init__(*args, **kwargs)
+        resolution = kwargs.get('resolution', None)
+        if resolution is None:
+            self._resolution = self.get_resolution()
+        else:
+            if resolution not in self.CONVERSION_TIMES:
+                raise ValueError(
+                    'Unexpected resolution value {0}.'.format(resolution))
+            self.set_resolution(resolution)
+
+    def get_resolution(self):
+        """
+        Read the measurement resolution from the user register.
+        """
+        user_reg = self.readU8(self.READ_USER_REG_CMD)
+        return user_reg & self.RESOLUTION_MASK
+
+    def set_resolution(self, resolution):
+        """
+        Set the measurement resolution in the user register.
+        """
+        user_reg = self.readU8(self.READ_USER_REG_CMD)
+        user_reg = (user_reg & ~self.RESOLUTION_MASK) | resolution
+        self.write8(self.WRITE_USER_REG_CMD, user_reg)
+        self._resolution = resolution
+
+    def _humidity_delay(self):
+        """
+        Get ms until humidity is ready, the measurement includes
+        temperature conversion.
+        """
+        rh_time, temp_time = self.CONVERSION_TIMES[self._resolution]
+        return rh_time + temp_time
+
+    def _temperature_delay(self):
+        return self.CONVERSION_TIMES[self._resolution][1]
+
+    def _read_result(self):
+        """
+        Read the 2-byte result of no-hold measurement, retry while the
+        conversion is still running.
+        """
+        for retry in range(self.POLL_RETRIES):
+            try:
+                data0, data1 = self.readRawList(2)[0:2]
+                return (data0 << 8) | data1
+            except IOError:
+                self._msleep(self.POLL_INTERVAL)
+        data0, data1 = self.readRawList(2)[0:2]
+        return (data0 << 8) | data1
+
+    def _convert_temperature(self, raw):
+        return (raw * 175.72 / 65536.0) - 46.85
+
+    def _convert_humidity(self, raw):
+        return (raw * 125 / 65536.0) - 6
 
     def read_temperature(self):
-        # Read data back, 2 bytes, Temperature MSB first
         self.writeRaw8(self.READ_TEMP_CMD)
-        self._msleep(300)
-        data0 = self.readRaw8()
-        data1 = self.readRaw8()
-        return ((data0 * 256 + data1) * 175.72 / 65536.0) - 46.85
+        self._msleep(self._temperature_delay())
+        return self._convert_temperature(self._read_result())
 
     def read_humidity(self):
         self.writeRaw8(self.READ_HUMIDITY_CMD)
-        self._msleep(300)
-        # Read data back, 2 bytes, Humidity MSB first
-        data0 = self.readRaw8()
-        data1 = self.readRaw8()
-        return ((data0 * 256 + data1) * 125 / 65536.0) - 6
+        self._msleep(self._humidity_delay())
+        return self._convert_humidity(self._read_result())
 
-    def read_data(self):
+    def read_last_temperature(self):
         """
-        Get all sensor readings.
+        Get temperature measured during the last humidity measurement,
+        without new conversion.
         """
-        temp_time_start = self._get_time()
-        try:
-            temp = self.read_temperature()
-        except IOError:
-            temp = None
-        temp_time_stop = self._get_time()
-        temp_time_delta = temp_time_stop - temp_time_start
-        humid_time_start = self._get_time()
+        data0, data1 = self.readList(self.READ_TEMP_FROM_RH_CMD, 2)
+        return self._convert_temperature((data0 << 8) | data1)
+
+    def start_measurement(self):
+        """
+        Start humidity measurement, return seconds until the result is
+        ready.
+        """
+        self._read_time_start = self._get_time()
         try:
-            humid = self.read_humidity()
+            self.writeRaw8(self.READ_HUMIDITY_CMD)
         except IOError:
-            humid = None
-        humid_time_stop = self._get_time()
-        humid_time_delta = humid_time_stop - humid_time_start
+            self._measurement_ok = False
+            return 0
+        self._measurement_ok = True
+        return self._humidity_delay() / 1000.0
+
+    def collect_measurement(self):
+        """
+        Get the humidity and temperature readings of started measurement.
+        """
+        humid = None
+        temp = None
+        humid_time_stop = temp_time_stop = self._read_time_start
+        if self._measurement_ok:
+            try:
+                humid = self._convert_humidity(self._read_result())
+                humid_time_stop = temp_time_stop = self._get_time()
+                temp = self.read_last_temperature()
+                temp_time_stop = self._get_time()
+            except IOError:
+                pass
+        humid_time_delta = humid_time_stop - self._read_time_start
+        temp_time_delta = temp_time_stop - humid_time_stop
         data = [
             (self._name, 'temperature', temp, temp_time_delta),
             (self._name, 'humidity', humid, humid_time_delta),
@@ -57,6 +147,13 @@ class Si7021Module(I2cModule):
         self._log_data(data)
         return data
 
+    def read_data(self):
+        """
+        Get all sensor readings.
+        """
+        self._sleep(self.start_measurement())
+        return self.collect_measurement()
+
     def meta_data(self):
         """
         Get the readings meta-data.
@@ -15,10 +15,15 @@ class Vl53L0XModule(I2cModule):
     VL53L0X_REG_PRE_RANGE_CONFIG_VCSEL_PERIOD = 0x0050
     VL53L0X_REG_FINAL_RANGE_CONFIG_VCSEL_PERIOD = 0x0070
     VL53L0X_REG_SYSRANGE_START = 0x000
+    VL53L0X_REG_SYSTEM_INTERRUPT_CLEAR = 0x000b
 
     VL53L0X_REG_RESULT_INTERRUPT_STATUS = 0x0013
     VL53L0X_REG_RESULT_RANGE_STATUS = 0x0014
 
+    SYSRANGE_START_SINGLESHOT = 0x01
+    SYSRANGE_START_BACK_TO_BACK = 0x02
+    INTERRUPT_STATUS_MASK = 0x07
+
     def __init__(self, *args, **kwargs):
         self._addr = kwargs.get('addr', self.DEVICE_ADDR)
         super(Vl53L0XModule, self).__init__(*args, **kwargs)
@@ -28,6 +33,11 @@ class Vl53L0XModule(I2cModule):
         self._device_id = hex(val1)
         val1 = self.readU8(self.VL53L0X_REG_PRE_RANGE_CONFIG_VCSEL_PERIOD)
         val1 = self.readU8(self.VL53L0X_REG_FINAL_RANGE_CONFIG_VCSEL_PERIOD)
+        # Continuous mode keeps ranging back-to-back, reads only fetch the
+        # latest result.
+        self._continuous = kwargs.get('continuous', False)
+        if self._continuous:
+            self.start_continuous()
 
     def bswap(self, val):
         return struct.unpack('<H', struct.pack('>H', val))[0]
@@ -49,7 +59,38 @@ class Vl53L0XModule(I2cModule):
         vcsel_period_pclks = (vcsel_period_reg + 1) << 1
         return vcsel_period_pclks
 
+    def start_continuous(self):
+        """
+        Start back-to-back ranging.
+        """
+        self.write8(self.VL53L0X_REG_SYSRANGE_START,
+                    self.SYSRANGE_START_BACK_TO_BACK)
+
+    def stop_continuous(self):
+        """
+        Stop back-to-back ranging.
+        """
+        self.write8(self.VL53L0X_REG_SYSRANGE_START,
+                    self.SYSRANGE_START_SINGLESHOT)
+
+    def _decode_distance(self, data):
+        return self._makeuint16(data[11], data[10]) * 0.001
+
+    def read_continuous_distance(self):
+        """
+        Get the latest distance measured in continuous mode. Interrupt
+        status and result registers follow each other and are read by single
+        block read, so both come from the same measurement. The interrupt is
+        cleared only when new result was available.
+        """
+        data = self.readList(self.VL53L0X_REG_RESULT_INTERRUPT_STATUS, 13)
+        if data[0] & self.INTERRUPT_STATUS_MASK:
+            self.write8(self.VL53L0X_REG_SYSTEM_INTERRUPT_CLEAR, 0x01)
+        return self._decode_distance(data[1:])
+
     def read_distance(self):
+        if self._continuous:
+            return self.read_continuous_distance()
         val1 = self.write8(self.VL53L0X_REG_SYSRANGE_START, 0x01)
         cnt = 0
         while (cnt < 100):
@@ -63,9 +104,8 @@ class Vl53L0XModule(I2cModule):
         data = self.readList(0x14, 12)
         ambient_count = self._makeuint16(data[7], data[6])
         signal_count = self._makeuint16(data[9], data[8])
-        distance = self._makeuint16(data[11], data[10])
         range_status_internal = ((data[0] & 0x78) >> 3)
-        return distance * 0.001
+        return self._decode_distance(data)
 
     def read_data(self):
         """
@@ -13,13 +13,19 @@ class ServoModule(PwmModule):
     SERVO_MIN_PULSE = 150
     SERVO_MAX_PULSE = 600
 
+    # Maximal time in seconds commit_action waits for the move.
+    MOVE_TIMEOUT = 5.0
+
     def __init__(self, *args, **kwargs):
         self._pin = self._normalize_pin(kwargs.get('data_pin'))
         self._angle = kwargs.get('angle', None)
         self._reverse_logic = kwargs.get('reverse_logic', False)
         self._offset_angle = kwargs.get('offset_angle', 0)
+        self._motion_rate = kwargs.get('motion_rate', 50)
+        self._max_velocity = kwargs.get('max_velocity', None)
         super(ServoModule, self).__init__(*args, **kwargs)
         self.setup_pin(self._pin)
+        self._motion = self._interface.get_motion_engine(self._motion_rate)
         if self._angle is None:
             self._angle = 90
         else:
@@ -27,10 +33,19 @@ class ServoModule(PwmModule):
             self.set_angle(self._angle)
 
     def commit_action(self, fun, arg=None):
+        """
+        Moves without duration are waited for up to MOVE_TIMEOUT seconds, so
+        the returned angle is the target angle. Moves with duration are left
+        running and the returned angle is the angle reached so far.
+        """
         if fun == 'read_data':
             return self.read_data()
         elif fun == 'set_angle':
-            self.set_angle(arg[0])
+            if len(arg) > 1:
+                self.move_to(arg[0], duration=arg[1])
+            else:
+                self.move_to(arg[0])
+                self._motion.wait(self._pin, self.MOVE_TIMEOUT)
             return self.read_data()
         elif fun == 'reset':
             self.reset()
@@ -38,14 +53,61 @@ class ServoModule(PwmModule):
 
     def reset(self):
         self._interface.reset()
+        self._motion.invalidate(self._pin)
+
+    def _angle_to_pulse(self, angle):
+        return int(self.SERVO_MIN_PULSE +
+                   (self.SERVO_MAX_PULSE - self.SERVO_MIN_PULSE) * angle / 180.0)
+
+    def _pulse_to_angle(self, pulse):
+        return 180.0 * (pulse - self.SERVO_MIN_PULSE) / (
+            self.SERVO_MAX_PULSE - self.SERVO_MIN_PULSE)
 
     def set_angle(self, angle):
+        """
+        Move to the angle immediately. The move is written by the motion
+        engine thread, use wait() to block until it is written.
+        """
+        self.move_to(angle, duration=0)
+
+    def move_to(self, angle, duration=None, velocity=None):
+        """
+        Move to the angle in duration seconds or with velocity in deg/s. The
+        move is interpolated by the motion engine of the interface, without
+        duration and velocity the configured maximal velocity is used. The
+        move is only queued, read_data() reports the angle written so far.
+        """
+        pulse = self._angle_to_pulse(angle)
+        if pulse < self.SERVO_MIN_PULSE or pulse > self.SERVO_MAX_PULSE:
+            self._log.error('Angle {0} deg is out of range'.format(angle))
+            return
+        if velocity is None:
+            velocity = self._max_velocity
+        if duration is None:
+            duration = 0
+            current = self._motion.position(self._pin)
+            if velocity and current is not None:
+                distance = abs(angle - self._pulse_to_angle(current))
+                duration = distance / float(velocity)
         self._angle = angle
-        pulse = int(self.SERVO_MIN_PULSE +
-                    (self.SERVO_MAX_PULSE - self.SERVO_MIN_PULSE) * angle / 180.0)
-        self._log.debug('Set angle {0} deg (pulse {1})'.format(angle, pulse))
-        if pulse >= self.SERVO_MIN_PULSE and pulse <= self.SERVO_MAX_PULSE:
-            self.set_duty_cycle(self._pin, pulse)
+        self._log.debug('Move to angle {0} deg (pulse {1}) in {2} s'.format(
+            angle, pulse, duration))
+        self._motion.move(self._pin, pulse, duration)
+
+    def wait(self, timeout=None):
+        """
+        Wait until the move is finished, return False on timeout.
+        """
+        return self._motion.wait(self._pin, timeout)
+
+    def get_angle(self):
+        """
+        Get the angle reached by the running move, or the target angle.
+        """
+        pulse = self._motion.position(self._pin)
+        if pulse is None or not self._motion.is_moving(self._pin):
+            return self._angle
+        return self._pulse_to_angle(pulse)
 
     def set_pulse_length(self, pulse):
         # 1,000,000 us per second
@@ -62,7 +124,7 @@ class ServoModule(PwmModule):
 
     def read_data(self):
         read_start = self._get_time()
-        angle = self._angle
+        angle = self.get_angle()
         read_stop = self._get_time()
         read_time = read_stop - read_start
         data = [
@@ -0,0 +1,473 @@
+import ctypes
+import fcntl
+import os
+import select
+import struct
+import threading
+import time
+from robophery.interface.gpio import GpioInterface
+
+
+def _iowr(type, number, size):
+    return (3 << 30) | (size << 16) | (type << 8) | number
+
+
+def _ior(type, number, size):
+    return (2 << 30) | (size << 16) | (type << 8) | number
+
+
+class GpioChipInfo(ctypes.Structure):
+    """
+    Kernel struct gpiochip_info.
+    """
+    _fields_ = [
+        ('name', ctypes.c_char * 32),
+        ('label', ctypes.c_char * 32),
+        ('lines', ctypes.c_uint32),
+    ]
+
+
+class GpioHandleRequest(ctypes.Structure):
+    """
+    Kernel struct gpiohandle_request.
+    """
+    _fields_ = [
+        ('lineoffsets', ctypes.c_uint32 * 64),
+        ('flags', ctypes.c_uint32),
+        ('default_values', ctypes.c_uint8 * 64),
+        ('consumer_label', ctypes.c_char * 32),
+        ('lines', ctypes.c_int),
+        ('fd', ctypes.c_int),
+    ]
+
+
+class GpioHandleData(ctypes.Structure):
+    """
+    Kernel struct gpiohandle_data.
+    """
+    _fields_ = [
+        ('values', ctypes.c_uint8 * 64),
+    ]
+
+
+class GpioEventRequest(ctypes.Structure):
+    """
+    Kernel struct gpioevent_request.
+    """
+    _fields_ = [
+        ('lineoffset', ctypes.c_uint32),
+        ('handleflags', ctypes.c_uint32),
+        ('eventflags', ctypes.c_uint32),
+        ('consumer_label', ctypes.c_char * 32),
+        ('fd', ctypes.c_int),
+    ]
+
+
+class LinuxGpioInterface(GpioInterface):
+    """
+    GPIO accessed directly through /dev/gpiochipN character device. Lines
+    of the same direction and bias are requested together, so several pins
+    are set or read by single ioctl. Edge events are read with their kernel
+    timestamps by polling thread, the timestamps are converted to monotonic
+    time as older kernels use CLOCK_REALTIME (CLOCK_MONOTONIC since 5.7).
+    """
+
+    GPIO_GET_CHIPINFO = _ior(0xB4, 0x01, ctypes.sizeof(GpioChipInfo))
+    GPIO_GET_LINEHANDLE = _iowr(0xB4, 0x03, ctypes.sizeof(GpioHandleRequest))
+    GPIO_GET_LINEEVENT = _iowr(0xB4, 0x04, ctypes.sizeof(GpioEventRequest))
+    GPIOHANDLE_GET_LINE_VALUES = _iowr(0xB4, 0x08,
+                                       ctypes.sizeof(GpioHandleData))
+    GPIOHANDLE_SET_LINE_VALUES = _iowr(0xB4, 0x09,
+                                       ctypes.sizeof(GpioHandleData))
+
+    GPIOHANDLES_MAX = 64
+
+    GPIOHANDLE_REQUEST_INPUT = 0x01
+    GPIOHANDLE_REQUEST_OUTPUT = 0x02
+    GPIOHANDLE_REQUEST_BIAS_PULL_UP = 0x20
+    GPIOHANDLE_REQUEST_BIAS_PULL_DOWN = 0x40
+    GPIOHANDLE_REQUEST_BIAS_DISABLE = 0x80
+
+    GPIOEVENT_REQUEST_RISING_EDGE = 0x01
+    GPIOEVENT_REQUEST_FALLING_EDGE = 0x02
+
+    GPIOEVENT_EVENT_RISING_EDGE = 0x01
+    GPIOEVENT_EVENT_FALLING_EDGE = 0x02
+
+    # struct gpioevent_data, timestamp in ns and event id
+    EVENT_DATA = struct.Struct('=QI4x')
+    EVENT_READ_COUNT = 16
+
+    def __init__(self, *args, **kwargs):
+        self._chip = int(kwargs.get('chip', 0))
+        self._device = kwargs.get(
+            'device', '/dev/gpiochip{0}'.format(self._chip))
+        self._consumer = kwargs.get('consumer', 'robophery').encode('utf8')
+        self._fd = os.open(self._device, os.O_RDWR)
+        info = GpioChipInfo()
+        fcntl.ioctl(self._fd, self.GPIO_GET_CHIPINFO, info)
+        self.NUM_GPIO = info.lines
+        self._pud_mapping = {
+            None: 0,
+            self.GPIO_PUD_OFF: self.GPIOHANDLE_REQUEST_BIAS_DISABLE,
+            self.GPIO_PUD_DOWN: self.GPIOHANDLE_REQUEST_BIAS_PULL_DOWN,
+            self.GPIO_PUD_UP: self.GPIOHANDLE_REQUEST_BIAS_PULL_UP,
+        }
+        self._edge_mapping = {
+            self.GPIO_EVENT_RISING: self.GPIOEVENT_REQUEST_RISING_EDGE,
+            self.GPIO_EVENT_FALLING: self.GPIOEVENT_REQUEST_FALLING_EDGE,
+            self.GPIO_EVENT_BOTH: (self.GPIOEVENT_REQUEST_RISING_EDGE |
+                                   self.GPIOEVENT_REQUEST_FALLING_EDGE),
+        }
+        self._event_id_mapping = {
+            self.GPIOEVENT_EVENT_RISING_EDGE: self.GPIO_EVENT_RISING,
+            self.GPIOEVENT_EVENT_FALLING_EDGE: self.GPIO_EVENT_FALLING,
+        }
+        self._line_modes = {}
+        self._output_values = {}
+        # pins of line handles by handle fd and handle fd of every pin
+        self._handles = {}
+        self._pin_handles = {}
+        self._event_lock = threading.Lock()
+        self._event_fds = {}
+        self._event_pins = {}
+        self._event_callbacks = {}
+        self._bouncetimes = {}
+        self._last_events = {}
+        # offset of event timestamps to monotonic time, detected on first
+        # event
+        self._event_clock_offset = None
+        self._events_detected = set()
+        self._edge_waiters = {}
+        self._poller = select.poll()
+        self._poll_thread = None
+        self._wake_read, self._wake_write = os.pipe()
+        self._poller.register(self._wake_read, select.POLLIN)
+        super(LinuxGpioInterface, self).__init__(*args, **kwargs)
+
+    def __str__(self):
+        return "{0} (device: {1})".format(self._base_name(), self._device)
+
+    def _release_handles(self, pin=None):
+        """
+        Release line handle of the pin, the other lines of the handle are
+        requested again with their current values. All handles are released
+        if no pin is specified.
+        """
+        if pin is None:
+            for fd in self._handles:
+                os.close(fd)
+            self._handles = {}
+            self._pin_handles = {}
+            return
+        fd = self._pin_handles.get(pin)
+        if fd is None:
+            return
+        pins = self._handles.pop(fd)
+        for line in pins:
+            del self._pin_handles[line]
+        os.close(fd)
+        self._request_handles([line for line in pins if line != pin])
+
+    def _request_handles(self, pins=None):
+        """
+        Request line handles for the given or all configured pins without
+        line handle and edge detection, grouped by their request flags.
+        """
+        if pins is None:
+            pins = list(self._line_modes)
+        groups = {}
+        for pin in sorted(pins):
+            if (pin in self._event_pins or pin in self._pin_handles or
+                    pin not in self._line_modes):
+                continue
+            mode, pull_up_down = self._line_modes[pin]
+            if mode == self.GPIO_MODE_OUT:
+                flags = self.GPIOHANDLE_REQUEST_OUTPUT
+            else:
+                flags = (self.GPIOHANDLE_REQUEST_INPUT |
+                         self._pud_mapping[pull_up_down])
+            groups.setdefault(flags, []).append(pin)
+        for flags, group in sorted(groups.items()):
+            for start in range(0, len(group), self.GPIOHANDLES_MAX):
+                pins = group[start:start + self.GPIOHANDLES_MAX]
+                request = GpioHandleRequest()
+                request.flags = flags
+                request.consumer_label = self._consumer
+                request.lines = len(pins)
+                for i, pin in enumerate(pins):
+                    request.lineoffsets[i] = pin
+                    request.default_values[i] = int(
+                        bool(self._output_values.get(pin, False)))
+                fcntl.ioctl(self._fd, self.GPIO_GET_LINEHANDLE, request)
+                for pin in pins:
+                    self._pin_handles[pin] = request.fd
+                self._handles[request.fd] = pins
+
+    def _get_handle(self, pin):
+        """
+        Get line handle of the pin as (fd, pins) tuple.
+        """
+        if pin in self._event_pins:
+            return self._event_pins[pin], [pin]
+        if pin not in self._pin_handles:
+            # pins set up since the last request are requested together
+            self._request_handles()
+        if pin not in self._pin_handles:
+            raise ValueError('Pin {0} is not set up.'.format(pin))
+        fd = self._pin_handles[pin]
+        return fd, self._handles[fd]
+
+    def setup_pin(self, pin, mode, pull_up_down=None):
+        """
+        Set the input or output mode for a specified pin. Mode should be
+        either OUT or IN. Lines are requested on first use.
+        """
+        self._validate_pin(pin)
+        if mode not in (self.GPIO_MODE_IN, self.GPIO_MODE_OUT):
+            raise ValueError('Invalid MODE, IN or OUT')
+        with self._lock:
+            self._line_modes[pin] = (mode, pull_up_down)
+            self._release_handles(pin)
+
+    def output(self, pin, value):
+        self.output_pins({pin: value})
+
+    def output_pins(self, pins):
+        """
+        Set multiple pins high or low at once, pins of the same line handle
+        are set by single ioctl.
+        """
+        with self._lock:
+            handles = {}
+            for pin, value in pins.items():
+                if self._line_modes.get(pin, (None, None))[0] != \
+                        self.GPIO_MODE_OUT:
+                    raise ValueError('Pin {0} is not output.'.format(pin))
+                self._output_values[pin] = bool(value)
+                fd, lines = self._get_handle(pin)
+                handles[fd] = lines
+            for fd, lines in handles.items():
+                data = GpioHandleData()
+                for i, line in enumerate(lines):
+                    data.values[i] = int(self._output_values.get(line, False))
+                fcntl.ioctl(fd, self.GPIOHANDLE_SET_LINE_VALUES, data)
+
+    def input(self, pin):
+        return self.input_pins([pin])[0]
+
+    def input_pins(self, pins):
+        """
+        Read multiple pins, pins of the same line handle are read by single
+        ioctl.
+        """
+        with self._lock:
+            values = {}
+            output = []
+            for pin in pins:
+                fd, lines = self._get_handle(pin)
+                if fd not in values:
+                    data = GpioHandleData()
+                    fcntl.ioctl(fd, self.GPIOHANDLE_GET_LINE_VALUES, data)
+                    values[fd] = list(data.values[:len(lines)])
+                output.append(bool(values[fd][lines.index(pin)]))
+            return output
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=-1):
+        """
+        Enable edge detection events for a particular GPIO channel. Pin
+        should be type IN. Edge must be RISING, FALLING or BOTH. Callback is
+        called from the polling thread. Bouncetime in ms drops events too
+        close to the previous one.
+        """
+        self._validate_pin(pin)
+        with self._lock:
+            if pin in self._event_pins:
+                self.remove_event_detect(pin)
+            mode, pull_up_down = self._line_modes.get(
+                pin, (self.GPIO_MODE_IN, None))
+            self._line_modes[pin] = (self.GPIO_MODE_IN, pull_up_down)
+            self._release_handles(pin)
+            request = GpioEventRequest()
+            request.lineoffset = pin
+            request.handleflags = (self.GPIOHANDLE_REQUEST_INPUT |
+                                   self._pud_mapping[pull_up_down])
+            request.eventflags = self._edge_mapping[edge]
+            request.consumer_label = self._consumer
+            fcntl.ioctl(self._fd, self.GPIO_GET_LINEEVENT, request)
+            with self._event_lock:
+                self._event_fds[request.fd] = pin
+                self._event_pins[pin] = request.fd
+                self._event_callbacks[pin] = [callback] if callback else []
+                self._bouncetimes[pin] = max(bouncetime, 0) / 1000.0
+                self._last_events.pop(pin, None)
+                self._poller.register(request.fd,
+                                      select.POLLIN | select.POLLPRI)
+            self._start_polling()
+
+    def remove_event_detect(self, pin):
+        """
+        Remove edge detection for a particular GPIO channel.
+        """
+        with self._lock:
+            with self._event_lock:
+                fd = self._event_pins.pop(pin, None)
+                if fd is None:
+                    return
+                self._event_fds.pop(fd, None)
+                self._event_callbacks.pop(pin, None)
+                self._poller.unregister(fd)
+                os.close(fd)
+            self._wake_polling()
+
+    def add_event_callback(self, pin, callback):
+        """
+        Add a callback for an event already defined using add_event_detect().
+        """
+        with self._event_lock:
+            if pin not in self._event_pins:
+                raise ValueError(
+                    'Edge detection is not enabled on pin {0}.'.format(pin))
+            self._event_callbacks[pin].append(callback)
+
+    def add_event_queue(self, pin, edge, size=None, bouncetime=-1):
+        """
+        Enable edge detection with events stored in bounded queue, events
+        are pushed with kernel timestamps by the polling thread.
+        """
+        self._create_event_queue(pin, size)
+        self.add_event_detect(pin, edge, bouncetime=bouncetime)
+
+    def event_detected(self, pin):
+        """
+        Returns True if an edge has occured on a given GPIO since the last
+        call.
+        """
+        with self._event_lock:
+            detected = pin in self._events_detected
+            self._events_detected.discard(pin)
+            return detected
+
+    def wait_for_edge(self, pin, edge):
+        """
+        Wait for an edge. Pin should be type IN. Edge must be RISING,
+        FALLING or BOTH.
+        """
+        waiter = threading.Event()
+        with self._event_lock:
+            self._edge_waiters[pin] = waiter
+        self.add_event_detect(pin, edge)
+        try:
+            waiter.wait()
+        finally:
+            with self._event_lock:
+                self._edge_waiters.pop(pin, None)
+            self.remove_event_detect(pin)
+
+    def cleanup(self, pin=None):
+        """
+        Release lines of specific pin, or all pins if none is specified.
+        """
+        # Stop polling before taking the lock, event callbacks running in
+        # the polling thread may need it.
+        if pin is None:
+            self._stop_polling()
+        with self._lock:
+            pins = [pin] if pin is not None else list(self._line_modes)
+            for line in pins:
+                self.remove_event_detect(line)
+                self._line_modes.pop(line, None)
+                self._output_values.pop(line, None)
+            self._release_handles(pin)
+
+    def close(self):
+        self.cleanup()
+        if self._fd is not None:
+            os.close(self._fd)
+            os.close(self._wake_read)
+            os.close(self._wake_write)
+            self._fd = None
+
+    def _start_polling(self):
+        if self._poll_thread is None:
+            self._poll_thread = threading.Thread(
+                target=self._poll_events,
+                name='{0}-events'.format(self._name))
+            self._poll_thread.daemon = True
+            self._poll_thread.start()
+        else:
+            self._wake_polling()
+
+    def _wake_polling(self):
+        os.write(self._wake_write, b'\0')
+
+    def _stop_polling(self):
+        if self._poll_thread is not None:
+            thread = self._poll_thread
+            self._poll_thread = None
+            self._wake_polling()
+            thread.join()
+
+    def _poll_events(self):
+        while self._poll_thread is not None:
+            for fd, flags in self._poller.poll():
+                if fd == self._wake_read:
+                    os.read(self._wake_read, 64)
+                else:
+                    self._read_events(fd)
+
+    def _get_event_clock_offset(self, timestamp):
+        """
+        Get offset converting event timestamps to monotonic time. The
+        kernel clock is detected once, from the clock closer to the first
+        event timestamp.
+        """
+        if self._event_clock_offset is None:
+            monotonic = getattr(time, 'monotonic', time.time)()
+            realtime = time.time()
+            if abs(timestamp - realtime) < abs(timestamp - monotonic):
+                self._event_clock_offset = monotonic - realtime
+            else:
+                self._event_clock_offset = 0.0
+        return self._event_clock_offset
+
+    def _read_events(self, fd):
+        """
+        Read kernel events of the line and dispatch them.
+        """
+        with self._event_lock:
+            pin = self._event_fds.get(fd)
+            if pin is None:
+                return
+            try:
+                raw = os.read(fd, self.EVENT_DATA.size * self.EVENT_READ_COUNT)
+            except OSError:
+                return
+            bouncetime = self._bouncetimes[pin]
+            callbacks = list(self._event_callbacks.get(pin, []))
+            waiter = self._edge_waiters.get(pin)
+            events = []
+            for offset in range(0, len(raw) - self.EVENT_DATA.size + 1,
+                                self.EVENT_DATA.size):
+                timestamp, event_id = self.EVENT_DATA.unpack_from(raw, offset)
+                timestamp = timestamp / 1000000000.0
+                timestamp += self._get_event_clock_offset(timestamp)
+                last = self._last_events.get(pin)
+                if bouncetime and last is not None and \
+                        timestamp - last < bouncetime:
+                    continue
+                self._last_events[pin] = timestamp
+                events.append((self._event_id_mapping.get(event_id),
+                               timestamp))
+            if events:
+                self._events_detected.add(pin)
+        for edge, timestamp in events:
+            self._push_event(pin, edge, timestamp)
+            for callback in callbacks:
+                try:
+                    callback(pin)
+                except Exception as exception:
+                    self._log.error("Event callback failed: {0}".format(
+                        exception))
+        if events and waiter is not None:
+            waiter.set()
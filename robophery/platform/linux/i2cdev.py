@@ -0,0 +1,193 @@
+import ctypes
+import fcntl
+import os
+from robophery.interface.i2c import I2cInterface
+
+
+class I2cMessage(ctypes.Structure):
+    """
+    Kernel struct i2c_msg.
+    """
+    _fields_ = [
+        ('addr', ctypes.c_uint16),
+        ('flags', ctypes.c_uint16),
+        ('len', ctypes.c_uint16),
+        ('buf', ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+
+class I2cRdwrIoctlData(ctypes.Structure):
+    """
+    Kernel struct i2c_rdwr_ioctl_data.
+    """
+    _fields_ = [
+        ('msgs', ctypes.POINTER(I2cMessage)),
+        ('nmsgs', ctypes.c_uint32),
+    ]
+
+
+class LinuxI2cInterface(I2cInterface):
+    """
+    I2C bus accessed directly through /dev/i2c-N character device. Several
+    messages are sent as single combined transaction with repeated start
+    by the I2C_RDWR ioctl.
+    """
+
+    I2C_RDWR = 0x0707
+    I2C_M_RD = 0x0001
+    I2C_RDWR_IOCTL_MAX_MSGS = 42
+
+    # Messages are limited only by the 16-bit length field.
+    MAX_BLOCK_LENGTH = 4096
+
+    def __init__(self, *args, **kwargs):
+        self._busnum = int(kwargs.get('busnum', 1))
+        self._device = kwargs.get(
+            'device', '/dev/i2c-{0}'.format(self._busnum))
+        self._fd = os.open(self._device, os.O_RDWR)
+        super(LinuxI2cInterface, self).__init__(*args, **kwargs)
+
+    def __str__(self):
+        return "{0} (device: {1})".format(self._base_name(), self._device)
+
+    def _transfer(self, messages):
+        """
+        Run list of (addr, data, read_length) messages as one combined
+        transaction. Data are written if read_length is None, otherwise
+        read_length bytes are read. Return list of bytes read by each read
+        message.
+        """
+        buffers = []
+        for addr, data, read_length in messages:
+            if read_length is None:
+                buf = (ctypes.c_uint8 * len(data))(*data)
+            else:
+                buf = (ctypes.c_uint8 * read_length)()
+            buffers.append(buf)
+        results = []
+        max_msgs = self.I2C_RDWR_IOCTL_MAX_MSGS
+        for start in range(0, len(messages), max_msgs):
+            chunk = messages[start:start + max_msgs]
+            msgs = (I2cMessage * len(chunk))()
+            for i, (addr, data, read_length) in enumerate(chunk):
+                buf = buffers[start + i]
+                msgs[i].addr = addr
+                msgs[i].flags = 0 if read_length is None else self.I2C_M_RD
+                msgs[i].len = len(buf)
+                msgs[i].buf = ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8))
+            ioctl_data = I2cRdwrIoctlData(msgs=msgs, nmsgs=len(chunk))
+            fcntl.ioctl(self._fd, self.I2C_RDWR, ioctl_data)
+        for (addr, data, read_length), buf in zip(messages, buffers):
+            if read_length is not None:
+                results.append(list(buf))
+        return results
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def writeRaw8(self, addr, value):
+        """
+        Write an 8-bit value on the bus (without register).
+        """
+        self._transfer([(addr, [value & 0xFF], None)])
+
+    def write8(self, addr, register, value):
+        """
+        Write an 8-bit value to the specified register.
+        """
+        self._transfer([(addr, [register, value & 0xFF], None)])
+
+    def write16(self, addr, register, value):
+        """
+        Write a 16-bit value to the specified register.
+        """
+        value = value & 0xFFFF
+        self._transfer([(addr, [register, value & 0xFF, value >> 8], None)])
+
+    def writeList(self, addr, register, data):
+        """
+        Write bytes to the specified register.
+        """
+        self._transfer([(addr, [register] + list(data), None)])
+
+    def writeRawList(self, addr, data):
+        """
+        Write bytes on the bus (without register).
+        """
+        self._transfer([(addr, list(data), None)])
+
+    def writeReadList(self, addr, data, length):
+        """
+        Write bytes and read a length number of bytes in single transaction
+        with repeated start.
+        """
+        return self._transfer([(addr, list(data), None),
+                               (addr, None, length)])[0]
+
+    def readLists(self, addr, requests):
+        """
+        Read list of (register, length) requests in single transaction.
+        """
+        messages = []
+        for register, length in requests:
+            messages.append((addr, [register], None))
+            messages.append((addr, None, length))
+        return self._transfer(messages)
+
+    def readRaw8(self, addr):
+        """
+        Read an 8-bit value on the bus (without register).
+        """
+        return self._transfer([(addr, None, 1)])[0][0]
+
+    def readRawList(self, addr, length):
+        """
+        Read a length number of bytes on the bus (without register).
+        """
+        return self._transfer([(addr, None, length)])[0]
+
+    def readU8(self, addr, register):
+        """
+        Read an unsigned byte from the specified register.
+        """
+        return self.writeReadList(addr, [register], 1)[0]
+
+    def readS8(self, addr, register):
+        """
+        Read a signed byte from the specified register.
+        """
+        result = self.readU8(addr, register)
+        if result > 127:
+            result -= 256
+        return result
+
+    def readU16(self, addr, register, little_endian=True):
+        """
+        Read an unsigned 16-bit value from the specified register, with the
+        specified endianness (default little endian, or least significant byte
+        first).
+        """
+        first, second = self.writeReadList(addr, [register], 2)
+        if little_endian:
+            return (second << 8) | first
+        return (first << 8) | second
+
+    def readS16(self, addr, register, little_endian=True):
+        """
+        Read a signed 16-bit value from the specified register, with the
+        specified endianness (default little endian, or least significant byte
+        first).
+        """
+        result = self.readU16(addr, register, little_endian)
+        if result > 32767:
+            result -= 65536
+        return result
+
+    def readList(self, addr, register, length):
+        """
+        Read a length number of bytes from the specified register. Results
+        will be returned as a bytearray.
+        """
+        return self.writeReadList(addr, [register], length)
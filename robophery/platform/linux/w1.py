@@ -22,6 +22,13 @@ class LinuxW1Interface(W1Interface):
     def __str__(self):
         return "{0} (connected to {1}, data pin {2})".format(self._base_name(), self._parent_interface._name, self._parent_data_pin)
 
+    def _bus_interface(self):
+        """
+        Kernel w1-gpio driver owns the data pin, so the 1-wire bus does not
+        share the bus of its parent GPIO interface.
+        """
+        return self
+
     def _get_devices(self):
         output = []
         devices = w1thermsensor.W1ThermSensor.get_available_sensors()
@@ -49,6 +49,7 @@ class Pca9685PwmInterface(PwmInterface):
 
     # Bits:
     RESTART = 0x80
+    AUTO_INCREMENT = 0x20
     SLEEP = 0x10
     ALLCALL = 0x01
     INVRT = 0x10
@@ -60,12 +61,15 @@ class Pca9685PwmInterface(PwmInterface):
         self._parent_interface.setup_addr(self._parent_address)
         self._pins_available = self.AVAILABLE_PINS
         self._frequency = None
+        self._duty_cycles = {}
         super(Pca9685PwmInterface, self).__init__(*args, **kwargs)
-        self.set_all_duty_cycle(0)
         self._parent_interface.write8(
             self._parent_address, self.MODE2, self.OUTDRV)
+        # auto-increment lets channel registers be written in single block
         self._parent_interface.write8(
-            self._parent_address, self.MODE1, self.ALLCALL)
+            self._parent_address, self.MODE1,
+            self.ALLCALL | self.AUTO_INCREMENT)
+        self.set_all_duty_cycle(0)
         # wait for oscillator
         self._msleep(5)
         mode1 = self._parent_interface.readU8(self._parent_address, self.MODE1)
@@ -76,7 +80,31 @@ class Pca9685PwmInterface(PwmInterface):
         self._msleep(5)
 
     def reset(self):
+        """
+        Reset all devices on the bus and set up the modes and frequency
+        again, the registers are back at their power-up values afterwards.
+        """
+        frequency, self._frequency = self._frequency, None
         self._parent_interface.writeRaw8(0x00, 0x06)
+        self._parent_interface.write8(
+            self._parent_address, self.MODE2, self.OUTDRV)
+        self._parent_interface.write8(
+            self._parent_address, self.MODE1,
+            self.ALLCALL | self.AUTO_INCREMENT)
+        # wait for oscillator
+        self._msleep(5)
+        mode1 = self._parent_interface.readU8(self._parent_address, self.MODE1)
+        # wake up (reset sleep)
+        mode1 = mode1 & ~self.SLEEP
+        self._parent_interface.write8(self._parent_address, self.MODE1, mode1)
+        # wait for oscillator
+        self._msleep(5)
+        # pre-scale is back at its default too
+        if frequency is not None:
+            self.set_frequency(frequency)
+        self._duty_cycles = {}
+        if self._motion_engine is not None:
+            self._motion_engine.invalidate()
 
     def setup_pin(self, pin, dutycycle=0, frequency=2000):
         """
@@ -113,33 +141,64 @@ class Pca9685PwmInterface(PwmInterface):
                 self._parent_address, self.MODE1, oldmode | 0x80)
         self._frequency = frequency
 
+    def _get_channel_data(self, dutycycle):
+        """
+        Get ON_L, ON_H, OFF_L and OFF_H register values of single channel.
+        """
+        on = 0
+        off = int(dutycycle)
+        return [on & 0xFF, on >> 8, off & 0xFF, off >> 8]
+
     def set_duty_cycle(self, pin, dutycycle):
         """
         Set percent duty cycle of PWM output on specified pin. Duty cycle must
         be a value 0.0 to 100.0 (inclusive).
         """
-        on = 0
-        off = int(dutycycle)
-        self._parent_interface.write8(
-            self._parent_address, self.LED0_ON_L + 4 * pin, on & 0xFF)
-        self._parent_interface.write8(
-            self._parent_address, self.LED0_ON_H + 4 * pin, on >> 8)
-        self._parent_interface.write8(
-            self._parent_address, self.LED0_OFF_L + 4 * pin, off & 0xFF)
-        self._parent_interface.write8(
-            self._parent_address, self.LED0_OFF_H + 4 * pin, off >> 8)
+        self._parent_interface.writeList(
+            self._parent_address, self.LED0_ON_L + 4 * pin,
+            self._get_channel_data(dutycycle))
+        self._duty_cycles[pin] = int(dutycycle)
+
+    def set_duty_cycles(self, dutycycles):
+        """
+        Set duty cycles of several pins given as dict of pin to duty cycle.
+        Only changed channels are written, consecutive channels in single
+        block write limited by the maximal block length of the bus. SMBus
+        blocks hold 8 channels, the i2c-dev interface writes all 16 at once.
+        """
+        changed = dict((pin, int(dutycycle))
+                       for pin, dutycycle in dutycycles.items()
+                       if self._duty_cycles.get(pin) != int(dutycycle))
+        if not changed:
+            return
+        values = dict(self._duty_cycles)
+        values.update(changed)
+        # channels between changed ones are rewritten with their known
+        # values rather than split into several transactions
+        runs = []
+        for pin in sorted(changed):
+            if runs and all(gap in values
+                            for gap in range(runs[-1][-1] + 1, pin)):
+                runs[-1].extend(range(runs[-1][-1] + 1, pin + 1))
+            else:
+                runs.append([pin])
+        block_channels = max(1, self._parent_interface.MAX_BLOCK_LENGTH // 4)
+        for run in runs:
+            for start in range(0, len(run), block_channels):
+                pins = run[start:start + block_channels]
+                data = []
+                for pin in pins:
+                    data.extend(self._get_channel_data(values[pin]))
+                self._parent_interface.writeList(
+                    self._parent_address, self.LED0_ON_L + 4 * pins[0], data)
+        self._duty_cycles.update(changed)
 
     def set_all_duty_cycle(self, dutycycle):
         """
         Sets all PWM channels.
         """
-        on = 0
-        off = int(dutycycle)
-        self._parent_interface.write8(
-            self._parent_address, self.ALL_LED_ON_L, on & 0xFF)
-        self._parent_interface.write8(
-            self._parent_address, self.ALL_LED_ON_H, on >> 8)
-        self._parent_interface.write8(
-            self._parent_address, self.ALL_LED_OFF_L, off & 0xFF)
-        self._parent_interface.write8(
-            self._parent_address, self.ALL_LED_OFF_H, off >> 8)
+        self._parent_interface.writeList(
+            self._parent_address, self.ALL_LED_ON_L,
+            self._get_channel_data(dutycycle))
+        self._duty_cycles = dict((pin, int(dutycycle))
+                                 for pin in self.AVAILABLE_PINS)
@@ -7,6 +7,9 @@ class Pcf8574GpioInterface(GpioInterface):
     """
     NUM_GPIO = 8
 
+    # Single byte transfer on 400 kHz bus.
+    OUTPUT_STEP_TIME = 22
+
     def __init__(self, *args, **kwargs):
         self._parent_interface = kwargs['parent']['interface']
         self._parent_address = kwargs['parent']['address']
@@ -41,9 +44,9 @@ class Pcf8574GpioInterface(GpioInterface):
 
 
     def setup_pins(self, pins):
-        if False in [y for x,y in [(self._validate_pin(pin), mode in (self.GPIO_MODE_IN,self.GPIO_MODE_OUT)) for pin, mode in pins.iteritems()]]:
+        if False in [y for x,y in [(self._validate_pin(pin), mode in (self.GPIO_MODE_IN,self.GPIO_MODE_OUT)) for pin, mode in pins.items()]]:
             raise ValueError('Invalid MODE, IN or OUT')
-        for pin, mode in pins.iteritems():
+        for pin, mode in pins.items():
             self._log.debug("[{0}] Set pin {1} to mode {2}".format(self._name, pin, mode))
             self.iodir = self._bit2(self.iodir, pin, mode)
         self._write_pins()
@@ -55,11 +58,22 @@ class Pcf8574GpioInterface(GpioInterface):
 
     def output_pins(self, pins):
         [self._validate_pin(pin) for pin in pins.keys()]
-        for pin, value in pins.iteritems():
+        for pin, value in pins.items():
             self.gpio = self._bit2(self.gpio, pin, bool(value))
         self._write_pins()
 
 
+    def output_pins_sequence(self, steps):
+        data = []
+        for pins in steps:
+            for pin, value in pins.items():
+                self._validate_pin(pin)
+                self.gpio = self._bit2(self.gpio, pin, bool(value))
+            data.append(self.gpio | self.iodir)
+        if data:
+            self._parent_interface.writeRawList(self._parent_address, data)
+
+
     def input(self, pin):
         return self.input_pins([pin])[0]
 
@@ -0,0 +1,81 @@
+"""
+Persisted cache of sensor calibration coefficients
+
+Coefficients read from sensor EEPROM are stored in JSON file keyed by bus,
+address and chip ID, so restarted service does not have to read them all
+again. Every entry is stored with checksum of its coefficients, damaged
+entries are ignored.
+"""
+
+import json
+import os
+import threading
+import zlib
+
+
+class CalibrationCache(object):
+    """
+    Calibration coefficients stored in JSON file.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as cache_file:
+                    self._data = json.load(cache_file)
+            except ValueError:
+                self._data = {}
+
+    def _key(self, bus, addr, chip_id):
+        return '{0}:{1:#x}:{2:#x}'.format(bus, addr, chip_id)
+
+    def _checksum(self, values):
+        data = ','.join(str(value) for value in values)
+        return zlib.crc32(data.encode('ascii')) & 0xFFFFFFFF
+
+    def get(self, bus, addr, chip_id):
+        """
+        Get cached coefficients, or None if there are none or their
+        checksum does not match.
+        """
+        with self._lock:
+            entry = self._data.get(self._key(bus, addr, chip_id))
+        try:
+            values = list(entry['values'])
+            if entry['checksum'] != self._checksum(values):
+                return None
+        except (KeyError, TypeError):
+            return None
+        return values
+
+    def set(self, bus, addr, chip_id, values):
+        """
+        Store coefficients and write the cache file.
+        """
+        values = list(values)
+        with self._lock:
+            self._data[self._key(bus, addr, chip_id)] = {
+                'values': values,
+                'checksum': self._checksum(values),
+            }
+            self._write()
+
+    def delete(self, bus, addr, chip_id):
+        """
+        Remove coefficients, for example after failed verification.
+        """
+        with self._lock:
+            if self._data.pop(self._key(bus, addr, chip_id), None) is not None:
+                self._write()
+
+    def _write(self):
+        """
+        Write the cache file atomically by renaming temporary file.
+        """
+        temp_path = '{0}.tmp'.format(self._path)
+        with open(temp_path, 'w') as cache_file:
+            json.dump(self._data, cache_file, indent=2, sort_keys=True)
+        os.rename(temp_path, self._path)
@@ -0,0 +1,157 @@
+"""
+Fixed-rate motion engine for PWM outputs
+
+Moves are interpolated on timer thread and all outputs moving in one tick
+are updated by single bulk duty cycle write, so the bus load per tick does
+not grow with number of moving outputs.
+"""
+
+import threading
+import time
+
+
+class MotionEngine(object):
+    """
+    Linear interpolation of PWM output moves on single interface.
+    """
+
+    def __init__(self, interface, rate=50):
+        if rate <= 0:
+            raise ValueError("Motion rate must be positive.")
+        self._interface = interface
+        self._period = 1.0 / rate
+        self._moves = {}
+        self._positions = {}
+        self._condition = threading.Condition()
+        self._clock = getattr(time, 'monotonic', time.time)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name='{0}-motion'.format(interface._name))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def move(self, pin, target, duration=0):
+        """
+        Move output from its current value to the target value in duration
+        seconds. Output without known value jumps to the target. The move is
+        only queued, the output is written by the following ticks.
+        """
+        with self._condition:
+            start = self._positions.get(pin, target)
+            self._moves[pin] = (start, target, self._clock(),
+                                max(duration, 0))
+            self._condition.notify()
+
+    def stop(self, pin=None):
+        """
+        Stop move of the output, or of all outputs if none is specified.
+        """
+        with self._condition:
+            if pin is None:
+                self._moves.clear()
+            else:
+                self._moves.pop(pin, None)
+            self._condition.notify_all()
+
+    def invalidate(self, pin=None):
+        """
+        Stop move of the output and forget its value, or of all outputs if
+        none is specified. Use when the outputs were reset outside of the
+        engine, next move of the output jumps to the target.
+        """
+        with self._condition:
+            if pin is None:
+                self._moves.clear()
+                self._positions.clear()
+            else:
+                self._moves.pop(pin, None)
+                self._positions.pop(pin, None)
+            self._condition.notify_all()
+
+    def position(self, pin):
+        """
+        Get the last value written to the output, or None.
+        """
+        with self._condition:
+            return self._positions.get(pin)
+
+    def is_moving(self, pin):
+        with self._condition:
+            return pin in self._moves
+
+    def wait(self, pin, timeout=None):
+        """
+        Wait until the move of the output is finished and its target value
+        written. Return False if the move is still running after timeout
+        seconds.
+        """
+        with self._condition:
+            if timeout is not None:
+                end = self._clock() + timeout
+            while pin in self._moves:
+                if timeout is None:
+                    self._condition.wait()
+                else:
+                    remaining = end - self._clock()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            return True
+
+    def close(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+
+    def _tick(self, now):
+        values = {}
+        finished = {}
+        with self._condition:
+            for pin, move in list(self._moves.items()):
+                start, target, start_time, duration = move
+                elapsed = now - start_time
+                if elapsed >= duration:
+                    value = target
+                    finished[pin] = move
+                else:
+                    value = start + (target - start) * elapsed / duration
+                value = int(round(value))
+                if self._positions.get(pin) != value:
+                    self._positions[pin] = value
+                    values[pin] = value
+        if values:
+            with self._interface._bus_interface()._lock:
+                self._interface.set_duty_cycles(values)
+        if finished:
+            # Moves are finished only after the write, for waiting callers.
+            with self._condition:
+                for pin, move in finished.items():
+                    if self._moves.get(pin) is move:
+                        del self._moves[pin]
+                self._condition.notify_all()
+
+    def _run(self):
+        deadline = None
+        while True:
+            with self._condition:
+                while self._running and not self._moves:
+                    deadline = None
+                    self._condition.wait()
+                if not self._running:
+                    return
+            now = self._clock()
+            if deadline is None:
+                deadline = now
+            try:
+                self._tick(now)
+            except Exception as exception:
+                self._interface._log.error(
+                    "Motion update failed: {0}".format(exception))
+            deadline += self._period
+            delay = deadline - self._clock()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Ticks are not caught up, moves are interpolated by time.
+                deadline = self._clock()
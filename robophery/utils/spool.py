@@ -0,0 +1,164 @@
+"""
+Bounded store-and-forward spool
+
+Records are appended to ring buffer in memory-mapped file, so unsent data
+survive restarts of the service while the memory usage stays constant.
+"""
+
+import mmap
+import os
+import struct
+
+
+class FileSpool(object):
+    """
+    Ring buffer of length-prefixed records stored in memory-mapped file.
+    """
+
+    MAGIC = b'RPSP'
+    HEADER = struct.Struct('<4sIIII')
+    LENGTH = struct.Struct('<I')
+    WRAP_MARKER = 0xFFFFFFFF
+
+    DROP_OLDEST_POLICY = 'drop_oldest'
+    DROP_NEWEST_POLICY = 'drop_newest'
+
+    def __init__(self, path, size=1048576, policy=DROP_OLDEST_POLICY):
+        if policy not in (self.DROP_OLDEST_POLICY, self.DROP_NEWEST_POLICY):
+            raise ValueError("Unknown spool eviction policy {0}.".format(
+                policy))
+        self._path = path
+        self._size = int(size)
+        self._policy = policy
+        self._data_start = self.HEADER.size
+        if self._size <= self._data_start + self.LENGTH.size:
+            raise ValueError("Spool size {0} is too small.".format(size))
+        exists = os.path.exists(path) and os.path.getsize(path) == self._size
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        if not exists:
+            self._file.truncate(self._size)
+        self._mmap = mmap.mmap(self._file.fileno(), self._size)
+        magic, head, tail, count, evicted = self.HEADER.unpack_from(
+            self._mmap, 0)
+        if magic != self.MAGIC:
+            self._reset()
+            self._evicted = 0
+            self._write_header()
+        else:
+            self._head = head
+            self._tail = tail
+            self._count = count
+            self._evicted = evicted
+
+    def __len__(self):
+        return self._count
+
+    def _reset(self):
+        self._head = self._data_start
+        self._tail = self._data_start
+        self._count = 0
+
+    def _write_header(self):
+        self.HEADER.pack_into(self._mmap, 0, self.MAGIC, self._head,
+                              self._tail, self._count, self._evicted)
+
+    def _place(self, length):
+        """
+        Return offset where record of given length fits, or None if there
+        is not enough free space.
+        """
+        if self._count == 0:
+            self._reset()
+            return self._tail
+        if self._tail == self._head:
+            return None
+        if self._tail > self._head:
+            if self._tail + length <= self._size:
+                return self._tail
+            if self._data_start + length <= self._head:
+                if self._tail + self.LENGTH.size <= self._size:
+                    self.LENGTH.pack_into(self._mmap, self._tail,
+                                          self.WRAP_MARKER)
+                return self._data_start
+            return None
+        if self._tail + length <= self._head:
+            return self._tail
+        return None
+
+    def _record_offset(self):
+        """
+        Return offset and length of the oldest record.
+        """
+        offset = self._head
+        if offset + self.LENGTH.size > self._size:
+            offset = self._data_start
+        length = self.LENGTH.unpack_from(self._mmap, offset)[0]
+        if length == self.WRAP_MARKER:
+            offset = self._data_start
+            length = self.LENGTH.unpack_from(self._mmap, offset)[0]
+        return offset, length
+
+    def _discard(self):
+        offset, length = self._record_offset()
+        self._head = offset + self.LENGTH.size + length
+        self._count -= 1
+        if self._count == 0:
+            self._reset()
+
+    def evicted(self):
+        """
+        Return number of records dropped because the spool was full.
+        """
+        return self._evicted
+
+    def push(self, payload):
+        """
+        Append record to the spool. Return False if the record was dropped
+        by the eviction policy.
+        """
+        length = self.LENGTH.size + len(payload)
+        if length > self._size - self._data_start:
+            self._evicted += 1
+            self._write_header()
+            return False
+        offset = self._place(length)
+        while offset is None:
+            self._evicted += 1
+            if self._policy == self.DROP_NEWEST_POLICY:
+                self._write_header()
+                return False
+            self._discard()
+            offset = self._place(length)
+        self.LENGTH.pack_into(self._mmap, offset, len(payload))
+        self._mmap[offset + self.LENGTH.size:offset + length] = payload
+        self._tail = offset + length
+        self._count += 1
+        self._write_header()
+        self._mmap.flush()
+        return True
+
+    def peek(self):
+        """
+        Return the oldest record without removing it, or None if the spool
+        is empty.
+        """
+        if self._count == 0:
+            return None
+        offset, length = self._record_offset()
+        start = offset + self.LENGTH.size
+        return bytes(self._mmap[start:start + length])
+
+    def pop(self):
+        """
+        Remove and return the oldest record, or None if the spool is empty.
+        """
+        payload = self.peek()
+        if payload is not None:
+            self._discard()
+            self._write_header()
+        return payload
+
+    def close(self):
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
@@ -16,6 +16,9 @@ STATSD_HOST = 'localhost'
 STATSD_PORT = 8125
 STATSD_SAMPLE_RATE = None
 STATSD_BUCKET_PREFIX = None
+STATSD_MTU = 512
+
+_logger = logging.getLogger(__name__)
 
 
 def decrement(bucket, delta=1, sample_rate=None):
@@ -36,7 +39,8 @@ def timing(bucket, ms, sample_rate=None):
 
 class StatsdClient(object):
 
-    def __init__(self, host=None, port=None, prefix=None, sample_rate=None):
+    def __init__(self, host=None, port=None, prefix=None, sample_rate=None,
+                 mtu=None):
         self._host = host or STATSD_HOST
         self._port = port or STATSD_PORT
         self._sample_rate = sample_rate or STATSD_SAMPLE_RATE
@@ -44,6 +48,42 @@ class StatsdClient(object):
         self._prefix = prefix or STATSD_BUCKET_PREFIX
         if self._prefix and not isinstance(self._prefix, bytes):
             self._prefix = self._prefix.encode('utf8')
+        self._mtu = mtu or STATSD_MTU
+        self._buffer = None
+        self._buffer_size = 0
+
+
+    def begin(self):
+        """Start buffering stats, they are sent on flush() packed into
+        datagrams of at most mtu bytes.
+        """
+        if self._buffer is None:
+            self._buffer = []
+            self._buffer_size = 0
+
+
+    def flush(self):
+        """Send buffered stats and stop buffering.
+        """
+        if self._buffer is not None:
+            self._send_buffer()
+            self._buffer = None
+
+
+    def _send_buffer(self):
+        """Send buffered stats as single newline separated datagram.
+        """
+        if self._buffer:
+            self._sendto(b'\n'.join(self._buffer))
+        self._buffer = []
+        self._buffer_size = 0
+
+
+    def _sendto(self, packet):
+        try:
+            self._socket.sendto(packet, (self._host, self._port))
+        except Exception:
+            _logger.error("Failed to send statsd packet.", exc_info=True)
 
 
     def decr(self, bucket, delta=1, sample_rate=None):
@@ -68,7 +108,7 @@ class StatsdClient(object):
 
 
     def _send(self, bucket, value, sample_rate=None):
-        """Format and send data to statsd.
+        """Format and send data to statsd, or add it to the buffer.
         """
         try:
             bucket = bucket if isinstance(bucket, bytes) else bucket.encode('utf8')
@@ -83,10 +123,20 @@ class StatsdClient(object):
             stat = bucket + b':' + value
             if self._prefix:
                 stat = self._prefix + b'.' + stat
-
-            self._socket.sendto(stat, (self._host, self._port))
-        except Exception as e:
-            _logger.error("Failed to send statsd packet.", exc_info=True)
+        except Exception:
+            _logger.error("Failed to format statsd packet.", exc_info=True)
+            return
+
+        if self._buffer is None:
+            self._sendto(stat)
+            return
+        # Stats are separated by newline, count it for all but first one.
+        size = len(stat) + (1 if self._buffer else 0)
+        if self._buffer and self._buffer_size + size > self._mtu:
+            self._send_buffer()
+            size = len(stat)
+        self._buffer.append(stat)
+        self._buffer_size += size
 
 
     def timing(self, bucket, ms, sample_rate=None):
@@ -184,6 +234,7 @@ def init_statsd(settings=None):
     global STATSD_PORT
     global STATSD_SAMPLE_RATE
     global STATSD_BUCKET_PREFIX
+    global STATSD_MTU
 
     if settings:
         STATSD_HOST = settings.get('STATSD_HOST', STATSD_HOST)
@@ -192,6 +243,8 @@ def init_statsd(settings=None):
                                           STATSD_SAMPLE_RATE)
         STATSD_BUCKET_PREFIX = settings.get('STATSD_BUCKET_PREFIX',
                                             STATSD_BUCKET_PREFIX)
+        STATSD_MTU = settings.get('STATSD_MTU', STATSD_MTU)
     _statsd = StatsdClient(host=STATSD_HOST, port=STATSD_PORT,
-                           sample_rate=STATSD_SAMPLE_RATE, prefix=STATSD_BUCKET_PREFIX)
+                           sample_rate=STATSD_SAMPLE_RATE, prefix=STATSD_BUCKET_PREFIX,
+                           mtu=STATSD_MTU)
     return _statsd
@@ -0,0 +1,98 @@
+"""
+Binary ring buffer for tracing bus transactions
+
+Every record is packed into preallocated bytearray, so tracing does not
+allocate nor format strings on the bus hot path. Records are decoded only
+when they are inspected.
+"""
+
+import struct
+import threading
+import time
+
+
+class BusTrace(object):
+    """
+    Fixed size ring buffer of bus transaction records.
+    """
+
+    # monotonic time, operation, address, register, length, value
+    RECORD = struct.Struct('<dBBHHI')
+    NO_REGISTER = 0xFFFF
+
+    def __init__(self, size=1024, operations=None):
+        self._size = int(size)
+        if self._size < 1:
+            raise ValueError("Trace size must be positive.")
+        self._buffer = bytearray(self.RECORD.size * self._size)
+        self._operations = list(operations or [])
+        self._index = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._clock = getattr(time, 'monotonic', time.time)
+
+    def __len__(self):
+        return self._count
+
+    def operation_code(self, name):
+        """
+        Get numeric code of the operation name, new names get new codes.
+        """
+        if name not in self._operations:
+            self._operations.append(name)
+        return self._operations.index(name)
+
+    def record(self, operation, addr, register=None, value=None):
+        """
+        Store single transaction. Value can be integer, sequence of bytes
+        or sequence of byte sequences, which are joined. Only the length and
+        first four bytes of sequences are kept.
+        """
+        length = 0
+        if value is None:
+            value = 0
+        elif not isinstance(value, int):
+            if len(value) and not isinstance(value[0], int):
+                value = [byte for part in value for byte in part]
+            length = len(value)
+            packed = 0
+            for byte in value[:4]:
+                packed = (packed << 8) | (byte & 0xFF)
+            value = packed
+        if register is None:
+            register = self.NO_REGISTER
+        with self._lock:
+            self.RECORD.pack_into(self._buffer,
+                                  self._index * self.RECORD.size,
+                                  self._clock(), operation, addr & 0xFF,
+                                  register & 0xFFFF, length & 0xFFFF,
+                                  value & 0xFFFFFFFF)
+            self._index = (self._index + 1) % self._size
+            if self._count < self._size:
+                self._count += 1
+
+    def records(self):
+        """
+        Return decoded records, oldest first, as list of (time, operation,
+        addr, register, length, value) tuples.
+        """
+        with self._lock:
+            start = (self._index - self._count) % self._size
+            indexes = [(start + i) % self._size for i in range(self._count)]
+            raw = [self.RECORD.unpack_from(self._buffer,
+                                           index * self.RECORD.size)
+                   for index in indexes]
+        output = []
+        for timestamp, operation, addr, register, length, value in raw:
+            if operation < len(self._operations):
+                operation = self._operations[operation]
+            if register == self.NO_REGISTER:
+                register = None
+            output.append((timestamp, operation, addr, register, length,
+                           value))
+        return output
+
+    def clear(self):
+        with self._lock:
+            self._index = 0
+            self._count = 0
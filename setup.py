@@ -22,6 +22,10 @@ setup(
         'Programming Language :: Python',
     ],
     zip_safe=False,
+    extras_require={
+        # vectorised batch conversions of raw samples
+        'numpy': ['numpy'],
+    },
     entry_points={
         'console_scripts': [
             'rp_manager = robophery.cli:manager_service',
@@ -0,0 +1,248 @@
+import unittest
+from concurrent import futures
+
+from robophery.base import MetricAggregator, ModuleManager
+from tests.fakes import FakeModuleManager, StopLoop, VirtualClockManager
+
+
+def run_loop(manager):
+    try:
+        manager._single_loop()
+    except StopLoop:
+        pass
+
+
+class MetricAggregatorTests(unittest.TestCase):
+
+    def test_aggregation(self):
+        aggregator = MetricAggregator()
+        aggregator.add_data([
+            ('sensor', 'temperature', 20.0, 0.1),
+            ('sensor', 'temperature', 22.0, 0.3),
+            ('sensor', 'temperature', 21.0),
+            ('sensor', 'temperature', None),
+        ])
+        self.assertEqual(aggregator.flush(), {
+            'sensor.temperature': {
+                'min_value': 20.0,
+                'max_value': 22.0,
+                'avg_value': 21.0,
+                'read_time': 0.2,
+                'error_rate': 0.25,
+            },
+        })
+
+    def test_metrics_are_separate(self):
+        aggregator = MetricAggregator()
+        aggregator.add_data([
+            ('first', 'value', 1),
+            ('second', 'value', 2),
+            ('first', 'other', 3),
+        ])
+        data = aggregator.flush()
+        self.assertEqual(sorted(data), ['first.other', 'first.value',
+                                        'second.value'])
+        self.assertEqual(data['second.value']['avg_value'], 2.0)
+
+    def test_only_errors(self):
+        aggregator = MetricAggregator()
+        aggregator.add_data([('sensor', 'value', None)])
+        self.assertEqual(aggregator.flush(),
+                         {'sensor.value': {'error_rate': 1.0}})
+
+    def test_flush_starts_new_aggregation(self):
+        aggregator = MetricAggregator()
+        aggregator.add_data([('sensor', 'value', 1)])
+        aggregator.flush()
+        self.assertEqual(aggregator.flush(), {})
+        aggregator.add_data([('sensor', 'value', 5)])
+        self.assertEqual(aggregator.flush()['sensor.value']['min_value'], 5)
+
+
+class NextDeadlineTests(unittest.TestCase):
+
+    def next_deadline(self, deadline, interval, time_now, policy):
+        # the deadline computation does not need configured manager
+        manager = ModuleManager.__new__(ModuleManager)
+        manager._overrun_policy = policy
+        return manager._next_deadline(deadline, interval, time_now)
+
+    def test_on_time(self):
+        for policy in (ModuleManager.SKIP_OVERRUN_POLICY,
+                       ModuleManager.CATCH_UP_OVERRUN_POLICY,
+                       ModuleManager.COALESCE_OVERRUN_POLICY):
+            self.assertEqual(self.next_deadline(10.0, 2.0, 11.5, policy),
+                             (12.0, 0))
+            self.assertEqual(self.next_deadline(10.0, 2.0, 12.0, policy),
+                             (12.0, 0))
+
+    def test_skip(self):
+        self.assertEqual(self.next_deadline(
+            10.0, 2.0, 15.0, ModuleManager.SKIP_OVERRUN_POLICY), (16.0, 2))
+
+    def test_catch_up(self):
+        self.assertEqual(self.next_deadline(
+            10.0, 2.0, 15.0, ModuleManager.CATCH_UP_OVERRUN_POLICY),
+            (12.0, 1))
+
+    def test_coalesce(self):
+        self.assertEqual(self.next_deadline(
+            10.0, 2.0, 15.0, ModuleManager.COALESCE_OVERRUN_POLICY),
+            (14.0, 2))
+
+    def test_explicit_policy(self):
+        manager = ModuleManager.__new__(ModuleManager)
+        manager._overrun_policy = ModuleManager.CATCH_UP_OVERRUN_POLICY
+        self.assertEqual(manager._next_deadline(
+            10.0, 2.0, 15.0, ModuleManager.SKIP_OVERRUN_POLICY), (16.0, 2))
+
+
+class SingleLoopTests(unittest.TestCase):
+
+    def read_times(self, manager, module_name):
+        return [start for start, stop in manager._module[module_name].reads]
+
+    def test_no_drift(self):
+        manager = VirtualClockManager(
+            {'sensor': {'read_interval': 1000, 'delay': 0.3}}, 5.5,
+            read_interval=1000, publish_interval=5000)
+        run_loop(manager)
+        # reads start on absolute deadlines, the read time does not add up
+        self.assertEqual(self.read_times(manager, 'sensor'),
+                         [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+
+    def overrun(self, policy):
+        manager = VirtualClockManager(
+            {'slow': {'read_interval': 1000, 'delay': 2.5}}, 9.9,
+            read_interval=1000, publish_interval=5000, overrun_policy=policy)
+        run_loop(manager)
+        missed_ticks = manager.get_sent_data()[0]['slow.missed_ticks']
+        return self.read_times(manager, 'slow'), missed_ticks['avg_value']
+
+    def test_skip_overrun(self):
+        self.assertEqual(self.overrun(ModuleManager.SKIP_OVERRUN_POLICY),
+                         ([0.0, 3.0, 6.0], 4))
+
+    def test_catch_up_overrun(self):
+        self.assertEqual(self.overrun(ModuleManager.CATCH_UP_OVERRUN_POLICY),
+                         ([0.0, 2.5, 5.0], 2))
+
+    def test_coalesce_overrun(self):
+        self.assertEqual(self.overrun(ModuleManager.COALESCE_OVERRUN_POLICY),
+                         ([0.0, 2.5, 5.0], 5))
+
+    def test_missed_ticks_are_reset(self):
+        manager = VirtualClockManager(
+            {'sensor': {'read_interval': 1000}}, 10.5,
+            read_interval=1000, publish_interval=5000)
+        manager._miss_ticks('sensor', 3)
+        run_loop(manager)
+        self.assertEqual([data['sensor.missed_ticks']['avg_value']
+                          for data in manager.get_sent_data()], [3, 0])
+
+    def test_module_read_intervals(self):
+        manager = VirtualClockManager(
+            {'fast': {'read_interval': 1000}, 'slow': {'read_interval': 3000}},
+            6.5, read_interval=1000, publish_interval=5000)
+        run_loop(manager)
+        # every module is read at its own interval, not the shortest one
+        self.assertEqual(self.read_times(manager, 'fast'),
+                         [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(self.read_times(manager, 'slow'), [0.0, 3.0, 6.0])
+
+    def test_default_read_interval(self):
+        manager = VirtualClockManager(
+            {'sensor': {}}, 6.5, read_interval=2000, publish_interval=8000)
+        run_loop(manager)
+        self.assertEqual(self.read_times(manager, 'sensor'),
+                         [0.0, 2.0, 4.0, 6.0])
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValueError, VirtualClockManager, {}, 0,
+                          overrun_policy='unknown')
+
+
+class SplitPhaseReadTests(unittest.TestCase):
+
+    def setUp(self):
+        split = 'tests.fakes.FakeSplitModule'
+        self.manager = VirtualClockManager({
+            'slow': {'class': split, 'conversion': 0.5},
+            'blocking': {'delay': 0.1},
+            'quick': {'class': split, 'conversion': 0.2},
+        }, 10.0)
+
+    def module(self, module_name):
+        return self.manager._module[module_name]
+
+    def test_read_order(self):
+        data = self.manager._read_modules(['slow', 'blocking', 'quick'])
+        # conversions run while the blocking module is read
+        self.assertEqual(self.module('slow').starts, [0.0])
+        self.assertEqual(self.module('quick').starts, [0.0])
+        self.assertEqual(self.module('blocking').reads, [(0.0, 0.1)])
+        # results are collected in the order they become ready
+        self.assertEqual([datum[0] for datum in data],
+                         ['blocking', 'quick', 'slow'])
+        self.assertEqual(self.module('quick').reads, [(0.2, 0.2)])
+        self.assertEqual(self.module('slow').reads, [(0.5, 0.5)])
+
+    def test_ready_results_do_not_wait(self):
+        self.module('blocking')._delay = 0.3
+        self.manager._read_modules(['blocking', 'quick'])
+        self.assertEqual(self.module('quick').reads, [(0.3, 0.3)])
+        self.assertEqual(self.manager.clock, 0.3)
+
+
+class ParallelReadTests(unittest.TestCase):
+
+    def setUp(self):
+        interface = {'class': 'tests.fakes.FakeInterface'}
+        self.manager = FakeModuleManager(
+            {
+                'a1': {'interface': 'a', 'delay': 0.1},
+                'a2': {'interface': 'a_child', 'delay': 0.1},
+                'b1': {'interface': 'b', 'delay': 0.1},
+            },
+            interfaces={
+                'a': dict(interface),
+                'a_child': {'class': 'tests.fakes.FakeChildInterface',
+                            'parent': {'interface': 'a'}},
+                'b': dict(interface),
+            },
+            run_mode=ModuleManager.PARALLEL_RUN_MODE)
+
+    def reads(self, module_name):
+        return self.manager._module[module_name].reads
+
+    def test_group_modules(self):
+        groups = self.manager._group_modules(['a1', 'b1', 'a2'])
+        # the child interface shares the bus of its parent
+        self.assertEqual(sorted(groups), [['a1', 'a2'], ['b1']])
+        self.assertIs(self.manager._interface['a_child']._bus_interface(),
+                      self.manager._interface['a'])
+
+    def test_parallel_read(self):
+        self.manager._executor = futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.manager._executor.shutdown)
+        self.manager._read_data()
+        (a1_start, a1_stop), = self.reads('a1')
+        (a2_start, a2_stop), = self.reads('a2')
+        (b1_start, b1_stop), = self.reads('b1')
+        # modules on the same bus are read one after another
+        self.assertTrue(a1_stop <= a2_start or a2_stop <= a1_start)
+        # modules on different buses are read concurrently
+        self.assertLess(b1_start, min(a1_stop, a2_stop))
+        self.assertEqual(len(self.manager._aggregator.flush()), 3)
+
+    def test_child_module_holds_parent_lock(self):
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with self.manager._interface['a']._lock:
+            future = executor.submit(self.manager._read_module, 'a2')
+            self.assertRaises(futures.TimeoutError, future.result, 0.2)
+        self.assertEqual(len(future.result(1)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
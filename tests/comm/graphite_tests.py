@@ -0,0 +1,85 @@
+import pickle
+import socket
+import struct
+import unittest
+
+from robophery.comm.linux.graphite import LinuxGraphiteCarbonComm
+from tests.fakes import FakeManager
+
+
+class GraphiteCarbonTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(2)
+        self.server.settimeout(5)
+        self.addCleanup(self.server.close)
+
+    def get_comm(self, protocol):
+        comm = LinuxGraphiteCarbonComm(
+            name='carbon', manager=FakeManager(), prefix='node',
+            host='127.0.0.1', port=self.server.getsockname()[1],
+            protocol=protocol, **{'class': 'tests.LinuxGraphiteCarbonComm'})
+        self.addCleanup(comm._disconnect)
+        return comm
+
+    def accept(self):
+        connection = self.server.accept()[0]
+        connection.settimeout(5)
+        self.addCleanup(connection.close)
+        return connection
+
+    def receive(self, connection, length):
+        data = b''
+        while len(data) < length:
+            chunk = connection.recv(length - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def receive_pickle(self, connection):
+        length, = struct.unpack('!L', self.receive(connection, 4))
+        return pickle.loads(self.receive(connection, length))
+
+    def test_pickle_framing(self):
+        comm = self.get_comm(LinuxGraphiteCarbonComm.PICKLE_PROTOCOL)
+        comm._send_data({'sensor.value': {'avg_value': 21.5}}, 1000.7)
+        comm._send_data({'sensor.value': {'min_value': 20,
+                                          'max_value': 23}}, 1010)
+        connection = self.accept()
+        self.assertEqual(self.receive_pickle(connection),
+                         [('node.sensor.value.avg_value', (1000, 21.5))])
+        self.assertEqual(sorted(self.receive_pickle(connection)), [
+            ('node.sensor.value.max_value', (1010, 23)),
+            ('node.sensor.value.min_value', (1010, 20)),
+        ])
+
+    def test_plaintext(self):
+        comm = self.get_comm(LinuxGraphiteCarbonComm.PLAINTEXT_PROTOCOL)
+        comm._send_data({'sensor.value': {'avg_value': 21.5}}, 1000)
+        message = b'node.sensor.value.avg_value 21.5 1000\n'
+        self.assertEqual(self.receive(self.accept(), len(message)), message)
+
+    def test_reconnect(self):
+        comm = self.get_comm(LinuxGraphiteCarbonComm.PICKLE_PROTOCOL)
+        comm._send_data({'sensor.value': {'avg_value': 1}}, 1000)
+        connection = self.accept()
+        self.receive_pickle(connection)
+        connection.close()
+        comm._send_data({'sensor.value': {'avg_value': 2}}, 1010)
+        self.assertEqual(self.receive_pickle(self.accept()),
+                         [('node.sensor.value.avg_value', (1010, 2))])
+
+    def test_empty_data(self):
+        comm = self.get_comm(LinuxGraphiteCarbonComm.PICKLE_PROTOCOL)
+        comm._send_data({}, 1000)
+        self.assertIsNone(comm._socket)
+
+    def test_unknown_protocol(self):
+        self.assertRaises(ValueError, self.get_comm, 'json')
+
+
+if __name__ == "__main__":
+    unittest.main()
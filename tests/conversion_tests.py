@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from robophery.module.ble import pfp
+from robophery.module.i2c import bmp085, htu21d, mpu6050
+
+
+def scalar(module):
+    return mock.patch.object(module, 'HAVE_NUMPY', False)
+
+
+def get_bmp085():
+    # calibration coefficients of the datasheet example
+    sensor = bmp085.Bmp085Module.__new__(bmp085.Bmp085Module)
+    sensor.cal_AC1, sensor.cal_AC2, sensor.cal_AC3 = 408, -72, -14383
+    sensor.cal_AC4, sensor.cal_AC5, sensor.cal_AC6 = 32741, 32757, 23153
+    sensor.cal_B1, sensor.cal_B2 = 6190, 4
+    sensor.cal_MB, sensor.cal_MC, sensor.cal_MD = -32768, -8711, 2868
+    sensor._mode = 0
+    return sensor
+
+
+class ScalarConversionTests(unittest.TestCase):
+
+    def test_bmp085_datasheet_example(self):
+        sensor = get_bmp085()
+        with scalar(bmp085):
+            self.assertEqual(sensor.compensate_temperatures([27898]), [15.0])
+            self.assertEqual(sensor.compensate_pressures([27898], [23843]),
+                             [69964])
+
+
+@unittest.skipUnless(pfp.HAVE_NUMPY, "numpy is not available")
+class BatchConversionTests(unittest.TestCase):
+    """
+    Vectorised conversions give the same values as the scalar ones.
+    """
+
+    def assert_equivalent(self, module, convert, *raw_values):
+        with scalar(module):
+            expected = convert(*raw_values)
+        result = convert(*raw_values)
+        self.assertEqual(len(result), len(expected))
+        for value, expected_value in zip(result, expected):
+            self.assertAlmostEqual(float(value), expected_value, places=9)
+
+    def test_pfp(self):
+        sensor = pfp.ParrotFlowerPowerModule.__new__(
+            pfp.ParrotFlowerPowerModule)
+        raw_values = [0, 1, 250, 480, 800, 1200, 2047]
+        for convert in (sensor.convert_luminosities,
+                        sensor.convert_temperatures,
+                        sensor.convert_soil_moistures):
+            self.assert_equivalent(pfp, convert, raw_values)
+
+    def test_htu21d(self):
+        sensor = htu21d.Htu21dModule.__new__(htu21d.Htu21dModule)
+        raw_values = [0, 0x6CE3, 0x7C80, 0xFFFF]
+        self.assert_equivalent(htu21d, sensor.convert_temperatures,
+                               raw_values)
+        self.assert_equivalent(htu21d, sensor.convert_humidities, raw_values)
+
+    def test_bmp085(self):
+        sensor = get_bmp085()
+        UT = [27898, 25000, 30000, 32767]
+        UP = [23843, 20000, 30000, 40000]
+        self.assert_equivalent(bmp085, sensor.compensate_temperatures, UT)
+        self.assert_equivalent(bmp085, sensor.compensate_pressures, UT, UP)
+
+    def test_mpu6050(self):
+        sensor = mpu6050.Mpu6050Module.__new__(mpu6050.Mpu6050Module)
+        sensor._accel_range = mpu6050.Mpu6050Module.ACCEL_RANGE_4G
+        sensor._gyro_range = mpu6050.Mpu6050Module.GYRO_RANGE_500DEG
+        raw = (8192, -4096, 0, 655, -131, 32767)
+        accel, gyro = sensor.convert_samples(raw)
+        with scalar(mpu6050):
+            expected_accel, expected_gyro = sensor.convert_samples(raw)
+        for values, expected in ((accel, expected_accel),
+                                 (gyro, expected_gyro)):
+            for value, expected_value in zip(values[0], expected[0]):
+                self.assertAlmostEqual(float(value), expected_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
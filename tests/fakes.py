@@ -0,0 +1,241 @@
+"""
+Emulated manager and buses for running modules without hardware
+"""
+
+import logging
+
+from robophery.base import Comm, Interface, Module, ModuleManager
+from robophery.interface.i2c import I2cInterface
+
+
+class FakeManager(object):
+
+    _name = 'manager'
+
+    def _get_logger(self, name):
+        return logging.getLogger(name)
+
+
+class StopLoop(Exception):
+    pass
+
+
+class FakeModuleManager(ModuleManager):
+    """
+    Manager with its own registries, configured with fake comm channel and
+    interface by default.
+    """
+
+    def __init__(self, modules, interfaces=None, **kwargs):
+        self._comm = {}
+        self._interface = {}
+        self._module = {}
+        if interfaces is None:
+            interfaces = {'bus': {'class': 'tests.fakes.FakeInterface'}}
+        for module in modules.values():
+            module.setdefault('class', 'tests.fakes.FakeModule')
+            module.setdefault('interface', 'bus')
+        kwargs.setdefault('platform', self.LINUX_PLATFORM)
+        kwargs['config'] = {
+            'comm': {'comm': {'class': 'tests.fakes.FakeComm'}},
+            'interface': interfaces,
+            'module': modules,
+        }
+        super(FakeModuleManager, self).__init__(**kwargs)
+
+    def get_sent_data(self):
+        return self._comm['comm'].sent
+
+
+class VirtualClockManager(FakeModuleManager):
+    """
+    Manager running on virtual clock, sleeping only moves the clock. The
+    service loop is stopped by StopLoop exception at the stop time.
+    """
+
+    def __init__(self, modules, stop_time, **kwargs):
+        self.clock = 0.0
+        self.stop_time = stop_time
+        super(VirtualClockManager, self).__init__(modules, **kwargs)
+
+    def _get_monotonic_time(self):
+        return self.clock
+
+    def _sleep(self, seconds):
+        self.clock += seconds
+        if self.clock > self.stop_time:
+            raise StopLoop()
+
+
+class FakeComm(Comm):
+
+    def __init__(self, *args, **kwargs):
+        self.sent = []
+        super(FakeComm, self).__init__(*args, **kwargs)
+
+    def _send_data(self, data, timestamp):
+        self.sent.append(data)
+
+
+class FakeInterface(Interface):
+    pass
+
+
+class FakeChildInterface(Interface):
+    """
+    Interface connected through parent interface, sharing its bus.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._parent_interface = kwargs['parent']['interface']
+        super(FakeChildInterface, self).__init__(*args, **kwargs)
+
+
+class FakeModule(Module):
+    """
+    Module whose reading takes delay seconds of the manager clock. Start
+    and stop time of every read is recorded.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._delay = kwargs.get('delay', 0)
+        self.reads = []
+        super(FakeModule, self).__init__(*args, **kwargs)
+
+    def read_data(self):
+        start = self._manager._get_monotonic_time()
+        if self._delay:
+            self._manager._sleep(self._delay)
+        self.reads.append((start, self._manager._get_monotonic_time()))
+        return [(self._name, 'value', len(self.reads), self._delay)]
+
+    def meta_data(self):
+        return {
+            'value': {
+                'type': 'gauge',
+                'unit': 'times',
+                'range_low': 0,
+                'range_high': None,
+                'sensor': self.DEVICE_NAME
+            },
+        }
+
+
+class FakeSplitModule(FakeModule):
+    """
+    Split-phase module whose conversion takes conversion seconds. Start time
+    of every measurement is recorded, collecting reads the module.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._conversion = kwargs.get('conversion', 0)
+        self.starts = []
+        super(FakeSplitModule, self).__init__(*args, **kwargs)
+
+    def start_measurement(self):
+        self.starts.append(self._manager._get_monotonic_time())
+        return self._conversion
+
+    def collect_measurement(self):
+        return self.read_data()
+
+
+class FakeI2cInterface(I2cInterface):
+    """
+    I2C bus with byte register map per address, all transactions are
+    recorded in the log.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._busnum = 0
+        self.registers = {}
+        self.log = []
+        kwargs.setdefault('name', 'i2c')
+        kwargs.setdefault('class', 'tests.fakes.FakeI2cInterface')
+        kwargs.setdefault('manager', FakeManager())
+        super(FakeI2cInterface, self).__init__(*args, **kwargs)
+
+    def set_registers(self, addr, register, data):
+        for offset, value in enumerate(data):
+            self.registers.setdefault(addr, {})[register + offset] = value
+
+    def _get_register(self, addr, register):
+        return self.registers.get(addr, {}).get(register, 0)
+
+    def writeRaw8(self, addr, value):
+        self.log.append(('writeRaw8', addr, value))
+
+    def write8(self, addr, register, value):
+        self.log.append(('write8', addr, register, value))
+        self.set_registers(addr, register, [value & 0xFF])
+
+    def write16(self, addr, register, value):
+        self.log.append(('write16', addr, register, value))
+        self.set_registers(addr, register, [value & 0xFF, value >> 8])
+
+    def writeList(self, addr, register, data):
+        self.log.append(('writeList', addr, register, list(data)))
+        self.set_registers(addr, register, data)
+
+    def readRaw8(self, addr):
+        self.log.append(('readRaw8', addr))
+        return 0
+
+    def readU8(self, addr, register):
+        self.log.append(('readU8', addr, register))
+        return self._get_register(addr, register)
+
+    def readS8(self, addr, register):
+        value = self.readU8(addr, register)
+        return value - 256 if value > 127 else value
+
+    def readU16(self, addr, register, little_endian=True):
+        self.log.append(('readU16', addr, register))
+        low = self._get_register(addr, register)
+        high = self._get_register(addr, register + 1)
+        if not little_endian:
+            low, high = high, low
+        return (high << 8) | low
+
+    def readS16(self, addr, register, little_endian=True):
+        value = self.readU16(addr, register, little_endian)
+        return value - 65536 if value > 32767 else value
+
+    def readList(self, addr, register, length):
+        self.log.append(('readList', addr, register, length))
+        return [self._get_register(addr, register + offset)
+                for offset in range(length)]
+
+
+class FakeI2cDevice(object):
+    """
+    Emulated /dev/i2c-N I2C_RDWR ioctl. The first byte of every write
+    message sets the register pointer of the address, read messages read
+    from the pointer. Every ioctl call is recorded as list of (addr, flags,
+    data or length) messages.
+    """
+
+    def __init__(self):
+        self.registers = {}
+        self.pointers = {}
+        self.calls = []
+
+    def ioctl(self, fd, request, data):
+        messages = []
+        for i in range(data.nmsgs):
+            message = data.msgs[i]
+            if message.flags & 0x0001:
+                pointer = self.pointers.get(message.addr, 0)
+                registers = self.registers.get(message.addr, {})
+                for offset in range(message.len):
+                    message.buf[offset] = registers.get(pointer + offset, 0)
+                messages.append((message.addr, message.flags, message.len))
+            else:
+                values = [message.buf[offset]
+                          for offset in range(message.len)]
+                self.pointers[message.addr] = values[0]
+                for offset, value in enumerate(values[1:]):
+                    self.registers.setdefault(message.addr, {})[
+                        values[0] + offset] = value
+                messages.append((message.addr, message.flags, values))
+        self.calls.append(messages)
@@ -0,0 +1,89 @@
+import unittest
+
+from robophery.interface.gpio import GpioInterface
+from tests.fakes import FakeManager
+
+
+class CallbackGpioInterface(GpioInterface):
+    """
+    GPIO bus calling edge detection callbacks on demand.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.values = {}
+        self.callbacks = {}
+        kwargs.setdefault('name', 'gpio')
+        kwargs.setdefault('class', 'tests.CallbackGpioInterface')
+        kwargs.setdefault('manager', FakeManager())
+        super(CallbackGpioInterface, self).__init__(*args, **kwargs)
+
+    def input(self, pin):
+        return self.values.get(pin, False)
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=-1):
+        self.callbacks[pin] = callback
+
+    def remove_event_detect(self, pin):
+        self.callbacks.pop(pin, None)
+
+
+class EdgeGpioInterface(CallbackGpioInterface):
+    """
+    GPIO bus reporting the edge to callbacks.
+    """
+
+    def _get_callback_edge(self, pin, edge, args):
+        return args[1]
+
+
+class EventQueueTests(unittest.TestCase):
+
+    def test_edge_of_single_edge_detection(self):
+        gpio = CallbackGpioInterface()
+        gpio.add_event_queue(4, GpioInterface.GPIO_EVENT_FALLING)
+        gpio.values[4] = True
+        gpio.callbacks[4](4)
+        self.assertEqual(gpio.read_events(4)[0][1],
+                         GpioInterface.GPIO_EVENT_FALLING)
+
+    def test_edge_taken_from_pin_value(self):
+        gpio = CallbackGpioInterface()
+        gpio.add_event_queue(4, GpioInterface.GPIO_EVENT_BOTH)
+        for value in (True, False):
+            gpio.values[4] = value
+            gpio.callbacks[4](4)
+        self.assertEqual([event[1] for event in gpio.read_events(4)], [
+            GpioInterface.GPIO_EVENT_RISING,
+            GpioInterface.GPIO_EVENT_FALLING,
+        ])
+
+    def test_reported_edge(self):
+        gpio = EdgeGpioInterface()
+        gpio.add_event_queue(4, GpioInterface.GPIO_EVENT_BOTH)
+        # the pin value has changed again before the callback runs
+        gpio.values[4] = True
+        gpio.callbacks[4](4, GpioInterface.GPIO_EVENT_FALLING)
+        self.assertEqual(gpio.read_events(4)[0][1],
+                         GpioInterface.GPIO_EVENT_FALLING)
+
+    def test_callback_without_arguments(self):
+        gpio = CallbackGpioInterface()
+        gpio.add_event_queue(4, GpioInterface.GPIO_EVENT_RISING)
+        gpio.callbacks[4]()
+        self.assertEqual(len(gpio.read_events(4)), 1)
+
+    def test_full_queue(self):
+        gpio = CallbackGpioInterface()
+        gpio.add_event_queue(4, GpioInterface.GPIO_EVENT_RISING, size=2)
+        for i in range(5):
+            gpio.callbacks[4](4)
+        events = gpio.read_events(4)
+        self.assertEqual(len(events), 2)
+        self.assertEqual(gpio.events_dropped(4), 3)
+        self.assertLessEqual(events[0][2], events[1][2])
+        gpio.remove_event_queue(4)
+        self.assertEqual(gpio.read_events(4), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
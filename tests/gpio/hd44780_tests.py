@@ -0,0 +1,108 @@
+import unittest
+
+from robophery.interface.gpio import GpioInterface
+from robophery.module.gpio.hd44780 import Hd44780Module
+from tests.fakes import FakeManager
+
+
+class DisplayGpioInterface(GpioInterface):
+    """
+    Pins connected to emulated display in 4-bit mode, data are latched on
+    falling edge of the enable pin.
+    """
+    NUM_GPIO = 8
+    OUTPUT_STEP_TIME = 22
+
+    def __init__(self, *args, **kwargs):
+        self.values = {}
+        self.nibble = None
+        self.address = 0
+        self.ram = {}
+        self.sequences = 0
+        super(DisplayGpioInterface, self).__init__(*args, **kwargs)
+
+    def setup_pin(self, pin, mode, pull_up_down=None):
+        self.values[pin] = 0
+
+    def output(self, pin, value):
+        if pin == 2 and self.values.get(2) and not value:
+            self._latch()
+        self.values[pin] = int(value)
+
+    def output_pins_sequence(self, steps):
+        self.sequences += 1
+        super(DisplayGpioInterface, self).output_pins_sequence(steps)
+
+    def _latch(self):
+        nibble = sum(self.values.get(4 + i, 0) << i for i in range(4))
+        if self.nibble is None:
+            self.nibble = nibble
+            return
+        value = self.nibble << 4 | nibble
+        self.nibble = None
+        if self.values.get(0):
+            self.ram[self.address] = value
+            self.address += 1
+        elif value & 0x80:
+            self.address = value & 0x7F
+
+    def screen(self, rows, cols):
+        offsets = [0x00, 0x40, cols, 0x40 + cols]
+        return [''.join(chr(self.ram.get(offsets[row] + col, 0x20))
+                        for col in range(cols)) for row in range(rows)]
+
+
+class Hd44780Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.gpio = DisplayGpioInterface(name='gpio', manager=FakeManager(),
+                                         **{'class': 'tests.gpio'})
+        self.lcd = Hd44780Module(
+            name='lcd', manager=FakeManager(), interface=self.gpio, rs_pin=0,
+            rw_pin=1, en_pin=2, bl_pin=3, d4_pin=4, d5_pin=5, d6_pin=6,
+            d7_pin=7, cols=16, rows=2, **{'class': 'tests.hd44780'})
+
+    def test_dirty_runs(self):
+        blank = [0x20] * 16
+        self.assertEqual(self.lcd._get_dirty_runs(blank, list(blank)), [])
+        line = list(blank)
+        line[3] = line[15] = 0x41
+        self.assertEqual(self.lcd._get_dirty_runs(blank, line),
+                         [[3, 4], [15, 16]])
+
+    def test_dirty_runs_merge_gap(self):
+        blank = [0x20] * 16
+        line = list(blank)
+        # single unchanged character is rewritten, two are skipped
+        line[0] = line[2] = line[5] = 0x41
+        self.assertEqual(self.lcd._get_dirty_runs(blank, line),
+                         [[0, 3], [5, 6]])
+
+    def test_write_frame(self):
+        self.lcd.write_frame(['Temperature', '21.5 C'])
+        self.assertEqual(self.gpio.screen(2, 16),
+                         ['Temperature     ', '21.5 C          '])
+        self.assertEqual(self.lcd.cursor_pos, (1, 6))
+
+    def test_write_frame_sends_changes(self):
+        self.lcd.write_frame('Temperature\n21.5 C')
+        self.gpio.ram.clear()
+        self.gpio.sequences = 0
+        self.lcd.write_frame('Temperature\n21.7 C')
+        # only the changed character is sent, in single sequence
+        self.assertEqual(self.gpio.ram, {0x43: ord('7')})
+        self.assertEqual(self.gpio.sequences, 1)
+        self.gpio.sequences = 0
+        self.lcd.write_frame('Temperature\n21.7 C')
+        self.assertEqual(self.gpio.sequences, 0)
+
+    def test_write_frame_unbatched(self):
+        self.gpio.OUTPUT_STEP_TIME = 0
+        self.gpio.sequences = 0
+        self.lcd.write_frame(['Hello'])
+        self.assertEqual(self.gpio.sequences, 0)
+        self.assertEqual(self.gpio.screen(1, 16), ['Hello           '])
+
+
+if __name__ == "__main__":
+    unittest.main()
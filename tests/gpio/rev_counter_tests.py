@@ -0,0 +1,91 @@
+import time
+import unittest
+
+from robophery.interface.gpio import GpioInterface
+from robophery.module.gpio.rev_counter import RevCounterModule
+from tests.fakes import FakeManager
+
+
+class EventGpioInterface(GpioInterface):
+    """
+    Edge events are pushed to the queues by the tests.
+    """
+    NUM_GPIO = 8
+    EVENT_QUEUE_SIZE = 16
+
+    def setup_pin(self, pin, mode, pull_up_down=None):
+        pass
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=-1):
+        pass
+
+
+class RevCounterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.gpio = EventGpioInterface(name='gpio', manager=FakeManager(),
+                                       **{'class': 'tests.gpio'})
+        self.counter = RevCounterModule(
+            name='counter', manager=FakeManager(), interface=self.gpio,
+            data_pin=2, pulses_per_revolution=2, frequency_window=1,
+            edge_buffer_size=8, **{'class': 'tests.rev_counter'})
+
+    def push_edges(self, start, period, count):
+        for i in range(count):
+            self.gpio._push_event(2, self.gpio.GPIO_EVENT_RISING,
+                                  start + i * period)
+
+    def read_data(self):
+        return dict((datum[1], datum[2]) for datum in
+                    self.counter.read_data())
+
+    def test_no_edges(self):
+        data = self.read_data()
+        self.assertEqual(data['revolutions'], 0)
+        self.assertEqual(data['frequency'], 0.0)
+        self.assertEqual(data['instant_frequency'], 0.0)
+        self.assertNotIn('period_avg', data)
+
+    def test_frequency(self):
+        self.push_edges(time.monotonic() - 0.1, 0.01, 10)
+        data = self.read_data()
+        self.assertEqual(data['revolutions'], 5)
+        self.assertAlmostEqual(data['frequency'], 100.0, places=3)
+        self.assertAlmostEqual(data['rpm'], 3000.0, places=1)
+        self.assertAlmostEqual(data['period_min'], 0.01, places=6)
+        self.assertAlmostEqual(data['period_max'], 0.01, places=6)
+        self.assertAlmostEqual(data['period_avg'], 0.01, places=6)
+
+    def test_ring_wraps(self):
+        # more edges than the ring holds, only the newest are kept
+        self.push_edges(time.monotonic() - 0.2, 0.02, 10)
+        self.read_data()
+        self.assertEqual(self.counter._edge_count, 8)
+        self.assertEqual(self.counter._window_count, 8)
+        self.assertEqual(self.counter._edge_index, 2)
+        self.assertAlmostEqual(self.counter._get_frequency(), 50.0, places=3)
+
+    def test_window_trims_old_edges(self):
+        now = time.monotonic()
+        self.push_edges(now - 5.0, 0.1, 3)
+        self.push_edges(now - 0.5, 0.1, 3)
+        data = self.read_data()
+        self.assertEqual(self.counter._window_count, 3)
+        self.assertAlmostEqual(data['frequency'], 10.0, places=3)
+        self.assertEqual(data['revolutions'], 3)
+
+    def test_dropped_events(self):
+        now = time.monotonic()
+        self.push_edges(now - 2.0, 0.01, 4)
+        self.read_data()
+        # queue overflow, the oldest events are lost
+        self.push_edges(now - 0.5, 0.01, 20)
+        data = self.read_data()
+        self.assertEqual(data['revolutions'], 12)
+        # period across the lost edges is not measured
+        self.assertAlmostEqual(data['period_max'], 0.01, places=6)
+        self.assertEqual(self.counter._edge_count, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
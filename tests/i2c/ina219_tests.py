@@ -0,0 +1,66 @@
+import unittest
+
+from robophery.module.i2c.ina219 import Ina219Module
+from tests.fakes import FakeI2cInterface, FakeManager
+
+
+class FailingI2cInterface(FakeI2cInterface):
+
+    def __init__(self, *args, **kwargs):
+        self.failures = 0
+        super(FailingI2cInterface, self).__init__(*args, **kwargs)
+
+    def readList(self, addr, register, length):
+        if self.failures:
+            self.failures -= 1
+            raise IOError('Remote I/O error')
+        return super(FailingI2cInterface, self).readList(
+            addr, register, length)
+
+
+class Ina219Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FailingI2cInterface()
+        self.sensor = Ina219Module(name='power', manager=FakeManager(),
+                                   interface=self.bus,
+                                   **{'class': 'tests.Ina219Module'})
+        self.addr = self.sensor._addr
+        self.bus.set_registers(self.addr, Ina219Module.INA219_REG_CURRENT,
+                               [0x00, 0x64])
+        self.bus.log = []
+
+    def calibration_reads(self):
+        return len([entry for entry in self.bus.log
+                    if entry[0] == 'readList' and
+                    entry[2] == Ina219Module.INA219_REG_CALIBRATION])
+
+    def test_calibration_check_interval(self):
+        for i in range(Ina219Module.CALIBRATION_CHECK_INTERVAL):
+            data = self.sensor.read_data()
+        self.assertEqual(data[1][2], 10)
+        self.assertEqual(self.calibration_reads(), 0)
+        self.sensor.read_data()
+        self.assertEqual(self.calibration_reads(), 1)
+        self.sensor.read_data()
+        self.assertEqual(self.calibration_reads(), 1)
+
+    def test_lost_calibration(self):
+        self.sensor._calibration_reads = \
+            Ina219Module.CALIBRATION_CHECK_INTERVAL
+        self.bus.set_registers(self.addr, Ina219Module.INA219_REG_CALIBRATION,
+                               [0x00, 0x00])
+        self.sensor.read_data()
+        self.assertIn(('writeList', self.addr,
+                       Ina219Module.INA219_REG_CALIBRATION, [0x10, 0x00]),
+                      self.bus.log)
+
+    def test_check_after_failure(self):
+        self.bus.failures = 1
+        self.assertRaises(IOError, self.sensor.read_data)
+        self.sensor.read_data()
+        self.assertEqual(self.calibration_reads(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
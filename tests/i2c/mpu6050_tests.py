@@ -0,0 +1,145 @@
+import struct
+import unittest
+
+from robophery.module.i2c.mpu6050 import Mpu6050Module
+from tests.fakes import FakeI2cInterface, FakeManager
+
+
+class FifoI2cInterface(FakeI2cInterface):
+    """
+    I2C bus with MPU6050 FIFO, reads of the FIFO data register consume
+    the queued bytes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.fifo = bytearray()
+        super(FifoI2cInterface, self).__init__(*args, **kwargs)
+
+    def push_frames(self, frames):
+        for frame in frames:
+            self.fifo.extend(struct.pack('>6h', *frame))
+        self.set_registers(0x68, Mpu6050Module.FIFO_COUNTH,
+                           [len(self.fifo) >> 8, len(self.fifo) & 0xFF])
+
+    def readList(self, addr, register, length):
+        if register != Mpu6050Module.FIFO_R_W:
+            return super(FifoI2cInterface, self).readList(
+                addr, register, length)
+        self.log.append(('readList', addr, register, length))
+        data, self.fifo = self.fifo[:length], self.fifo[length:]
+        self.push_frames([])
+        return list(data)
+
+
+def get_module(bus, **kwargs):
+    return Mpu6050Module(name='imu', manager=FakeManager(), interface=bus,
+                         **dict(kwargs, **{'class': 'tests.Mpu6050Module'}))
+
+
+class Mpu6050Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FakeI2cInterface()
+        self.imu = get_module(self.bus)
+        self.bus.set_registers(0x68, Mpu6050Module.ACCEL_XOUT0, bytearray(
+            struct.pack('>7h', 16384, -8192, 0, 340, 131, -262, 0)))
+        self.bus.log = []
+
+    def test_burst_read(self):
+        data = dict((datum[1], datum[2]) for datum in self.imu.read_data())
+        self.assertAlmostEqual(data['acceleration_x'], 9.80665)
+        self.assertAlmostEqual(data['acceleration_y'], -4.903325)
+        self.assertAlmostEqual(data['temperature'], 37.53)
+        self.assertAlmostEqual(data['rotation_x'], 1.0)
+        self.assertAlmostEqual(data['rotation_y'], -2.0)
+        # ranges are read once, then every read is single block read
+        self.bus.log = []
+        self.imu.read_data()
+        self.assertEqual(self.bus.log, [('readList', 0x68, 0x3B, 14)])
+
+    def test_read_words(self):
+        self.assertEqual(self.imu.read_words(Mpu6050Module.GYRO_XOUT0, 3),
+                         (131, -262, 0))
+        self.assertEqual(self.bus.log, [('readList', 0x68, 0x43, 6)])
+
+
+class Mpu6050FifoTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FifoI2cInterface()
+        self.imu = get_module(self.bus, fifo=True, sample_rate=100,
+                              fifo_buffer_size=4, read_interval=500)
+        self.imu._get_time = lambda: 100.0
+        self.bus.log = []
+
+    def frames(self, count):
+        return [(16384, 0, -16384, 131, 0, -131 * i) for i in range(count)]
+
+    def test_setup(self):
+        registers = self.bus.registers[0x68]
+        self.assertEqual(registers[Mpu6050Module.SMPLRT_DIV], 9)
+        self.assertEqual(registers[Mpu6050Module.FIFO_EN], 0x78)
+        self.assertEqual(registers[Mpu6050Module.USER_CTRL], 0x40)
+
+    def test_disabled(self):
+        imu = get_module(FifoI2cInterface())
+        self.assertRaises(RuntimeError, imu.drain_fifo)
+
+    def test_drain(self):
+        self.bus.push_frames(self.frames(3))
+        # incomplete frame stays in the FIFO
+        self.bus.fifo.extend(b'\x01\x02')
+        self.bus.push_frames([])
+        raw = self.imu.drain_fifo()
+        self.assertEqual(raw, sum(self.frames(3), ()))
+        # SMBus blocks are limited to 32 bytes, 2 frames each
+        self.assertEqual([entry[3] for entry in self.bus.log
+                          if entry[2] == Mpu6050Module.FIFO_R_W], [24, 12])
+        self.assertEqual(bytes(self.bus.fifo), b'\x01\x02')
+
+    def test_empty(self):
+        self.assertEqual(self.imu.drain_fifo(), ())
+        self.assertEqual(self.imu.get_fifo_samples(), [])
+
+    def test_overflow(self):
+        self.bus.push_frames(self.frames(2))
+        self.bus.set_registers(0x68, Mpu6050Module.INT_STATUS, [0x10])
+        self.assertEqual(self.imu.drain_fifo(), ())
+        self.assertIn(('write8', 0x68, Mpu6050Module.USER_CTRL, 0x04),
+                      self.bus.log)
+
+    def test_samples(self):
+        self.bus.push_frames(self.frames(3))
+        self.imu.drain_fifo()
+        samples = self.imu.get_fifo_samples()
+        self.assertEqual([sample[0] for sample in samples],
+                         [99.98, 99.99, 100.0])
+        timestamp, accel, gyro = samples[2]
+        self.assertAlmostEqual(accel['x'], 9.80665)
+        self.assertAlmostEqual(accel['z'], -9.80665)
+        self.assertAlmostEqual(gyro['x'], 1.0)
+        self.assertAlmostEqual(gyro['z'], -2.0)
+        self.assertEqual(self.imu.get_fifo_samples(), [])
+
+    def test_ring_buffer(self):
+        frames = self.frames(6)
+        self.bus.push_frames(frames[:3])
+        self.imu.drain_fifo()
+        self.bus.push_frames(frames[3:])
+        self.imu.drain_fifo()
+        # the buffer keeps the newest 4 samples, oldest first
+        samples = self.imu.get_fifo_samples()
+        self.assertEqual([round(sample[2]['z']) for sample in samples],
+                         [-2, -3, -4, -5])
+
+    def test_read_data(self):
+        self.bus.push_frames(self.frames(4))
+        data = dict((datum[1], datum[2]) for datum in self.imu.read_data())
+        self.assertAlmostEqual(data['acceleration_x'], 9.80665)
+        self.assertAlmostEqual(data['rotation_z'], -1.5)
+        data = dict((datum[1], datum[2]) for datum in self.imu.read_data())
+        self.assertIsNone(data['rotation_z'])
+
+
+if __name__ == "__main__":
+    unittest.main()
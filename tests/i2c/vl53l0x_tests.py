@@ -0,0 +1,32 @@
+import unittest
+
+from robophery.module.i2c.vl53l0x import Vl53L0XModule
+from tests.fakes import FakeI2cInterface, FakeManager
+
+
+class Vl53L0XTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FakeI2cInterface()
+        self.sensor = Vl53L0XModule(name='distance', manager=FakeManager(),
+                                    interface=self.bus, continuous=True,
+                                    **{'class': 'tests.Vl53L0XModule'})
+        self.bus.log = []
+
+    def test_continuous_distance(self):
+        # interrupt status, range status and range of 1234 mm
+        self.bus.set_registers(0x29, 0x13, [0x04] + [0] * 10 + [0x04, 0xD2])
+        self.assertAlmostEqual(self.sensor.read_continuous_distance(), 1.234)
+        self.assertEqual(self.bus.log, [
+            ('readList', 0x29, 0x13, 13),
+            ('write8', 0x29, 0x0b, 0x01),
+        ])
+
+    def test_no_new_result(self):
+        self.bus.set_registers(0x29, 0x13, [0x00])
+        self.sensor.read_continuous_distance()
+        self.assertEqual(self.bus.log, [('readList', 0x29, 0x13, 13)])
+
+
+if __name__ == "__main__":
+    unittest.main()
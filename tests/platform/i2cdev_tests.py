@@ -0,0 +1,81 @@
+import unittest
+from unittest import mock
+
+from robophery.platform.linux import i2cdev
+from tests.fakes import FakeI2cDevice, FakeManager
+
+LinuxI2cInterface = i2cdev.LinuxI2cInterface
+
+READ = LinuxI2cInterface.I2C_M_RD
+
+
+class LinuxI2cTests(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeI2cDevice()
+        patches = [
+            mock.patch.object(i2cdev.os, 'open', return_value=-1),
+            mock.patch.object(i2cdev.os, 'close'),
+            mock.patch.object(i2cdev.fcntl, 'ioctl', self.device.ioctl),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.bus = LinuxI2cInterface(name='i2c', manager=FakeManager(),
+                                     busnum=2,
+                                     **{'class': 'tests.LinuxI2cInterface'})
+
+    def test_device(self):
+        i2cdev.os.open.assert_called_once_with('/dev/i2c-2', i2cdev.os.O_RDWR)
+
+    def test_write_messages(self):
+        self.bus.write8(0x40, 0x01, 0x1FF)
+        self.bus.write16(0x40, 0x02, 0x1234)
+        self.bus.writeRawList(0x41, [1, 2, 3])
+        self.assertEqual(self.device.calls, [
+            [(0x40, 0, [0x01, 0xFF])],
+            [(0x40, 0, [0x02, 0x34, 0x12])],
+            [(0x41, 0, [1, 2, 3])],
+        ])
+
+    def test_write_read_transaction(self):
+        self.device.registers[0x40] = {0x10: 0xAB, 0x11: 0xCD}
+        self.assertEqual(self.bus.readU16(0x40, 0x10, little_endian=False),
+                         0xABCD)
+        self.assertEqual(self.bus.readS8(0x40, 0x10), 0xAB - 256)
+        # register pointer write and read with repeated start
+        self.assertEqual(self.device.calls[0],
+                         [(0x40, 0, [0x10]), (0x40, READ, 2)])
+
+    def test_read_lists(self):
+        self.device.registers[0x40] = {0x01: 1, 0x02: 2, 0x05: 5, 0x06: 6}
+        self.assertEqual(self.bus.readLists(0x40, [(0x01, 2), (0x05, 2)]),
+                         [[1, 2], [5, 6]])
+        self.assertEqual(self.device.calls, [[
+            (0x40, 0, [0x01]), (0x40, READ, 2),
+            (0x40, 0, [0x05]), (0x40, READ, 2),
+        ]])
+
+    def test_chunking(self):
+        registers = dict((register, register) for register in range(30))
+        self.device.registers[0x40] = registers
+        # 30 requests are 60 messages, the ioctl takes at most 42
+        results = self.bus.readLists(
+            0x40, [(register, 1) for register in range(30)])
+        self.assertEqual(results, [[register] for register in range(30)])
+        self.assertEqual([len(call) for call in self.device.calls], [42, 18])
+
+    def test_long_block(self):
+        data = [value & 0xFF for value in range(300)]
+        self.bus.writeList(0x40, 0x00, data)
+        self.assertEqual(self.device.calls, [[(0x40, 0, [0x00] + data)]])
+        self.assertEqual(self.bus.readList(0x40, 0x00, 300), data)
+
+    def test_close(self):
+        self.bus.close()
+        self.bus.close()
+        i2cdev.os.close.assert_called_once_with(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
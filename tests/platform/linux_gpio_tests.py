@@ -0,0 +1,138 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from robophery.platform.linux import gpio
+from tests.fakes import FakeManager
+
+LinuxGpioInterface = gpio.LinuxGpioInterface
+
+# os.open is patched while the tests run
+open_device = os.open
+
+
+class FakeGpioChip(object):
+    """
+    Emulated gpiochip character device. Line handles are backed by
+    /dev/null, edge events by pipes written by the tests.
+    """
+
+    def __init__(self):
+        self.handles = {}
+        self.values = {}
+        self.event_pipes = {}
+        self.requests = []
+
+    def open(self, path, flags):
+        return open_device(os.devnull, flags)
+
+    def ioctl(self, fd, request, data):
+        if request == LinuxGpioInterface.GPIO_GET_CHIPINFO:
+            data.lines = 32
+        elif request == LinuxGpioInterface.GPIO_GET_LINEHANDLE:
+            data.fd = open_device(os.devnull, os.O_RDONLY)
+            pins = list(data.lineoffsets[:data.lines])
+            self.handles[data.fd] = pins
+            self.requests.append((pins, data.flags,
+                                  list(data.default_values[:data.lines])))
+        elif request == LinuxGpioInterface.GPIO_GET_LINEEVENT:
+            read_end, write_end = os.pipe()
+            data.fd = read_end
+            self.event_pipes[data.lineoffset] = write_end
+            self.requests.append(([data.lineoffset], data.eventflags, None))
+        elif request == LinuxGpioInterface.GPIOHANDLE_SET_LINE_VALUES:
+            for i, pin in enumerate(self.handles[fd]):
+                self.values[pin] = data.values[i]
+        elif request == LinuxGpioInterface.GPIOHANDLE_GET_LINE_VALUES:
+            for i, pin in enumerate(self.handles.get(fd, [])):
+                data.values[i] = self.values.get(pin, 0)
+
+    def push_event(self, pin, timestamp, event_id):
+        os.write(self.event_pipes[pin], LinuxGpioInterface.EVENT_DATA.pack(
+            int(timestamp * 1000000000), event_id))
+
+    def close(self):
+        for write_end in self.event_pipes.values():
+            os.close(write_end)
+
+
+class LinuxGpioTests(unittest.TestCase):
+
+    def setUp(self):
+        self.chip = FakeGpioChip()
+        self.addCleanup(self.chip.close)
+        patches = [
+            mock.patch.object(gpio.os, 'open', self.chip.open),
+            mock.patch.object(gpio.fcntl, 'ioctl', self.chip.ioctl),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.gpio = LinuxGpioInterface(name='gpio', manager=FakeManager(),
+                                       **{'class': 'tests.LinuxGpio'})
+        self.addCleanup(self.gpio.close)
+
+    def test_lines_are_grouped(self):
+        self.gpio.setup_pins({3: 0, 5: 0, 7: 1})
+        self.gpio.output_pins({3: 1, 5: 1})
+        self.assertEqual([request[0] for request in self.chip.requests],
+                         [[7], [3, 5]])
+        self.assertEqual(self.chip.values, {3: 1, 5: 1})
+
+    def test_event_detect_keeps_outputs(self):
+        self.gpio.setup_pins({3: 0, 5: 0, 7: 1})
+        self.gpio.output_pins({3: 1, 5: 1})
+        handles = dict(self.gpio._handles)
+        self.chip.requests = []
+        self.gpio.add_event_detect(9, LinuxGpioInterface.GPIO_EVENT_RISING)
+        self.gpio.output(5, 0)
+        self.assertEqual(self.gpio._handles, handles)
+        rising_edge = LinuxGpioInterface.GPIOEVENT_REQUEST_RISING_EDGE
+        self.assertEqual(self.chip.requests, [([9], rising_edge, None)])
+
+    def test_reconfigured_pin(self):
+        self.gpio.setup_pins({3: 0, 5: 0})
+        self.gpio.output_pins({3: 1, 5: 0})
+        self.chip.requests = []
+        self.gpio.add_event_detect(5, LinuxGpioInterface.GPIO_EVENT_BOTH)
+        # the other output of the handle is requested again with its value
+        self.assertEqual(self.chip.requests[0],
+                         ([3], LinuxGpioInterface.GPIOHANDLE_REQUEST_OUTPUT,
+                          [1]))
+        self.assertEqual(self.gpio._pin_handles.keys(), {3})
+
+    def test_event_queue(self):
+        self.gpio.add_event_queue(9, LinuxGpioInterface.GPIO_EVENT_BOTH)
+        now = time.monotonic()
+        self.chip.push_event(9, now - 0.2, 1)
+        self.chip.push_event(9, now - 0.1, 2)
+        time.sleep(0.1)
+        events = self.gpio.read_events(9)
+        self.assertEqual([event[:2] for event in events], [
+            (9, LinuxGpioInterface.GPIO_EVENT_RISING),
+            (9, LinuxGpioInterface.GPIO_EVENT_FALLING),
+        ])
+        self.assertAlmostEqual(events[0][2], now - 0.2, places=3)
+
+    def test_realtime_event_timestamps(self):
+        self.gpio.add_event_queue(9, LinuxGpioInterface.GPIO_EVENT_RISING)
+        self.chip.push_event(9, time.time() - 0.2, 1)
+        time.sleep(0.1)
+        timestamp = self.gpio.read_events(9)[0][2]
+        self.assertAlmostEqual(timestamp, time.monotonic() - 0.3, places=1)
+
+    def test_cleanup(self):
+        self.gpio.setup_pins({3: 0, 5: 1})
+        self.gpio.output(3, 1)
+        self.gpio.add_event_detect(9, LinuxGpioInterface.GPIO_EVENT_RISING)
+        self.gpio.cleanup(3)
+        self.assertEqual(self.gpio._pin_handles.keys(), {5})
+        self.gpio.cleanup()
+        self.assertEqual(self.gpio._handles, {})
+        self.assertEqual(self.gpio._event_pins, {})
+        self.assertIsNone(self.gpio._poll_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
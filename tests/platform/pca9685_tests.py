@@ -0,0 +1,75 @@
+import unittest
+
+from robophery.platform.pca9685.pwm import Pca9685PwmInterface
+from tests.fakes import FakeI2cInterface, FakeManager
+
+
+class Pca9685Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FakeI2cInterface()
+        self.pwm = Pca9685PwmInterface(
+            name='pwm', manager=FakeManager(),
+            parent={'interface': self.bus, 'address': 0x40},
+            **{'class': 'tests.Pca9685PwmInterface'})
+        self.bus.log = []
+
+    def channel_writes(self):
+        return [(entry[2], len(entry[3]) // 4) for entry in self.bus.log
+                if entry[0] == 'writeList']
+
+    def test_setup(self):
+        mode1 = self.bus.registers[0x40][Pca9685PwmInterface.MODE1]
+        self.assertEqual(mode1, Pca9685PwmInterface.ALLCALL |
+                         Pca9685PwmInterface.AUTO_INCREMENT)
+
+    def test_all_channels(self):
+        self.pwm.set_duty_cycles(dict((pin, 300) for pin in range(16)))
+        # SMBus blocks hold 8 channels
+        self.assertEqual(self.channel_writes(), [(0x06, 8), (0x26, 8)])
+        self.assertEqual(self.bus.registers[0x40][0x06 + 4 * 15 + 2],
+                         300 & 0xFF)
+
+    def test_unchanged_channels_are_skipped(self):
+        self.pwm.set_duty_cycles({1: 100, 2: 200})
+        self.bus.log = []
+        self.pwm.set_duty_cycles({1: 100, 2: 200})
+        self.assertEqual(self.bus.log, [])
+        self.pwm.set_duty_cycles({1: 100, 2: 250})
+        self.assertEqual(self.channel_writes(), [(0x06 + 4 * 2, 1)])
+
+    def test_runs(self):
+        # known channels between changed ones are rewritten
+        self.pwm.set_duty_cycles({3: 1, 5: 2})
+        self.assertEqual(self.channel_writes(), [(0x06 + 4 * 3, 3)])
+        self.assertEqual(self.bus.log[0][3],
+                         [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 2, 0])
+
+    def test_runs_of_unknown_channels(self):
+        self.pwm._duty_cycles = {}
+        self.pwm.set_duty_cycles({3: 1, 5: 2, 6: 3})
+        self.assertEqual(self.channel_writes(), [(0x06 + 4 * 3, 1),
+                                                 (0x06 + 4 * 5, 2)])
+
+    def test_reset(self):
+        self.pwm.set_frequency(60)
+        self.pwm.set_duty_cycles({0: 100})
+        self.bus.log = []
+        self.pwm.reset()
+        registers = self.bus.registers[0x40]
+        self.assertEqual(self.bus.log[0], ('writeRaw8', 0x00, 0x06))
+        self.assertEqual(registers[Pca9685PwmInterface.MODE2],
+                         Pca9685PwmInterface.OUTDRV)
+        self.assertEqual(registers[Pca9685PwmInterface.PRESCALE], 101)
+        self.assertFalse(registers[Pca9685PwmInterface.MODE1] &
+                         Pca9685PwmInterface.SLEEP)
+        self.assertTrue(registers[Pca9685PwmInterface.MODE1] &
+                        Pca9685PwmInterface.AUTO_INCREMENT)
+        # duty cycles are written again after the reset
+        self.bus.log = []
+        self.pwm.set_duty_cycles({0: 100})
+        self.assertEqual(self.channel_writes(), [(0x06, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
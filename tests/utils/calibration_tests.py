@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from robophery.module.i2c.bmp085 import Bmp085Module
+from robophery.utils.calibration import CalibrationCache
+from tests.fakes import FakeI2cInterface, FakeManager
+
+
+class CalibrationCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'calibration.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_missing_entry(self):
+        cache = CalibrationCache(self.path)
+        self.assertIsNone(cache.get(1, 0x77, 0x55))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_set_is_persisted(self):
+        cache = CalibrationCache(self.path)
+        cache.set(1, 0x77, 0x55, (1, 2, 3))
+        self.assertEqual(cache.get(1, 0x77, 0x55), [1, 2, 3])
+        self.assertEqual(CalibrationCache(self.path).get(1, 0x77, 0x55),
+                         [1, 2, 3])
+        self.assertFalse(os.path.exists('{0}.tmp'.format(self.path)))
+
+    def test_entries_are_keyed_by_device(self):
+        cache = CalibrationCache(self.path)
+        cache.set(1, 0x77, 0x55, [1])
+        cache.set(2, 0x77, 0x55, [2])
+        cache.set(1, 0x76, 0x55, [3])
+        cache.set(1, 0x77, 0x58, [4])
+        self.assertEqual([cache.get(1, 0x77, 0x55), cache.get(2, 0x77, 0x55),
+                          cache.get(1, 0x76, 0x55), cache.get(1, 0x77, 0x58)],
+                         [[1], [2], [3], [4]])
+
+    def test_delete_is_persisted(self):
+        cache = CalibrationCache(self.path)
+        cache.set(1, 0x77, 0x55, [1, 2])
+        cache.delete(1, 0x77, 0x55)
+        self.assertIsNone(cache.get(1, 0x77, 0x55))
+        self.assertIsNone(CalibrationCache(self.path).get(1, 0x77, 0x55))
+        # deleting missing entry does not fail
+        cache.delete(1, 0x77, 0x55)
+
+    def test_corrupted_file(self):
+        with open(self.path, 'w') as cache_file:
+            cache_file.write('{"1:0x77')
+        cache = CalibrationCache(self.path)
+        self.assertIsNone(cache.get(1, 0x77, 0x55))
+        cache.set(1, 0x77, 0x55, [1])
+        self.assertEqual(CalibrationCache(self.path).get(1, 0x77, 0x55), [1])
+
+    def test_checksum_mismatch(self):
+        CalibrationCache(self.path).set(1, 0x77, 0x55, [1, 2])
+        with open(self.path) as cache_file:
+            data = json.load(cache_file)
+        data['1:0x77:0x55']['values'][1] = 3
+        with open(self.path, 'w') as cache_file:
+            json.dump(data, cache_file)
+        self.assertIsNone(CalibrationCache(self.path).get(1, 0x77, 0x55))
+
+
+class CachedManager(FakeManager):
+
+    def __init__(self, path):
+        self._calibration_cache = CalibrationCache(path)
+
+
+class Bmp085CalibrationTests(unittest.TestCase):
+
+    COEFFICIENTS = [408, -72, -14383, 32741, 32757, 23153, 6190, 4, -32768,
+                    -8711, 2868]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'calibration.json')
+        self.bus = FakeI2cInterface()
+        self.bus.set_registers(0x77, 0xAA, bytearray(struct.pack(
+            '>hhhHHHhhhhh', *self.COEFFICIENTS)))
+        self.bus.set_registers(0x77, 0xD0, [0x55])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_module(self, manager):
+        return Bmp085Module(name='bmp085', manager=manager,
+                            interface=self.bus,
+                            **{'class': 'tests.Bmp085Module'})
+
+    def test_without_cache(self):
+        module = self.create_module(FakeManager())
+        self.assertEqual(self.bus.log, [('readList', 0x77, 0xAA, 22)])
+        self.assertEqual(module.cal_MD, 2868)
+
+    def test_cached_coefficients(self):
+        self.create_module(CachedManager(self.path))
+        self.assertEqual(self.bus.log, [('readU8', 0x77, 0xD0),
+                                        ('readList', 0x77, 0xAA, 22)])
+        self.bus.log = []
+        module = self.create_module(CachedManager(self.path))
+        # only the chip ID is read on restart
+        self.assertEqual(self.bus.log, [('readU8', 0x77, 0xD0)])
+        self.assertEqual([module.cal_AC1, module.cal_AC4, module.cal_MB,
+                          module.cal_MD], [408, 32741, -32768, 2868])
+
+    def test_other_chip_id(self):
+        self.create_module(CachedManager(self.path))
+        self.bus.set_registers(0x77, 0xD0, [0x58])
+        self.bus.log = []
+        self.create_module(CachedManager(self.path))
+        self.assertEqual(self.bus.log, [('readU8', 0x77, 0xD0),
+                                        ('readList', 0x77, 0xAA, 22)])
+
+
+if __name__ == "__main__":
+    unittest.main()
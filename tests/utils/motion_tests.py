@@ -0,0 +1,109 @@
+import unittest
+
+from robophery.interface.pwm import PwmInterface
+from robophery.module.pwm.servo import ServoModule
+from robophery.utils.motion import MotionEngine
+from tests.fakes import FakeManager
+
+
+class FakePwmInterface(PwmInterface):
+    """
+    PWM interface recording bulk duty cycle writes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.writes = []
+        self.resets = 0
+        kwargs.setdefault('name', 'pwm')
+        kwargs.setdefault('class', 'tests.FakePwmInterface')
+        kwargs.setdefault('manager', FakeManager())
+        super(FakePwmInterface, self).__init__(*args, **kwargs)
+
+    def setup_pin(self, pin, dutycycle=0, frequency=2000):
+        self._use_pin(pin)
+
+    def set_duty_cycles(self, dutycycles):
+        self.writes.append(dict(dutycycles))
+
+    def reset(self):
+        self.resets += 1
+
+
+class MotionEngineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.interface = FakePwmInterface()
+        self.engine = MotionEngine(self.interface)
+        # ticks are driven by the tests on virtual clock
+        self.engine.close()
+        self.clock = 0.0
+        self.engine._clock = lambda: self.clock
+
+    def test_interpolation(self):
+        self.engine.move(1, 100)
+        self.engine._tick(0.0)
+        self.engine.move(1, 200, duration=1.0)
+        self.engine.move(2, 400)
+        for now in (0.25, 0.5, 1.0, 1.5):
+            self.engine._tick(now)
+        self.assertEqual(self.interface.writes, [
+            {1: 100},
+            {1: 125, 2: 400},
+            {1: 150},
+            {1: 200},
+        ])
+        self.assertEqual(self.engine.position(1), 200)
+        self.assertFalse(self.engine.is_moving(1))
+
+    def test_unchanged_values_are_not_written(self):
+        self.engine.move(1, 100)
+        self.engine._tick(0.0)
+        self.engine.move(1, 101, duration=10.0)
+        self.engine._tick(1.0)
+        self.assertEqual(self.interface.writes, [{1: 100}])
+        self.assertTrue(self.engine.is_moving(1))
+
+    def test_wait(self):
+        self.engine.move(1, 100, duration=1.0)
+        self.assertFalse(self.engine.wait(1, timeout=0))
+        self.engine._tick(0.0)
+        self.engine._tick(1.0)
+        self.assertTrue(self.engine.wait(1, timeout=0))
+
+    def test_invalidate(self):
+        self.engine.move(1, 100)
+        self.engine._tick(0.0)
+        self.engine.invalidate(1)
+        self.assertIsNone(self.engine.position(1))
+        # the output without known value jumps to the target
+        self.engine.move(1, 300, duration=1.0)
+        self.engine._tick(0.5)
+        self.assertEqual(self.interface.writes[-1], {1: 300})
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, MotionEngine, self.interface, 0)
+
+
+class ServoTests(unittest.TestCase):
+
+    def setUp(self):
+        self.interface = FakePwmInterface()
+        self.addCleanup(lambda: self.interface._motion_engine.close())
+        self.servo = ServoModule(name='servo', manager=FakeManager(),
+                                 interface=self.interface, data_pin=3,
+                                 **{'class': 'tests.ServoModule'})
+
+    def test_set_angle_is_written(self):
+        data = self.servo.commit_action('set_angle', [0])
+        self.assertEqual(data[0][2], 0)
+        self.assertEqual(self.interface.writes[-1], {3: 150})
+
+    def test_reset(self):
+        self.servo.commit_action('set_angle', [180])
+        self.servo.commit_action('reset')
+        self.assertEqual(self.interface.resets, 1)
+        self.assertIsNone(self.interface._motion_engine.position(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from robophery.utils.spool import FileSpool
+
+
+class FileSpoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'spool')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_fifo_order(self):
+        spool = FileSpool(self.path, size=256)
+        for payload in (b'a', b'bb', b'ccc'):
+            self.assertTrue(spool.push(payload))
+        self.assertEqual(len(spool), 3)
+        self.assertEqual(spool.peek(), b'a')
+        self.assertEqual([spool.pop() for _ in range(4)],
+                         [b'a', b'bb', b'ccc', None])
+        spool.close()
+
+    def test_records_survive_reopen(self):
+        spool = FileSpool(self.path, size=256)
+        spool.push(b'first')
+        spool.push(b'second')
+        spool.pop()
+        spool.close()
+        spool = FileSpool(self.path, size=256)
+        self.assertEqual(len(spool), 1)
+        self.assertEqual(spool.pop(), b'second')
+        spool.close()
+
+    def test_drop_oldest(self):
+        # header takes 20 bytes, every record 4 bytes of length and payload
+        spool = FileSpool(self.path, size=20 + 3 * 14)
+        for i in range(5):
+            self.assertTrue(spool.push('record{0:04d}'.format(i).encode()))
+        self.assertEqual(spool.evicted(), 2)
+        self.assertEqual([spool.pop() for _ in range(len(spool))],
+                         [b'record0002', b'record0003', b'record0004'])
+        spool.close()
+
+    def test_drop_newest(self):
+        spool = FileSpool(self.path, size=20 + 3 * 14,
+                          policy=FileSpool.DROP_NEWEST_POLICY)
+        results = [spool.push('record{0:04d}'.format(i).encode())
+                   for i in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(spool.evicted(), 2)
+        self.assertEqual(spool.pop(), b'record0000')
+        spool.close()
+
+    def test_wrap_around(self):
+        spool = FileSpool(self.path, size=20 + 64)
+        pushed = []
+        popped = []
+        for i in range(50):
+            payload = str(i).encode() * (i % 7 + 1)
+            spool.push(payload)
+            pushed.append(payload)
+            # at most two records are stored, the data wrap several times
+            if len(spool) > 2:
+                popped.append(spool.pop())
+        while len(spool):
+            popped.append(spool.pop())
+        self.assertEqual(spool.evicted(), 0)
+        self.assertEqual(popped, pushed)
+        spool.close()
+
+    def test_oversized_record(self):
+        spool = FileSpool(self.path, size=64)
+        self.assertFalse(spool.push(b'x' * 64))
+        self.assertEqual(spool.evicted(), 1)
+        self.assertEqual(len(spool), 0)
+        spool.close()
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, FileSpool, self.path, 256, 'unknown')
+        self.assertRaises(ValueError, FileSpool, self.path, 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
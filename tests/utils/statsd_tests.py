@@ -0,0 +1,71 @@
+import unittest
+
+from robophery.utils.statsd import StatsdClient
+
+
+class RecordingStatsdClient(StatsdClient):
+
+    def __init__(self, *args, **kwargs):
+        self.packets = []
+        super(RecordingStatsdClient, self).__init__(*args, **kwargs)
+        self._socket.close()
+
+    def _sendto(self, packet):
+        self.packets.append(packet)
+
+
+class StatsdTests(unittest.TestCase):
+
+    def test_unbuffered(self):
+        client = RecordingStatsdClient(prefix='node')
+        client.gauge('temperature', 21.5)
+        client.incr('reads')
+        self.assertEqual(client.packets, [b'node.temperature:21.5|g',
+                                          b'node.reads:1|c'])
+
+    def test_packing(self):
+        # stats are 11 bytes long, two of them with separator fit in 32
+        client = RecordingStatsdClient(mtu=32)
+        client.begin()
+        for i in range(7):
+            client.gauge('metric{0}'.format(i), 1)
+        self.assertEqual(len(client.packets), 3)
+        client.flush()
+        self.assertEqual(client.packets, [
+            b'metric0:1|g\nmetric1:1|g',
+            b'metric2:1|g\nmetric3:1|g',
+            b'metric4:1|g\nmetric5:1|g',
+            b'metric6:1|g',
+        ])
+
+    def test_exact_fit(self):
+        stat = b'metric0:1|g'
+        client = RecordingStatsdClient(mtu=2 * len(stat) + 1)
+        client.begin()
+        for i in range(3):
+            client.gauge('metric{0}'.format(i), 1)
+        client.flush()
+        self.assertEqual([len(packet) for packet in client.packets],
+                         [2 * len(stat) + 1, len(stat)])
+
+    def test_oversized_stat(self):
+        client = RecordingStatsdClient(mtu=8)
+        client.begin()
+        client.gauge('temperature', 21.5)
+        client.gauge('humidity', 40)
+        client.flush()
+        # stats longer than mtu are sent alone
+        self.assertEqual(client.packets, [b'temperature:21.5|g',
+                                          b'humidity:40|g'])
+
+    def test_flush_stops_buffering(self):
+        client = RecordingStatsdClient()
+        client.begin()
+        client.flush()
+        self.assertEqual(client.packets, [])
+        client.incr('reads')
+        self.assertEqual(client.packets, [b'reads:1|c'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+from robophery.platform.linux import i2cdev
+from robophery.utils.trace import BusTrace
+from tests.fakes import FakeI2cDevice, FakeI2cInterface, FakeManager
+
+
+class BusTraceTests(unittest.TestCase):
+
+    def test_record(self):
+        trace = BusTrace(4, ['write8', 'readList'])
+        trace.record(0, 0x40, 0x05, 0x1F)
+        trace.record(1, 0x40, 0x06, [1, 2, 3, 4, 5])
+        trace.record(trace.operation_code('readRaw8'), 0x23)
+        records = trace.records()
+        self.assertEqual([record[1:] for record in records], [
+            ('write8', 0x40, 0x05, 0, 0x1F),
+            ('readList', 0x40, 0x06, 5, 0x01020304),
+            ('readRaw8', 0x23, None, 0, 0),
+        ])
+        times = [record[0] for record in records]
+        self.assertEqual(times, sorted(times))
+
+    def test_nested_sequences(self):
+        trace = BusTrace(4, ['readLists'])
+        trace.record(0, 0x40, None, [[1, 2], [3]])
+        self.assertEqual(trace.records()[0][1:],
+                         ('readLists', 0x40, None, 3, 0x010203))
+
+    def test_ring(self):
+        trace = BusTrace(3, ['write8'])
+        for value in range(5):
+            trace.record(0, 0x40, 0x00, value)
+        self.assertEqual(len(trace), 3)
+        self.assertEqual([record[5] for record in trace.records()],
+                         [2, 3, 4])
+        trace.clear()
+        self.assertEqual(trace.records(), [])
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, BusTrace, 0)
+
+
+class I2cTraceTests(unittest.TestCase):
+
+    def test_disabled(self):
+        bus = FakeI2cInterface()
+        bus.write8(0x40, 0x00, 0x01)
+        self.assertEqual(bus.get_trace(), [])
+        self.assertNotIn('write8', vars(bus))
+
+    def test_replay(self):
+        bus = FakeI2cInterface(trace=True)
+        bus.set_registers(0x40, 0x10, [0xAB, 0xCD])
+        bus.write8(0x40, 0x00, 0x01)
+        bus.readU16(0x40, 0x10, little_endian=False)
+        bus.writeReadList(0x40, [0x10], 2)
+        bus.readLists(0x40, [(0x10, 1), (0x11, 1)])
+        # methods implemented by other bus methods are recorded once
+        self.assertEqual([record[1:] for record in bus.get_trace()], [
+            ('write8', 0x40, 0x00, 0, 0x01),
+            ('readU16', 0x40, 0x10, 0, 0xABCD),
+            ('writeReadList', 0x40, None, 2, 0xABCD),
+            ('readLists', 0x40, None, 2, 0xABCD),
+        ])
+
+    def test_combined_transactions(self):
+        device = FakeI2cDevice()
+        device.registers[0x40] = {0x01: 0x12, 0x02: 0x34, 0x04: 0x56}
+        with mock.patch.object(i2cdev.os, 'open', return_value=-1), \
+                mock.patch.object(i2cdev.fcntl, 'ioctl', device.ioctl):
+            bus = i2cdev.LinuxI2cInterface(
+                name='i2c', manager=FakeManager(), trace=True,
+                **{'class': 'tests.LinuxI2cInterface'})
+            bus.writeReadList(0x40, [0x01], 2)
+            bus.readLists(0x40, [(0x02, 1), (0x04, 1)])
+            bus.readU8(0x40, 0x04)
+        self.assertEqual(len(device.calls), 3)
+        self.assertEqual([record[1:] for record in bus.get_trace()], [
+            ('writeReadList', 0x40, None, 2, 0x1234),
+            ('readLists', 0x40, None, 2, 0x3456),
+            ('readU8', 0x40, 0x04, 0, 0x56),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()